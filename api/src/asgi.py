@@ -0,0 +1,119 @@
+"""
+Aplicação ASGI sobre a aplicação Flask.
+
+As leituras de `repos_bp` com versão assíncrona (routers/async_repository.py)
+rodam no event loop: enquanto esperam o GitHub não ocupam nenhuma thread. As
+demais rotas seguem para a aplicação WSGI, executada num pool de threads pelo
+a2wsgi. O roteamento, os hooks (before/after_request, métricas) e o
+tratamento de erros são os do próprio Flask.
+"""
+
+import inspect
+import io
+import os
+import sys
+from typing import Dict, Iterable, Tuple
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask, request
+
+from .controllers.async_controller import close_session
+from .routers.async_repository import ASYNC_VIEWS
+
+# Threads que executam as rotas síncronas (escritas, uploads, jobs)
+WSGI_WORKERS = int(os.getenv("ASGI_WSGI_WORKERS", "32"))
+
+
+def _environ(scope: Dict) -> Dict:
+    """Ambiente WSGI de uma requisição ASGI sem corpo (as views assíncronas são GET)."""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(b""),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin1").upper().replace("-", "_")
+        value = value.decode("latin1")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = f"HTTP_{name}"
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+class AsyncApp:
+    """
+    :param app: Aplicação Flask com os blueprints já registrados (main.app)
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.wsgi = WSGIMiddleware(app, workers=WSGI_WORKERS)
+
+    async def __call__(self, scope: Dict, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.wsgi(scope, receive, send)
+
+        ctx = self.app.request_context(_environ(scope))
+        ctx.push()
+        try:
+            view, accepts = ASYNC_VIEWS.get(request.endpoint, (None, None))
+            if view is None or request.routing_exception is not None or not accepts():
+                view = None
+            else:
+                status, headers, body = await self._dispatch(view)
+        finally:
+            ctx.pop()
+
+        if view is None:
+            return await self.wsgi(scope, receive, send)
+
+        await send({"type": "http.response.start", "status": status,
+                    "headers": headers})
+        await send({"type": "http.response.body",
+                    "body": body if scope["method"] == "GET" else b""})
+
+    async def _dispatch(self, view) -> Tuple[int, Iterable[Tuple[bytes, bytes]], bytes]:
+        # Mesmo caminho do Flask em full_dispatch_request, aguardando a view
+        app = self.app
+        try:
+            rv = app.preprocess_request()
+            if rv is None:
+                try:
+                    rv = view(**request.view_args)
+                    if inspect.isawaitable(rv):
+                        rv = await rv
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            response = app.finalize_request(app.handle_exception(e),
+                                            from_error_handler=True)
+
+        headers = [(name.lower().encode("latin1"), value.encode("latin1"))
+                   for name, value in response.headers.items()]
+        return response.status_code, headers, response.get_data()
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await close_session()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
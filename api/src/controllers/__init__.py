@@ -1 +1,3 @@
-from .github_controller import GithubController
\ No newline at end of file
+from .github_controller import GithubController
+from .client_pool import GithubClientPool, client_pool
+from .transport import rate_limiter
@@ -0,0 +1,287 @@
+"""
+Versão assíncrona das leituras do `GithubController`, para o ponto de entrada
+ASGI (asgi.py).
+
+As chamadas ao GitHub usam uma `aiohttp.ClientSession` compartilhada, com um
+pool de conexões keep-alive, e passam pelo mesmo `RateLimiter` do transporte
+síncrono: enquanto esperam o GitHub, nenhuma thread fica presa, então um
+processo mantém centenas de requisições em andamento. As respostas viram os
+mesmos objetos do PyGithub usados pelas rotas síncronas, para que os modelos
+não mudem.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+from urllib.parse import quote
+
+import aiohttp
+from github import Github
+from github.Auth import Token
+from github.ContentFile import ContentFile
+from github.GitTreeElement import GitTreeElement
+from github.GithubException import GithubException
+from github.Repository import Repository
+from multidict import CIMultiDictProxy
+
+from ..errors import NotFoundError, BadRequestError
+from ..metrics import observe_github_call
+from .client_pool import client_pool
+from .github_controller import GITHUB_API_URL, _in_scope, _repo_error
+from .rate_limit import key_for_token, is_rate_limited
+from .transport import rate_limiter, RATE_LIMIT_RETRIES
+
+# Conexões simultâneas com o GitHub mantidas pelo processo (todas as requisições)
+ASYNC_POOL_SIZE = int(os.getenv("GITHUB_ASYNC_POOL_SIZE", "256"))
+TIMEOUT = float(os.getenv("GITHUB_ASYNC_TIMEOUT", "30"))
+
+_session: Optional[aiohttp.ClientSession] = None
+
+# Só monta objetos do PyGithub a partir de JSON; nunca faz requisições
+_requester = Github(base_url=GITHUB_API_URL).requester
+
+
+def async_session() -> aiohttp.ClientSession:
+    """Sessão HTTP compartilhada por todas as requisições do event loop."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=ASYNC_POOL_SIZE),
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+            headers={"Accept": "application/vnd.github+json",
+                     "User-Agent": "PyGithub/Python"}
+        )
+    return _session
+
+
+async def close_session() -> None:
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+@dataclass
+class _Response:
+    """Resposta já lida, com os nomes que `RateLimiter` e `is_rate_limited` usam."""
+    status_code: int
+    headers: CIMultiDictProxy
+    body: bytes
+    next_url: Optional[str]
+
+    def json(self) -> Union[Dict, List]:
+        return json.loads(self.body)
+
+
+def _exception(response: _Response) -> GithubException:
+    """
+    A mesma exceção que o PyGithub levantaria para a resposta, para que as
+    rotas assíncronas respondam pelos mesmos handlers das síncronas.
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    # Cabeçalhos em minúsculas, como o PyGithub os entrega
+    headers = {name.lower(): value for name, value in response.headers.items()}
+    data = data if isinstance(data, dict) else {}
+    return _requester.createException(response.status_code, headers, data)
+
+
+class AsyncGithubController:
+    """
+    Leituras de repositórios e arquivos com I/O assíncrono.
+
+    :param token: Token do GitHub enviado no cabeçalho 'x-api-token'
+    :param session: Sessão HTTP (padrão: a compartilhada do processo)
+    """
+
+    def __init__(self, token: str,
+                 session: Optional[aiohttp.ClientSession] = None) -> None:
+        auth = Token(token)
+        self._token = token
+        self._key = key_for_token(token)
+        self._headers = {"Authorization": f"{auth.token_type} {auth.token}"}
+        self._session = session
+        self._login: Optional[str] = None
+
+    async def _request(self, path: str, params: Optional[Dict] = None) -> _Response:
+        """GET no GitHub pelo agendador do token, repetindo as recusas por limite."""
+        absolute = path.startswith(("http://", "https://"))
+        url = path if absolute else GITHUB_API_URL + path
+        session = self._session or async_session()
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            await rate_limiter.acquire_async(self._key, "core")
+            response = None
+            started = time.perf_counter()
+            try:
+                request = session.get(url, params=params, headers=self._headers)
+                async with request as raw:
+                    next_link = raw.links.get("next")
+                    response = _Response(raw.status, raw.headers, await raw.read(),
+                                         str(next_link["url"]) if next_link else None)
+            finally:
+                rate_limiter.release(self._key, response, "core")
+                status = response.status_code if response is not None else None
+                observe_github_call("GET", url, status, time.perf_counter() - started)
+
+            if response.status_code == 401:
+                # Token recusado: o cliente guardado no pool não vale mais
+                client_pool.discard(self._token)
+            if attempt == RATE_LIMIT_RETRIES or not is_rate_limited(response):
+                return response
+
+    async def _get_json(self, path: str,
+                        params: Optional[Dict] = None) -> Union[Dict, List]:
+        response = await self._request(path, params)
+        if response.status_code != 200:
+            raise _exception(response)
+        return response.json()
+
+    async def login(self) -> str:
+        """
+        Dono dos repositórios do token. A validação usa o mesmo pool de
+        clientes das rotas síncronas: só o primeiro uso do token vai ao GitHub.
+        """
+        if self._login is None:
+            _, user = await asyncio.to_thread(client_pool.get, self._token)
+            self._login = user.login
+        return self._login
+
+    async def _repo_path(self, repo_name: str) -> str:
+        return f"/repos/{quote(await self.login())}/{quote(repo_name)}"
+
+    async def get_repos(self,
+                        per_page: Optional[int] = None,
+                        page: Optional[int] = None
+                        ) -> List[Repository]:
+        """
+        Uma página dos repositórios do usuário ou, sem 'page', todas as
+        páginas (seguindo o cabeçalho Link, como o PaginatedList do PyGithub).
+        """
+        await self.login()
+        params = {"per_page": per_page} if per_page else {}
+        if page is not None:
+            page_data = await self._get_json("/user/repos", {**params, "page": page})
+            return [self._repository(data) for data in page_data]
+
+        repos: List[Repository] = []
+        url, query = "/user/repos", params
+        while url:
+            response = await self._request(url, query)
+            if response.status_code != 200:
+                raise _exception(response)
+            repos.extend(self._repository(data) for data in response.json())
+            url, query = response.next_url, None
+        return repos
+
+    async def get_repo_by_name(self, repo_name: str) -> Repository:
+        response = await self._request(await self._repo_path(repo_name))
+        if response.status_code != 200:
+            raise _repo_error(_exception(response), repo_name)
+        return self._repository(response.json())
+
+    async def _branch_exists(self, repo_name: str, branch: str) -> bool:
+        repo_path = await self._repo_path(repo_name)
+        response = await self._request(f"{repo_path}/branches/{quote(branch, safe='')}")
+        if response.status_code not in (200, 404):
+            raise _exception(response)
+        return response.status_code == 200
+
+    async def get_file(self, repo_name: str, path: str,
+                       branch: str = "main") -> ContentFile:
+        repo_path = await self._repo_path(repo_name)
+        response = await self._request(f"{repo_path}/contents/{quote(path)}",
+                                       {"ref": branch})
+        if response.status_code == 404:
+            # Mesma ordem de erros das rotas síncronas: repositório, branch e arquivo
+            await self.get_repo_by_name(repo_name)
+            if not await self._branch_exists(repo_name, branch):
+                raise NotFoundError(resource_type="Branch", resource_identifier=branch)
+            raise NotFoundError(resource_type="File", resource_identifier=path)
+        if response.status_code != 200:
+            raise _exception(response)
+
+        data = response.json()
+        if isinstance(data, list):
+            raise BadRequestError(f"'{path}' é uma pasta, não um arquivo")
+        return ContentFile(_requester, {}, data, completed=True)
+
+    async def list_files(self,
+                         repo_name: str,
+                         prefix: str = "",
+                         branch: str = "main",
+                         depth: Optional[int] = None
+                         ) -> List[GitTreeElement]:
+        """
+        Mesmo resultado de `GithubController.list_files`: uma leitura recursiva
+        da árvore e, se ela vier truncada, as pastas lidas em paralelo.
+        """
+        repo_path = await self._repo_path(repo_name)
+        prefix = prefix.strip("/")
+
+        tree_path = f"{repo_path}/git/trees/{quote(branch, safe='')}"
+        response = await self._request(tree_path, {"recursive": "1"})
+        if response.status_code in (404, 409, 422):
+            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
+        if response.status_code != 200:
+            raise _exception(response)
+
+        tree = response.json()
+        if tree.get("truncated"):
+            entries = await self._walk_tree(repo_path, tree["sha"], "", prefix, depth)
+        else:
+            entries = tree["tree"]
+
+        files = [
+            GitTreeElement(_requester, {}, entry)
+            for entry in entries
+            if _in_scope(entry["path"], prefix, depth)
+        ]
+        if prefix and not files:
+            raise NotFoundError(resource_type="Path", resource_identifier=prefix)
+        return sorted(files, key=lambda file: file.path)
+
+    async def _walk_tree(self,
+                         repo_path: str,
+                         tree_sha: str,
+                         base: str,
+                         prefix: str,
+                         depth: Optional[int]
+                         ) -> List[Dict]:
+        """Percorre a árvore lendo em paralelo as pastas de cada nível."""
+        tree = await self._get_json(f"{repo_path}/git/trees/{tree_sha}")
+        entries = [{**entry, "path": base + entry["path"]} for entry in tree["tree"]]
+
+        # Só desce nas pastas que levam ao prefixo ou estão dentro dele
+        subtrees = [
+            entry for entry in entries
+            if entry["type"] == "tree" and (
+                (prefix + "/").startswith(entry["path"] + "/")
+                or _in_scope(entry["path"] + "/_", prefix, depth)
+            )
+        ]
+        nested = await asyncio.gather(*(
+            self._walk_tree(repo_path, entry["sha"], entry["path"] + "/", prefix, depth)
+            for entry in subtrees
+        ))
+        for children in nested:
+            entries.extend(children)
+        return entries
+
+    async def read_blobs(self, repo_name: str, shas: List[str]) -> Dict[str, bytes]:
+        """Conteúdo dos blobs, buscados em paralelo (uma chamada por SHA distinto)."""
+        repo_path = await self._repo_path(repo_name)
+        unique = list(dict.fromkeys(shas))
+        blobs = await asyncio.gather(*(self._get_json(f"{repo_path}/git/blobs/{sha}")
+                                       for sha in unique))
+        return {sha: base64.b64decode(blob["content"])
+                for sha, blob in zip(unique, blobs)}
+
+    def _repository(self, data: Dict) -> Repository:
+        return Repository(_requester, {}, data, completed=True)
@@ -0,0 +1,96 @@
+"""
+Leitura do conteúdo bruto de blobs do GitHub em pedaços, sem montar o
+arquivo inteiro na memória.
+"""
+
+import os
+from typing import Iterator, Optional
+
+import requests
+from github.Repository import Repository
+
+from ..errors import GithubError, NotFoundError, RateLimitedError
+from . import transport
+
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("GITHUB_DOWNLOAD_CHUNK_SIZE", str(64 * 1024)))
+DOWNLOAD_TIMEOUT = float(os.getenv("GITHUB_DOWNLOAD_TIMEOUT", "300"))
+
+
+def stream_blob(repo: Repository,
+                sha: str,
+                start: int = 0,
+                stop: Optional[int] = None,
+                chunk_size: int = DOWNLOAD_CHUNK_SIZE
+                ) -> Iterator[bytes]:
+    """
+    Bytes do blob no intervalo [start, stop). O intervalo também é pedido ao
+    GitHub; se ele responder com o arquivo inteiro (200), os bytes fora do
+    intervalo são descartados aqui mesmo.
+
+    O GET é feito já nesta chamada, não ao consumir o iterador: um erro do
+    GitHub vira GithubError antes de a rota enviar o status e os cabeçalhos.
+    :raises GithubError: O GitHub não devolveu o blob
+    """
+    headers = {"Accept": "application/vnd.github.raw"}
+    repo.requester.auth.authentication(headers)
+    # Um intervalo vazio (arquivo de 0 bytes) não é pedido: "bytes=0--1" é inválido
+    if stop is None and start:
+        headers["Range"] = f"bytes={start}-"
+    elif stop is not None and stop > start:
+        headers["Range"] = f"bytes={start}-{stop - 1}"
+
+    with transport.session() as session:
+        response = session.get(f"{repo.url}/git/blobs/{sha}", headers=headers,
+                               stream=True, timeout=DOWNLOAD_TIMEOUT)
+    if response.status_code not in (200, 206):
+        response.close()
+        raise _blob_error(response, sha)
+
+    return _chunks(response, start if response.status_code == 200 else 0,
+                   None if stop is None else stop - start, chunk_size)
+
+
+def _chunks(response: requests.Response,
+            skip: int,
+            remaining: Optional[int],
+            chunk_size: int
+            ) -> Iterator[bytes]:
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if skip:
+                if len(chunk) <= skip:
+                    skip -= len(chunk)
+                    continue
+                chunk, skip = chunk[skip:], 0
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            if chunk:
+                yield chunk
+            if remaining == 0:
+                break
+    finally:
+        response.close()
+
+
+def _blob_error(response: requests.Response, sha: str) -> GithubError:
+    if response.status_code == 404:
+        return NotFoundError(resource_type="Blob", resource_identifier=sha)
+
+    try:
+        message = response.json().get("message")
+    except ValueError:
+        message = None
+    status = response.status_code
+    message = message or response.text or f"GitHub responded with status {status}"
+
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return RateLimitedError(float(retry_after), message)
+        except ValueError:
+            pass
+    exhausted = response.headers.get("x-ratelimit-remaining") == "0"
+    if status == 429 or (status == 403 and exhausted):
+        return RateLimitedError(message=message)
+    return GithubError(message, status)
@@ -0,0 +1,181 @@
+"""
+Envio de arquivos grandes pela Git Blobs API sem carregá-los na memória.
+
+O conteúdo é copiado para disco (quando ainda não é um arquivo posicionável)
+e o corpo JSON do POST /git/blobs é gerado sob demanda, codificando o arquivo
+em base64 pedaço por pedaço enquanto ele é enviado.
+"""
+
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Tuple, Union
+
+from github.GithubException import GithubException
+from github.Repository import Repository
+
+from ..errors import BadRequestError
+from . import transport
+
+# Acima deste tamanho (bytes) o arquivo vai pela Git Blobs API em streaming
+LARGE_FILE_THRESHOLD = int(os.getenv("GITHUB_LARGE_FILE_THRESHOLD", str(1024 * 1024)))
+UPLOAD_TIMEOUT = float(os.getenv("GITHUB_UPLOAD_TIMEOUT", "300"))
+
+# Múltiplo de 3, para que os pedaços em base64 possam ser concatenados sem
+# padding no meio
+CHUNK_SIZE = 3 * 64 * 1024
+
+Content = Union[str, bytes, bytearray, IO[bytes]]
+
+
+def content_size(content: Content) -> Optional[int]:
+    """
+    Tamanho do conteúdo em bytes, ou None se o arquivo não permite
+    descobrir sem lê-lo.
+    """
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    try:
+        position = content.tell()
+        size = content.seek(0, os.SEEK_END)
+        content.seek(position)
+        return size - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def is_large(content: Content) -> bool:
+    if isinstance(content, (str, bytes, bytearray)):
+        return False
+    size = content_size(content)
+    return size is None or size > LARGE_FILE_THRESHOLD
+
+
+def blob_sha(content: Content) -> str:
+    """
+    SHA que o Git atribui a um blob com este conteúdo (sha1 de
+    "blob <tamanho>\\0" + bytes). Arquivos são lidos em pedaços e voltam à
+    posição original.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    digest = hashlib.sha1()
+    if isinstance(content, (bytes, bytearray)):
+        digest.update(b"blob %d\0" % len(content))
+        digest.update(content)
+        return digest.hexdigest()
+
+    size = content_size(content)
+    if size is None:
+        raise BadRequestError("O conteúdo deve ser str, bytes, bytearray ou um "
+                              "arquivo posicionável.")
+
+    start = content.tell()
+    digest.update(b"blob %d\0" % size)
+    for chunk in iter(lambda: content.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    content.seek(start)
+    return digest.hexdigest()
+
+
+@contextmanager
+def spooled(content: IO[bytes]) -> Iterator[Tuple[IO[bytes], int]]:
+    """
+    Entrega um arquivo posicionável com o conteúdo e o seu tamanho. Streams
+    que não permitem seek são copiados para um arquivo temporário em disco.
+    :return: Tupla (arquivo, tamanho)
+    """
+    size = content_size(content)
+    if size is not None:
+        yield content, size
+        return
+
+    with tempfile.TemporaryFile() as spool:
+        shutil.copyfileobj(content, spool, CHUNK_SIZE)
+        size = spool.tell()
+        spool.seek(0)
+        yield spool, size
+
+
+class Base64JSONBody:
+    """
+    Corpo `{"content": "<base64>", "encoding": "base64"}` lido sob demanda.
+    Como o tamanho final é conhecido, a requisição vai com Content-Length.
+    """
+
+    _PREFIX = b'{"encoding": "base64", "content": "'
+    _SUFFIX = b'"}'
+
+    def __init__(self, file: IO[bytes], size: int) -> None:
+        self._file = file
+        self._size = size
+        self._buffer = bytearray()
+        self._chunks = self._generate()
+
+    def __len__(self) -> int:
+        return len(self._PREFIX) + 4 * ((self._size + 2) // 3) + len(self._SUFFIX)
+
+    def _read_chunk(self) -> bytes:
+        # Completa o pedaço: um read() pode devolver menos bytes antes do fim do arquivo
+        chunk = bytearray()
+        while len(chunk) < CHUNK_SIZE:
+            data = self._file.read(CHUNK_SIZE - len(chunk))
+            if not data:
+                break
+            chunk += data
+        return bytes(chunk)
+
+    def _generate(self) -> Iterator[bytes]:
+        yield self._PREFIX
+        while True:
+            chunk = self._read_chunk()
+            if not chunk:
+                break
+            yield base64.b64encode(chunk)
+        yield self._SUFFIX
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def create_blob(repo: Repository, file: IO[bytes], size: int) -> str:
+    """
+    Cria o blob a partir do arquivo (lido a partir da posição atual).
+    :return: SHA do blob criado
+    """
+    headers = {"Content-Type": "application/json",
+               "Accept": "application/vnd.github+json"}
+    repo.requester.auth.authentication(headers)
+
+    with transport.session() as session:
+        response = session.post(
+            f"{repo.url}/git/blobs",
+            data=Base64JSONBody(file, size),
+            headers=headers,
+            timeout=UPLOAD_TIMEOUT
+        )
+
+    try:
+        data = response.json()
+    except ValueError:
+        data = {"message": response.text}
+    if response.status_code != 201:
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+        raise GithubException(response.status_code, data, response_headers)
+    return data["sha"]
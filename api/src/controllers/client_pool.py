@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+from github import Github
+from github.AuthenticatedUser import AuthenticatedUser
+
+from . import transport
+
+
+@dataclass
+class _PoolEntry:
+    client: Github
+    user: AuthenticatedUser
+    expires_at: float
+
+
+class GithubClientPool:
+    """
+    Pool de clientes do GitHub já autenticados, indexado pelo hash do token.
+
+    O token é validado uma única vez (na criação do cliente) e o cliente é
+    reaproveitado pelas requisições seguintes até expirar o TTL ou ser
+    descartado pela política LRU quando o pool atinge o tamanho máximo.
+    """
+
+    def __init__(self,
+                 authenticate: Callable[[str], Tuple[Github, AuthenticatedUser]],
+                 max_size: int = 128,
+                 ttl: float = 900) -> None:
+        self._authenticate = authenticate
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Tuple[Github, AuthenticatedUser]:
+        key = self._key(token)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry.client, entry.user
+            self._entries.pop(key, None)
+
+        # Valida fora do lock para não bloquear as requisições de outros tokens
+        client, user = self._authenticate(token)
+
+        with self._lock:
+            self._entries[key] = _PoolEntry(client, user, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return client, user
+
+    def discard(self, token: str) -> None:
+        """Remove o cliente do token (ex.: quando o GitHub responde 401)."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _authenticate(token: str) -> Tuple[Github, AuthenticatedUser]:
+    from .github_controller import GithubController
+    return GithubController.authenticate(token)
+
+
+transport.install()
+
+client_pool = GithubClientPool(
+    _authenticate,
+    max_size=int(os.getenv("GITHUB_CLIENT_POOL_SIZE", "128")),
+    ttl=float(os.getenv("GITHUB_CLIENT_POOL_TTL", "900"))
+)
@@ -0,0 +1,133 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Cabeçalhos da resposta 304 que substituem os guardados no cache
+_FRESH_HEADERS = ("date", "x-ratelimit-limit", "x-ratelimit-remaining",
+                  "x-ratelimit-reset", "x-ratelimit-used", "x-ratelimit-resource")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str]
+
+    def to_response(self,
+                    request: requests.PreparedRequest,
+                    not_modified: requests.Response) -> requests.Response:
+        """Reconstrói a resposta 200 a partir do cache e da resposta 304 recebida."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(self.headers)
+        for name in _FRESH_HEADERS:
+            if name in not_modified.headers:
+                response.headers[name] = not_modified.headers[name]
+        response._content = self.content
+        response._content_consumed = True
+        response.encoding = self.encoding
+        response.url = request.url
+        response.request = request
+        response.connection = not_modified.connection
+        return response
+
+
+class ETagCache:
+    """
+    Cache LRU de leituras (GET) do GitHub, indexado pelo token e pela URL.
+
+    As respostas guardam o ETag/Last-Modified e toda reutilização é
+    revalidada com If-None-Match/If-Modified-Since: um 304 não consome o
+    limite de requisições do GitHub e dispensa o reenvio do corpo.
+
+    O cache é do processo, compartilhado por todos os tokens: além do número
+    de entradas, a soma dos corpos guardados fica abaixo de 'max_bytes'.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 max_body_size: int = 1024 * 1024,
+                 max_bytes: int = 64 * 1024 * 1024
+                 ) -> None:
+        self._max_entries = max_entries
+        self._max_body_size = min(max_body_size, max_bytes)
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedResponse]"
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def key(self, request: requests.PreparedRequest) -> Optional[Tuple[str, str, str]]:
+        # Requisições que já são condicionais são de quem chamou, não do cache
+        if (
+            request.method != "GET"
+            or "If-None-Match" in request.headers
+            or "If-Modified-Since" in request.headers
+        ):
+            return None
+        token = hashlib.sha256(
+            request.headers.get("Authorization", "").encode("utf-8")
+        ).hexdigest()
+        return token, request.url, request.headers.get("Accept", "")
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedResponse]:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+            return cached
+
+    def store(self, key: Tuple[str, str, str], response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        if len(response.content) > self._max_body_size:
+            return
+
+        cached = CachedResponse(etag, last_modified, dict(response.headers),
+                                response.content, response.encoding)
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self._bytes -= len(replaced.content)
+            self._entries[key] = cached
+            self._bytes += len(cached.content)
+            while (len(self._entries) > self._max_entries
+                   or self._bytes > self._max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.content)
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size(self) -> int:
+        """Soma dos corpos guardados, em bytes."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,31 +1,160 @@
-from typing import Dict, Optional, Type, List, Union, IO
+import base64
+import os
+import threading
+import time
+from collections import deque
+from fnmatch import fnmatchcase
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Optional, Type, List, Tuple, Union, IO, TYPE_CHECKING
 from types import TracebackType
 
 from github import Github
+from github.Consts import DEFAULT_BASE_URL
 from github.Auth import Token
 from github.AuthenticatedUser import AuthenticatedUser
 from github.PaginatedList import PaginatedList
 from github.Repository import Repository
+from github.Branch import Branch
 from github.ContentFile import ContentFile
+from github.GitCommit import GitCommit
+from github.GitTreeElement import GitTreeElement
+from github.GithubException import GithubException
+from github.InputGitTreeElement import InputGitTreeElement
+
+from ..errors import (TokenMissingError, NotFoundError, AlreadyExistsError,
+                      BadRequestError, ConflictError, GithubError, RateLimitedError)
+from .retry import with_backoff, BASE_DELAY
+from .blob_upload import (Content, is_large, spooled, create_blob, blob_sha,
+                          content_size)
+from .graphql import graphql_query
+
+if TYPE_CHECKING:
+    from .client_pool import GithubClientPool
+
+# Blobs criados em paralelo por lote e tentativas de avançar a ref de uma branch
+WRITE_CONCURRENCY = int(os.getenv("GITHUB_WRITE_CONCURRENCY", "8"))
+COMMIT_ATTEMPTS = 3
+
+# Repositórios criados em paralelo no provisionamento e tentativas de commit
+# enquanto o GitHub ainda copia o conteúdo do template
+PROVISION_CONCURRENCY = int(os.getenv("GITHUB_PROVISION_CONCURRENCY", "4"))
+TEMPLATE_READY_ATTEMPTS = 5
+
+# Repositório criado, commit dos seus arquivos e falhas de cada arquivo
+Provisioned = Tuple[Repository, Optional[GitCommit], Dict[str, str]]
+
+# Arquivos lidos por consulta GraphQL (um alias por arquivo)
+GRAPHQL_BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH_SIZE", "500"))
+
+# Um lock por branch: commits concorrentes do próprio processo não disputam a ref
+_ref_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_ref_locks_guard = threading.Lock()
+
+
+def _ref_lock(repo_full_name: str, branch: str) -> threading.Lock:
+    with _ref_locks_guard:
+        return _ref_locks.setdefault((repo_full_name, branch), threading.Lock())
+
+
+# Permite apontar para o GitHub Enterprise ou para um servidor local (benchmarks)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", DEFAULT_BASE_URL)
+
+# Intervalo fixo do PyGithub entre requisições; o ritmo por saldo fica com o RateLimiter
+SECONDS_BETWEEN_REQUESTS = float(os.getenv("GITHUB_SECONDS_BETWEEN_REQUESTS", "0.25"))
+SECONDS_BETWEEN_WRITES = float(os.getenv("GITHUB_SECONDS_BETWEEN_WRITES", "1.0"))
+
+
+def _glob_parts(parts: List[str], pattern: List[str]) -> bool:
+    if not pattern:
+        return not parts
+    if pattern[0] == "**":
+        return any(_glob_parts(parts[index:], pattern[1:])
+                   for index in range(len(parts) + 1))
+    return (bool(parts) and fnmatchcase(parts[0], pattern[0])
+            and _glob_parts(parts[1:], pattern[1:]))
+
+
+def _glob_match(path: str, pattern: str) -> bool:
+    """
+    Casa o caminho com o padrão um nível de pasta por vez: '*', '?' e '[]'
+    nunca atravessam '/', e '**' casa qualquer número de pastas (inclusive
+    nenhuma).
+    """
+    return _glob_parts(path.split("/"), pattern.strip("/").split("/"))
+
+
+def _matches_path(path: str, pattern: str) -> bool:
+    """Casa um caminho com um padrão glob ou, sem curingas, com um arquivo ou pasta."""
+    if any(char in pattern for char in "*?["):
+        return _glob_match(path, pattern)
+    pattern = pattern.strip("/")
+    return path == pattern or path.startswith(pattern + "/")
+
+
+def _repo_error(e: GithubException, repo_name: str) -> Exception:
+    """
+    Erro da leitura de um repositório: só o 404 vira NotFoundError. Os demais
+    (token recusado, limites do GitHub, falhas do servidor) seguem como
+    vieram, para o handler de GithubException responder com o status e o
+    Retry-After do GitHub.
+    """
+    if e.status == 404:
+        return NotFoundError(resource_type="Repository", resource_identifier=repo_name)
+    return e
+
+
+def _in_scope(path: str, prefix: str, depth: Optional[int]) -> bool:
+    """Se o caminho está dentro de 'prefix' e a no máximo 'depth' níveis abaixo dele."""
+    if prefix:
+        if not path.startswith(prefix + "/"):
+            return False
+        path = path[len(prefix) + 1:]
+    return depth is None or path.count("/") < depth
 
-from ..errors import TokenMissingError, NotFoundError, AlreadyExistsError, BadRequestError
 
 class GithubController:
 
     def __init__(self, 
                  token: Optional[str] = None, 
-                 requested_by_api: bool = False
+                 requested_by_api: bool = False,
+                 pool: Optional["GithubClientPool"] = None
             ) -> None:
         
         self._token = self._get_token(token, requested_by_api)
-        self._auth: Token = Token(self._token)
-        self._git: Github = Github(auth=self._auth)
+        self._pool = pool
 
-        
+        if pool is not None:
+            # Cliente já validado, com as conexões reaproveitadas entre requisições
+            self._git, self._user = pool.get(self._token)
+        else:
+            self._git, self._user = self.authenticate(self._token)
+
+        # Memoização válida durante a vida do controller (uma requisição)
+        self._repos: Dict[str, Repository] = {}
+        self._branches: Dict[Tuple[str, str], Branch] = {}
+        self._file_shas: Dict[Tuple[str, str, str], str] = {}
+
+    @staticmethod
+    def authenticate(token: str) -> Tuple[Github, AuthenticatedUser]:
+        """
+        Cria um cliente do GitHub para o token e valida as credenciais.
+        :return: Tupla (cliente, usuário autenticado)
+        """
+        git = Github(
+            auth=Token(token),
+            base_url=GITHUB_API_URL,
+            seconds_between_requests=SECONDS_BETWEEN_REQUESTS or None,
+            seconds_between_writes=SECONDS_BETWEEN_WRITES or None
+        )
         try:
-            self.get_user().login
+            user = git.get_user()
+            user.login
+        except RateLimitedError:
+            raise
         except Exception as e:
             raise TokenMissingError("Invalid GitHub API token provided.") from e
+        return git, user
 
 
     def _get_token(self, 
@@ -64,7 +193,14 @@ class GithubController:
     ) -> None:
         """
         Fecha a conexão com o GitHub de forma segura.
+        Clientes do pool continuam abertos, mas são descartados se o token
+        for recusado pelo GitHub (401).
         """
+        if self._pool is not None:
+            if isinstance(exc_value, GithubException) and exc_value.status == 401:
+                self._pool.discard(self._token)
+            return False
+
         try:
             self._git.close()
         finally:
@@ -74,20 +210,39 @@ class GithubController:
 
     
     def get_user(self) -> AuthenticatedUser:
-        return self._git.get_user()
+        return self._user
     
-    
-    def get_repos(self) -> PaginatedList[Repository]:
+    def get_repos(self,
+                  per_page: Optional[int] = None,
+                  affiliation: Optional[str] = None
+                  ) -> PaginatedList[Repository]:
+        """
+        Lista os repositórios do usuário. As páginas são buscadas sob demanda,
+        à medida que a lista é percorrida.
+        :param per_page: Tamanho de página pedido ao GitHub (máx. 100)
+        :param affiliation: Filtro do GitHub; "owner" deixa só os repositórios
+                            do próprio usuário (padrão: também os de
+                            colaborador e de organizações)
+        """
         user = self.get_user()
-        return user.get_repos()
+        params = {"per_page": per_page, "affiliation": affiliation}
+        params = {name: value for name, value in params.items() if value is not None}
+        if not params:
+            return user.get_repos()
+        # Mesmo endpoint de user.get_repos(), com o tamanho de página e o filtro
+        # escolhidos
+        return PaginatedList(Repository, self._git.requester, "/user/repos", params)
     
     
     def get_repo_by_name(self, repo_name: str) -> Repository:
+        if repo_name in self._repos:
+            return self._repos[repo_name]
         try:
             user = self.get_user()
-            return user.get_repo(repo_name)
-        except:
-            raise NotFoundError(resource_type="Repository", resource_identifier=repo_name)
+            self._repos[repo_name] = user.get_repo(repo_name)
+        except GithubException as e:
+            raise _repo_error(e, repo_name)
+        return self._repos[repo_name]
     
 
     def sanitize_description(self, text: str) -> str:
@@ -115,15 +270,139 @@ class GithubController:
         :param license_template: Template de licença (ex: "mit") 
         :return: Objeto Repository criado """ 
         user = self.get_user() 
-        repo = user.create_repo(name=name, 
-                                description=self.sanitize_description(description), 
-                                private=private, 
-                                auto_init=auto_init, 
-                                gitignore_template=gitignore_template, 
-                                license_template=license_template) 
+        try:
+            repo = user.create_repo(name=name,
+                                    description=self.sanitize_description(description),
+                                    private=private,
+                                    auto_init=auto_init,
+                                    gitignore_template=gitignore_template,
+                                    license_template=license_template)
+        except GithubException as e:
+            if e.status == 422 and "already exists" in str(e.data):
+                raise AlreadyExistsError(resource_type="Repository",
+                                         resource_identifier=name)
+            raise
         
+        self._repos[name] = repo
         return repo
     
+    def _template_repo(self, template: str) -> Repository:
+        """Template do próprio usuário ("nome") ou de outra conta ("dono/nome")."""
+        if "/" not in template:
+            return self.get_repo_by_name(template)
+        if template not in self._repos:
+            try:
+                self._repos[template] = self._git.get_repo(template)
+            except GithubException as e:
+                raise _repo_error(e, template)
+        return self._repos[template]
+
+    def create_repo_from_template(self,
+                                  template: str,
+                                  name: str,
+                                  description: Optional[str] = "Created via API",
+                                  private: bool = False
+                                  ) -> Repository:
+        """
+        Cria um repositório com o conteúdo de um repositório template, em uma
+        única chamada ("generate"). O GitHub copia os arquivos de forma
+        assíncrona, então a branch pode demorar alguns instantes a existir.
+        :param template: Nome do template do usuário ou "dono/nome"
+        """
+        template_repo = self._template_repo(template)
+        try:
+            repo = self.get_user().create_repo_from_template(
+                name=name,
+                repo=template_repo,
+                description=self.sanitize_description(description),
+                private=private
+            )
+        except GithubException as e:
+            if e.status == 422 and "already exists" in str(e.data):
+                raise AlreadyExistsError(resource_type="Repository",
+                                         resource_identifier=name)
+            raise
+
+        self._repos[name] = repo
+        return repo
+
+    def provision_repos(self,
+                        template: str,
+                        repos: List[Tuple[str, str, Dict[str, Content]]],
+                        message: Optional[str] = "Add files via script",
+                        private: bool = False,
+                        max_workers: int = PROVISION_CONCURRENCY
+                        ) -> Tuple[Dict[str, Provisioned], Dict[str, str]]:
+        """
+        Cria vários repositórios a partir de um template, em paralelo (até
+        'max_workers' por vez), e envia os arquivos próprios de cada um em um
+        único commit. A falha de um repositório não interrompe os demais.
+
+        :param repos: Lista de (nome, descrição, {caminho: conteúdo})
+        :return: Tupla ({nome: (repositório, commit ou None, falhas de arquivos)},
+                 {nome: mensagem de erro})
+        """
+        if not repos:
+            raise BadRequestError("Ao menos um repositório deve ser informado.")
+
+        # Resolvido uma vez, antes das threads, para não repetir a busca
+        template_repo = self._template_repo(template)
+        branch = template_repo.default_branch
+
+        def provision(name: str, description: str, files: Dict) -> Provisioned:
+            repo = self.create_repo_from_template(template, name, description, private)
+            if not files:
+                return repo, None, {}
+
+            elements, failures = self._tree_elements(repo, files, WRITE_CONCURRENCY)
+            if not elements:
+                raise GithubError(f"Nenhum arquivo pôde ser enviado: {failures}", 502)
+            commit = self._commit_when_ready(repo, elements, message, branch)
+            return repo, commit, failures
+
+        results: Dict[str, Provisioned] = {}
+        errors: Dict[str, str] = {}
+
+        workers = max(1, min(max_workers, len(repos)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(provision, name, description, files): name
+                for name, description, files in repos
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except GithubError as e:
+                    errors[name] = e.message
+                except GithubException as e:
+                    if e.status == 401:
+                        raise
+                    data = e.data if isinstance(e.data, dict) else {}
+                    error_message = data.get("message")
+                    errors[name] = error_message or str(e)
+
+        return results, errors
+
+    def _commit_when_ready(self,
+                           repo: Repository,
+                           elements: List[InputGitTreeElement],
+                           message: str,
+                           branch: str
+                           ) -> GitCommit:
+        # Logo após o "generate" a branch ainda pode não existir (cópia
+        # assíncrona): o GitHub responde 404 ou 409 ("Git Repository is empty")
+        for attempt in range(TEMPLATE_READY_ATTEMPTS):
+            try:
+                return self._commit_tree(repo, elements, message, branch)
+            except (NotFoundError, GithubException) as e:
+                if isinstance(e, GithubException) and e.status != 409:
+                    raise
+                if attempt == TEMPLATE_READY_ATTEMPTS - 1:
+                    raise
+                time.sleep(BASE_DELAY * 2 ** attempt)
+
+
     def update_repo_description(self, 
                                 repo_name: str, 
                                 new_description: str
@@ -139,72 +418,386 @@ class GithubController:
         """ 
         repo = self.get_repo_by_name(repo_name) 
         repo.delete()
+        self._repos.pop(repo_name, None)
         return {"message": f"Repository '{repo_name}' deleted successfully."}
 
+    def _get_branch(self, repo_name: str, branch: str) -> Optional[Branch]:
+        key = (repo_name, branch)
+        if key not in self._branches:
+            repo = self.get_repo_by_name(repo_name)
+            try:
+                self._branches[key] = repo.get_branch(branch)
+            except GithubException as e:
+                if e.status != 404:
+                    raise
+                return None
+        return self._branches[key]
+
 
-    def _file_exists(self, 
-                            repo_name: str, 
-                            path: str, 
-                            branch: Optional[str] = "main") -> bool:
-        try:
-            self.get_file(repo_name, path, branch)
-            return True
-        except NotFoundError:
-            return False
-        
-        
     def _branch_exists(self,
                         repo_name: str,
                         branch: str) -> bool:
-        
+        return self._get_branch(repo_name, branch) is not None
+
+    def head_commit(self, repo_name: str, branch: str = "main") -> str:
+        """SHA do último commit da branch."""
+        found = self._get_branch(repo_name, branch)
+        if found is None:
+            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
+        return found.commit.sha
+
+    def head_commits(self,
+                     repo_names: List[str],
+                     branch: str = "main",
+                     require_file: Optional[str] = None
+                     ) -> Dict[str, Optional[str]]:
+        """
+        SHA do último commit da branch em vários repositórios, numa consulta
+        GraphQL por lote de GRAPHQL_BATCH_SIZE repositórios (um alias por
+        repositório), em vez de uma leitura de branch por repositório.
+        :param require_file: Caminho que o commit precisa conter; sem ele o
+                             repositório vem como None
+        :return: {nome: SHA ou None se o repositório, a branch ou o arquivo não existir}
+        """
+        owner = self.get_user().login
+        heads: Dict[str, Optional[str]] = {}
+
+        variables = {"owner": owner, "ref": branch}
+        declarations = "$owner: String!, $ref: String!"
+        fields = "head: object(expression: $ref) { oid }"
+        if require_file is not None:
+            variables["file"] = f"{branch}:{require_file}"
+            declarations += ", $file: String!"
+            fields += " file: object(expression: $file) { oid }"
+
+        unique = list(dict.fromkeys(repo_names))
+        for start in range(0, len(unique), GRAPHQL_BATCH_SIZE):
+            batch = unique[start:start + GRAPHQL_BATCH_SIZE]
+            names = {f"n{index}": name for index, name in enumerate(batch)}
+            aliases = " ".join(
+                f"r{index}: repository(owner: $owner, name: $n{index}) {{ {fields} }}"
+                for index in range(len(batch))
+            )
+            batch_declarations = "".join(f", ${name}: String!" for name in names)
+            query = f"query({declarations}{batch_declarations}) {{ {aliases} }}"
+            data = graphql_query(self._git.requester, query, {**variables, **names},
+                                 partial=True)
+
+            for index, name in enumerate(batch):
+                repository = data.get(f"r{index}") or {}
+                head = repository.get("head")
+                missing = require_file is not None and repository.get("file") is None
+                heads[name] = head.get("oid") if head and not missing else None
+
+        return heads
+
+    def _get_contents(self,
+                      repo_name: str,
+                      path: str,
+                      branch: Optional[str] = "main"
+                      ) -> Optional[Union[ContentFile, List[ContentFile]]]:
+        """
+        Busca o conteúdo de um caminho, guardando o SHA do arquivo.
+        A existência da branch só é verificada quando o caminho não é encontrado.
+        :return: ContentFile, lista (se for uma pasta) ou None se não existir
+        """
         repo = self.get_repo_by_name(repo_name)
         try:
-            repo.get_branch(branch)
-            return True
-        except:
-            return False
-        
-        
+            contents = repo.get_contents(path=path, ref=branch)
+        except GithubException as e:
+            if e.status != 404:
+                raise
+            if not self._branch_exists(repo_name, branch):
+                raise NotFoundError(resource_type="Branch", resource_identifier=branch)
+            return None
+
+        if isinstance(contents, ContentFile):
+            self._file_shas[(repo_name, branch, path)] = contents.sha
+        return contents
+
+    def _file_sha(self,
+                  repo_name: str,
+                  path: str,
+                  branch: Optional[str] = "main") -> Optional[str]:
+        key = (repo_name, branch, path)
+        if key not in self._file_shas:
+            self._get_contents(repo_name, path, branch)
+        return self._file_shas.get(key)
+
+    def _file_exists(self,
+                     repo_name: str,
+                     path: str,
+                     branch: Optional[str] = "main") -> bool:
+        return self._file_sha(repo_name, path, branch) is not None
+
     def get_file(self, 
                  repo_name: str, 
                  path: str, 
                  branch: Optional[str] = "main"
             ) -> ContentFile:
         
-        if not self._branch_exists(repo_name, branch):
-            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
-        
-        try:
-            repo = self.get_repo_by_name(repo_name)
-            return repo.get_contents(path=path, ref=branch)
-        except:
+        contents = self._get_contents(repo_name, path, branch)
+        if contents is None:
             raise NotFoundError(resource_type="File", resource_identifier=path)
+        return contents
+
+    def _written_file(self,
+                      repo: Repository,
+                      written: ContentFile,
+                      raw_bytes: bytes
+                      ) -> ContentFile:
+        """
+        Monta o ContentFile de resposta a partir do retorno da escrita e do
+        conteúdo enviado, sem ler o arquivo novamente no GitHub.
+        """
+        return ContentFile(repo.requester, {}, {
+            "type": written.type,
+            "name": written.name,
+            "path": written.path,
+            "sha": written.sha,
+            "size": len(raw_bytes),
+            "url": written.url,
+            "html_url": written.html_url,
+            "git_url": written.git_url,
+            "download_url": written.download_url,
+            "encoding": "base64",
+            "content": base64.b64encode(raw_bytes).decode("ascii"),
+        }, completed=True)
     
     
     def list_files(self, 
                    repo_name: str, 
                    path: Optional[str] = "", 
-                   branch: Optional[str] = "main"
-                ) -> List[ContentFile]:
+                   branch: Optional[str] = "main",
+                   depth: Optional[int] = None
+                   ) -> List[GitTreeElement]:
         
         """
         Lista todos os arquivos e pastas do repositório de forma recursiva.
+
+        A árvore inteira é obtida com uma única chamada à Git Trees API
+        (recursive=1) e filtrada localmente pelo prefixo. Só quando o GitHub
+        trunca a resposta a árvore é percorrida pasta por pasta.
+        :param path: Pasta a partir da qual listar ("" para a raiz)
+        :param depth: Quantidade máxima de níveis abaixo de 'path' (None = todos)
+        :return: Lista de GitTreeElement ordenada pelo caminho
         """
 
-        if not self._branch_exists(repo_name, branch):
+        repo = self.get_repo_by_name(repo_name)
+        prefix = (path or "").strip("/")
+        elements = self._branch_tree(repo, branch, prefix, depth)
+
+        files = [
+            element for element in elements
+            if _in_scope(element.path, prefix, depth)
+        ]
+
+        if prefix and not files:
+            raise NotFoundError(resource_type="Path", resource_identifier=prefix)
+
+        return sorted(files, key=lambda element: element.path)
+
+    def _branch_tree(self,
+                     repo: Repository,
+                     branch: str,
+                     prefix: str = "",
+                     depth: Optional[int] = None
+                     ) -> List[GitTreeElement]:
+        """
+        Árvore completa da branch numa chamada (ou pasta por pasta, se vier
+        truncada).
+        """
+        try:
+            tree = repo.get_git_tree(branch, recursive=True)
+        except GithubException as e:
+            if e.status not in (404, 409, 422):
+                raise
             raise NotFoundError(resource_type="Branch", resource_identifier=branch)
 
+        if tree.truncated:
+            return self._walk_tree(repo, tree.sha, prefix, depth)
+        return tree.tree
+
+    def read_blobs(self, repo_name: str, shas: List[str]) -> Dict[str, bytes]:
+        """
+        Lê o conteúdo dos blobs informados (uma chamada por SHA distinto).
+        :return: Dicionário {sha: conteúdo}
+        """
         repo = self.get_repo_by_name(repo_name)
-        contents = repo.get_contents(path, ref=branch)
-        all_files: List[ContentFile] = []
+        contents: Dict[str, bytes] = {}
+        for sha in dict.fromkeys(shas):
+            contents[sha] = base64.b64decode(repo.get_git_blob(sha).content)
+        return contents
 
-        while contents:
-            file_content = contents.pop(0)
-            all_files.append(file_content)
+    def file_blob(self,
+                  repo_name: str,
+                  path: str,
+                  branch: str = "main"
+                  ) -> Tuple[str, int]:
+        """
+        SHA e tamanho do blob de um arquivo, numa consulta GraphQL que não
+        traz o conteúdo (a Contents API devolve o arquivo inteiro em base64).
+        :return: Tupla (SHA do blob, tamanho em bytes)
+        :raises BadRequestError: O caminho é uma pasta
+        """
+        query = (
+            "query($owner: String!, $name: String!, $ref: String!, $file: String!) { "
+            "repository(owner: $owner, name: $name) { "
+            "head: object(expression: $ref) { oid } "
+            "file: object(expression: $file) { ... on Blob { oid byteSize } } } }"
+        )
+        variables = {
+            "owner": self.get_user().login,
+            "name": repo_name,
+            "ref": branch,
+            "file": f"{branch}:{path}",
+        }
+        try:
+            repository = graphql_query(self._git.requester, query, variables)
+        except GithubException as e:
+            raise _repo_error(e, repo_name)
+        repository = repository.get("repository")
+        if repository is None:
+            raise NotFoundError(resource_type="Repository",
+                                resource_identifier=repo_name)
+        if repository.get("head") is None:
+            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
+
+        blob = repository.get("file")
+        if blob is None:
+            raise NotFoundError(resource_type="File", resource_identifier=path)
+        if "oid" not in blob:
+            # Só blobs preenchem o fragmento: uma pasta vem como objeto vazio
+            raise BadRequestError(f"'{path}' é uma pasta, não um arquivo")
+        return blob["oid"], blob["byteSize"]
+
+    def read_text_files(self,
+                        repo_name: str,
+                        paths: List[str],
+                        ref: str = "main"
+                        ) -> Tuple[str, Dict[str, Optional[str]]]:
+        """
+        Lê arquivos de texto pela API GraphQL: uma consulta para até
+        GRAPHQL_BATCH_SIZE arquivos, cada um num alias
+        `object(expression: "<commit>:<caminho>")`. O primeiro lote resolve o
+        commit de 'ref'; os seguintes leem desse mesmo commit.
+        :param ref: Branch, tag ou SHA de commit
+        :return: Tupla (SHA do commit, {caminho: texto ou None se não existir})
+        """
+        owner = self.get_user().login
+        commit: Optional[str] = None
+        texts: Dict[str, Optional[str]] = {}
+        truncated: Dict[str, str] = {}
+
+        unique = list(dict.fromkeys(paths))
+        for start in range(0, max(len(unique), 1), GRAPHQL_BATCH_SIZE):
+            batch = unique[start:start + GRAPHQL_BATCH_SIZE]
+            repository = self._text_batch(owner, repo_name, commit or ref, batch,
+                                          resolve_head=commit is None)
+
+            if commit is None:
+                if repository.get("head") is None:
+                    raise NotFoundError(resource_type="Branch", resource_identifier=ref)
+                commit = repository["head"]["oid"]
 
-            # Se for uma pasta, busca os conteúdos dentro dela
-            if file_content.type == "dir":
-                contents.extend(repo.get_contents(file_content.path, ref=branch))
+            for index, path in enumerate(batch):
+                blob = repository.get(f"f{index}")
+                if blob and blob.get("isTruncated"):
+                    truncated[path] = blob["oid"]
+                texts[path] = blob.get("text") if blob else None
+
+        if truncated:
+            self._complete_truncated(repo_name, texts, truncated)
+
+        return commit, texts
+
+    def _text_batch(self,
+                    owner: str,
+                    repo_name: str,
+                    ref: str,
+                    batch: List[str],
+                    resolve_head: bool
+                    ) -> Dict:
+        """
+        Uma consulta GraphQL com o alias `f<i>` para cada arquivo do lote e,
+        com 'resolve_head', o alias `head` com o commit de 'ref'.
+        :return: Objeto 'repository' da resposta
+        """
+        # O GraphQL recusa variáveis declaradas e não usadas: $ref só vai com o head
+        variables = {"owner": owner, "name": repo_name}
+        declarations = "$owner: String!, $name: String!"
+        fields = []
+        if resolve_head:
+            variables["ref"] = ref
+            declarations += ", $ref: String!"
+            fields.append("head: object(expression: $ref) { oid }")
+        for index, path in enumerate(batch):
+            variables[f"e{index}"] = f"{ref}:{path}"
+            declarations += f", $e{index}: String!"
+            fields.append(
+                f"f{index}: object(expression: $e{index}) "
+                "{ ... on Blob { oid text isTruncated } }"
+            )
+
+        query = (
+            f"query({declarations}) {{ "
+            f"repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+        )
+        try:
+            data = graphql_query(self._git.requester, query, variables)
+            repository = data.get("repository")
+        except GithubException as e:
+            if e.status != 404:
+                raise
+            repository = None
+        if repository is None:
+            raise NotFoundError(resource_type="Repository",
+                                resource_identifier=repo_name)
+        return repository
+
+    def _complete_truncated(self,
+                            repo_name: str,
+                            texts: Dict[str, Optional[str]],
+                            truncated: Dict[str, str]
+                            ) -> None:
+        """
+        Arquivos grandes vêm truncados no GraphQL: o conteúdo completo vem do
+        blob.
+        """
+        contents = self.read_blobs(repo_name, list(truncated.values()))
+        for path, sha in truncated.items():
+            texts[path] = contents[sha].decode("utf-8", errors="replace")
+
+    def _walk_tree(self,
+                   repo: Repository,
+                   tree_sha: str,
+                   prefix: str = "",
+                   depth: Optional[int] = None
+                   ) -> List[GitTreeElement]:
+        """
+        Percorre a árvore pasta por pasta (usado quando a resposta recursiva
+        vem truncada), descendo apenas nas pastas dentro de 'prefix'.
+        """
+
+        all_files: List[GitTreeElement] = []
+        pending = deque([("", tree_sha)])
+
+        while pending:
+            base, sha = pending.popleft()
+            for element in repo.get_git_tree(sha).tree:
+                full_path = f"{base}{element.path}"
+                if base:
+                    element = GitTreeElement(
+                        repo.requester, {}, {**element.raw_data, "path": full_path}
+                    )
+                all_files.append(element)
+
+                # Só desce nas pastas que levam ao prefixo ou estão dentro dele
+                if element.type == "tree" and (
+                    (prefix + "/").startswith(full_path + "/")
+                    or _in_scope(full_path + "/_", prefix, depth)
+                ):
+                    pending.append((full_path + "/", element.sha))
 
         return all_files
         
@@ -215,7 +808,7 @@ class GithubController:
                     content: Union[str, bytes, bytearray, IO[bytes]],
                     message: Optional[str] = "Add new file via script",
                     branch: Optional[str] = "main",
-                ):
+                    ) -> ContentFile:
         """
         Faz upload de qualquer tipo de arquivo para o repositório.
         
@@ -227,35 +820,32 @@ class GithubController:
 
         repo = self.get_repo_by_name(repo_name)
 
-        if not self._branch_exists(repo_name, branch):
-            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
-
-        if self._file_exists(repo_name, path, branch):
-            raise AlreadyExistsError(resource_type="File", resource_identifier=path)
-
-        # Normaliza o conteúdo para bytes
-        if hasattr(content, "read"):           # file-like (ex.: BytesIO, arquivo do Flask)
-            raw_bytes = content.read()
-        elif isinstance(content, str):
-            raw_bytes = content.encode("utf-8")  # texto
-        elif isinstance(content, (bytes, bytearray)):
-            raw_bytes = bytes(content)           # binário
-        else:
-            raise BadRequestError("O parâmetro 'content' deve ser str, bytes, bytearray ou um file-like aberto em modo binário.")
+        if is_large(content):
+            if self._file_exists(repo_name, path, branch):
+                raise AlreadyExistsError(resource_type="File", resource_identifier=path)
+            return self._write_large_file(repo, path, content, message, branch)
 
+        raw_bytes = self._to_bytes(content)
 
-        # Observação: Em PyGithub, a assinatura é (path, message, content, branch=...)
-        # e 'content' deve ser Base64.
-        repo.create_file(
-            path=path,
-            message=message,
-            content=raw_bytes,
-            branch=branch
-        )
-
+        # A criação falha no próprio GitHub se o arquivo já existir, então
+        # não é preciso consultar a branch e o arquivo antes.
+        try:
+            result = repo.create_file(
+                path=path,
+                message=message,
+                content=raw_bytes,
+                branch=branch
+            )
+        except GithubException as e:
+            if e.status == 422 and "sha" in str((e.data or {}).get("message", "")):
+                raise AlreadyExistsError(resource_type="File", resource_identifier=path)
+            if e.status in (404, 422) and not self._branch_exists(repo_name, branch):
+                raise NotFoundError(resource_type="Branch", resource_identifier=branch)
+            raise
 
-        # Opcionalmente, retorne metadados ou o próprio arquivo de volta (como você já fazia)
-        return self.get_file(repo_name, path, branch)
+        written = result["content"]
+        self._file_shas[(repo_name, branch, path)] = written.sha
+        return self._written_file(repo, written, raw_bytes)
 
 
     def update_file_content(self, 
@@ -263,7 +853,8 @@ class GithubController:
                             path: str,
                             new_content: Union[str, bytes, bytearray, IO[bytes]],
                             message: Optional[str] = "Update file via script",
-                            branch: Optional[str] = "main"
+                            branch: Optional[str] = "main",
+                            sha: Optional[str] = None
                         ) -> ContentFile:
         """
         Atualiza o conteúdo de um arquivo em qualquer formato no repositório.
@@ -271,74 +862,471 @@ class GithubController:
           * str: interpretado como texto (UTF-8) e convertido para Base64
           * bytes/bytearray: binário puro (PDFs, imagens, etc.), convertido para Base64
           * IO[bytes]: file-like (ex.: request.files['file']), lido e convertido para Base64
-          
-        - author/committer: dicionários opcionais com 'name' e 'email'
+
+        Se o conteúdo novo tiver o mesmo SHA de blob do atual, nada é commitado.
+
+        :param sha: SHA atual do arquivo conhecido pelo cliente. Quando informado,
+                    o arquivo não é lido antes da escrita: o commit é feito direto
+                    e, se o arquivo tiver mudado no GitHub, levanta ConflictError.
+                    Se o conteúdo novo já tem esse SHA, o arquivo é lido para
+                    confirmar que nada mudou antes de responder sem commit
         """
 
         repo = self.get_repo_by_name(repo_name)
 
-        if not self._branch_exists(repo_name, branch):
-            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
-        
-        if not self._file_exists(repo_name, path, branch):
+        if is_large(new_content):
+            return self._update_large_file(repo, path, new_content, message,
+                                           branch, sha)
+
+        raw_bytes = self._to_bytes(new_content)
+        new_sha = blob_sha(raw_bytes)
+
+        # O atalho sem commit só vale para um SHA lido do GitHub: o do cliente
+        # pode estar desatualizado, e então a escrita precisa ser recusada
+        current = sha
+        if sha is None or sha == new_sha:
+            current = self._current_sha(repo_name, path, branch, sha)
+        if new_sha == current:
+            return self._file_at(repo, path, current, len(raw_bytes), branch, raw_bytes)
+
+        # Observação: Em PyGithub, a assinatura comum é:
+        # update_file(path, message, content, sha, branch=None, committer=None, author=None)
+        try:
+            result = repo.update_file(
+                path=path,
+                message=message,
+                content=raw_bytes,
+                sha=current,
+                branch=branch
+            )
+        except GithubException as e:
+            self._file_shas.pop((repo_name, branch, path), None)
+            raise self._update_error(e, repo_name, path, branch, sha)
+
+        written = result["content"]
+        self._file_shas[(repo_name, branch, path)] = written.sha
+        return self._written_file(repo, written, raw_bytes)
+
+    def _current_sha(self,
+                     repo_name: str,
+                     path: str,
+                     branch: str,
+                     expected: Optional[str] = None
+                     ) -> str:
+        """
+        SHA do arquivo lido do GitHub.
+        :param expected: SHA informado pelo cliente (If-Match/sha), se houver
+        :raises NotFoundError: Arquivo inexistente
+        :raises ConflictError: O arquivo não está mais no SHA esperado
+        """
+        current = self._file_sha(repo_name, path, branch)
+        if current is None:
             raise NotFoundError(resource_type="File", resource_identifier=path)
+        if expected is not None and expected != current:
+            raise ConflictError(resource_identifier=path)
+        return current
 
-        file = self.get_file(repo_name, path, branch)
-        sha = file.sha
+    def _update_large_file(self,
+                           repo: Repository,
+                           path: str,
+                           new_content: IO[bytes],
+                           message: str,
+                           branch: str,
+                           sha: Optional[str]
+                           ) -> ContentFile:
+        # A Git Data API não confere o SHA anterior: a leitura continua necessária
+        current = self._current_sha(repo.name, path, branch, sha)
+        if blob_sha(new_content) == current:
+            return self._file_at(repo, path, current, content_size(new_content), branch)
+        return self._write_large_file(repo, path, new_content, message, branch)
 
-        if not isinstance(sha, str) or not sha.strip():
-            raise BadRequestError("O parâmetro 'sha' é obrigatório e deve ser uma string não vazia.")
+    def _update_error(self,
+                      e: GithubException,
+                      repo_name: str,
+                      path: str,
+                      branch: str,
+                      sha: Optional[str]
+                      ) -> Exception:
+        if e.status == 409:
+            return ConflictError(resource_identifier=path)
+        if e.status == 404 and sha is not None:
+            # Sem a leitura prévia, o 404 pode ser da branch ou do arquivo
+            if not self._branch_exists(repo_name, branch):
+                return NotFoundError(resource_type="Branch", resource_identifier=branch)
+            return NotFoundError(resource_type="File", resource_identifier=path)
+        return e
 
-        # Normaliza o conteúdo para bytes
-        if isinstance(new_content, str):
-            raw_bytes = new_content.encode("utf-8")  # texto
-        elif isinstance(new_content, (bytes, bytearray)):
-            raw_bytes = bytes(new_content)           # binário
-        elif hasattr(new_content, "read"):           # file-like (ex.: BytesIO/arquivo binário)
-            raw_bytes = new_content.read()
-        else:
-            raise BadRequestError("O parâmetro 'new_content' deve ser str, bytes, bytearray ou um file-like aberto em modo binário.")
+    def _write_large_file(self,
+                          repo: Repository,
+                          path: str,
+                          content: IO[bytes],
+                          message: str,
+                          branch: str
+                          ) -> ContentFile:
+        """
+        Grava um arquivo grande sem passar pela Contents API: o blob é enviado
+        em streaming a partir do disco e o commit é feito pela Git Data API.
+        A resposta não traz o conteúdo, para não carregá-lo na memória.
+        """
+        with spooled(content) as (file, size):
+            sha = self._stream_blob(repo, file, size)
 
+        element = InputGitTreeElement(path=path, mode="100644", type="blob", sha=sha)
+        self._commit_tree(repo, [element], message, branch)
+        self._file_shas[(repo.name, branch, path)] = sha
 
-        # Observação: Em PyGithub, a assinatura comum é:
-        # update_file(path, message, content, sha, branch=None, committer=None, author=None)
-        repo.update_file(
-            path=path,
-            message=message,
-            content=raw_bytes,
-            sha=sha,
-            branch=branch
-        )
+        return self._file_at(repo, path, sha, size, branch)
+
+    def _file_at(self,
+                 repo: Repository,
+                 path: str,
+                 sha: str,
+                 size: int,
+                 branch: str,
+                 raw_bytes: Optional[bytes] = None
+                 ) -> ContentFile:
+        """
+        Monta o ContentFile de um arquivo cujo SHA já é conhecido, sem
+        requisições ao GitHub. O conteúdo só é incluído se 'raw_bytes' vier.
+        """
+        attributes = {
+            "type": "file",
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "sha": sha,
+            "size": size,
+            "url": f"{repo.url}/contents/{quote(path)}?ref={quote(branch)}",
+            "html_url": f"{repo.html_url}/blob/{branch}/{path}",
+            "git_url": f"{repo.url}/git/blobs/{sha}",
+            "download_url": (f"https://raw.githubusercontent.com/{repo.full_name}/"
+                             f"{quote(branch)}/{quote(path)}"),
+        }
+        if raw_bytes is not None:
+            attributes["encoding"] = "base64"
+            attributes["content"] = base64.b64encode(raw_bytes).decode("ascii")
+        return ContentFile(repo.requester, {}, attributes, completed=True)
+
+    def _stream_blob(self, repo: Repository, file: IO[bytes], size: int) -> str:
+        start = file.tell()
+
+        def send() -> str:
+            # Cada tentativa relê o arquivo desde o início
+            file.seek(start)
+            return create_blob(repo, file, size)
+
+        return with_backoff(send)
 
-        # Retorna o arquivo atualizado (mantendo seu padrão)
-        return self.get_file(repo_name, path, branch)
 
-    
     def delete_file(self, 
                     repo_name: str,
                     path: str,
                     message: Optional[str] = "Delete file via script", 
                     branch: Optional[str] = "main"
-                ) -> None:
+                    ) -> Dict:
         
         repo = self.get_repo_by_name(repo_name)
 
-        if not self._branch_exists(repo_name, branch):
-            raise NotFoundError(resource_type="Branch", resource_identifier=branch)
-        
-        if not self._file_exists(repo_name, path, branch):
+        sha = self._file_sha(repo_name, path, branch)
+        if sha is None:
             raise NotFoundError(resource_type="File", resource_identifier=path)
-        
-        file = self.get_file(repo_name, path, branch)
 
         repo.delete_file(
             path=path, 
             message=message, 
-            sha=file.sha, 
+            sha=sha,
             branch=branch
         )
+        self._file_shas.pop((repo_name, branch, path), None)
 
         return {"message": f"File '{path}' deleted successfully."}
 
+    def delete_files(self,
+                     repo_name: str,
+                     patterns: List[str],
+                     message: Optional[str] = "Delete files via script",
+                     branch: Optional[str] = "main"
+                     ) -> Tuple[GitCommit, List[str]]:
+        """
+        Remove de uma vez todos os arquivos que casam com os padrões, em um
+        único commit. Os caminhos são resolvidos numa leitura da árvore da branch.
+
+        :param patterns: Caminhos de arquivo, pastas (tudo o que estiver dentro
+                         é removido) ou padrões glob (ex.: "grupo-1/*/conclusion.json";
+                         "grupo-1/**/*.json" desce em todas as subpastas)
+        :return: Commit criado e a lista de caminhos removidos
+        """
+        repo = self.get_repo_by_name(repo_name)
+
+        deleted = sorted(
+            element.path
+            for element in self._branch_tree(repo, branch)
+            if element.type == "blob"
+            and any(_matches_path(element.path, pattern) for pattern in patterns)
+        )
+        if not deleted:
+            raise NotFoundError(resource_type="Path",
+                                resource_identifier=", ".join(patterns))
+
+        elements = [
+            InputGitTreeElement(path=path, mode="100644", type="blob", sha=None)
+            for path in deleted
+        ]
+        commit = self._commit_tree(repo, elements, message, branch)
+
+        for path in deleted:
+            self._file_shas.pop((repo_name, branch, path), None)
+        return commit, deleted
+
+    def _to_bytes(self, content: Union[str, bytes, bytearray, IO[bytes]]) -> bytes:
+        # Normaliza o conteúdo para bytes
+        if hasattr(content, "read"):           # file-like (BytesIO, arquivo do Flask)
+            return content.read()
+        if isinstance(content, str):
+            return content.encode("utf-8")     # texto
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)              # binário
+        raise BadRequestError(
+            "O conteúdo deve ser str, bytes, bytearray ou um file-like aberto "
+            "em modo binário."
+        )
+
+    def upload_files(self,
+                     repo_name: str,
+                     files: Dict[str, Union[str, bytes, bytearray, IO[bytes]]],
+                     message: Optional[str] = "Add files via script",
+                     branch: Optional[str] = "main",
+                     max_workers: int = WRITE_CONCURRENCY
+                     ) -> Tuple[GitCommit, Dict[str, str]]:
+        """
+        Envia vários arquivos para o repositório em um único commit atômico,
+        usando a Git Data API (blobs, tree, commit e ref).
+
+        Arquivos de texto vão direto na tree e binários viram blobs criados em
+        paralelo (até 'max_workers' por vez). Falhas em arquivos individuais
+        são devolvidas em vez de interromper o lote; o commit leva os demais.
+
+        :param files: Dicionário {caminho no repositório: conteúdo}
+        :return: Tupla (commit criado, {caminho: mensagem de erro})
+        """
+
+        if not files:
+            raise BadRequestError("Ao menos um arquivo deve ser enviado.")
+
+        repo = self.get_repo_by_name(repo_name)
+
+        elements, failures = self._tree_elements(repo, files, max_workers)
+        if not elements:
+            raise GithubError(f"Nenhum arquivo pôde ser enviado: {failures}", 502)
+
+        commit = self._commit_tree(repo, elements, message, branch)
+        return commit, failures
+
+    def sync_files(self,
+                   repo_name: str,
+                   files: Dict[str, Union[str, bytes, bytearray, IO[bytes]]],
+                   message: Optional[str] = "Sync files via script",
+                   branch: Optional[str] = "main",
+                   prune: Optional[Callable[[str], bool]] = None,
+                   max_workers: int = WRITE_CONCURRENCY
+                   ) -> Tuple[Optional[GitCommit], Dict[str, List[str]],
+                              Dict[str, str]]:
+        """
+        Deixa os arquivos da branch iguais aos informados, num único commit e
+        só com o que mudou. Os SHAs dos blobs são calculados localmente e
+        comparados com a árvore atual (uma chamada); se nada mudou, não há commit.
+
+        :param files: Dicionário {caminho no repositório: conteúdo desejado}
+        :param prune: Caminhos existentes para os quais retorna True e que não
+                      estão em 'files' são removidos (None = não remove nada)
+        :return: Tupla (commit criado ou None, {"added", "changed", "deleted",
+                 "unchanged": [caminhos]}, {caminho: mensagem de erro})
+        """
+
+        repo = self.get_repo_by_name(repo_name)
+        current = {
+            element.path: element.sha
+            for element in self._branch_tree(repo, branch)
+            if element.type == "blob"
+        }
+
+        changes: Dict[str, List[str]] = {"added": [], "changed": [],
+                                         "deleted": [], "unchanged": []}
+        pending: Dict[str, Union[str, bytes, bytearray, IO[bytes]]] = {}
+        failures: Dict[str, str] = {}
+
+        for path, content in files.items():
+            try:
+                sha = blob_sha(content)
+            except BadRequestError as e:
+                failures[path] = e.message
+                continue
+
+            if current.get(path) == sha:
+                changes["unchanged"].append(path)
+                continue
+            changes["changed" if path in current else "added"].append(path)
+            pending[path] = content
+
+        if prune is not None:
+            changes["deleted"] = sorted(path for path in current
+                                        if path not in files and prune(path))
+
+        if not pending and not changes["deleted"]:
+            return None, changes, failures
+
+        elements, write_failures = [], {}
+        if pending:
+            elements, write_failures = self._tree_elements(repo, pending, max_workers)
+        failures.update(write_failures)
+        for key in ("added", "changed"):
+            changes[key] = [path for path in changes[key] if path not in write_failures]
+
+        elements += [
+            InputGitTreeElement(path=path, mode="100644", type="blob", sha=None)
+            for path in changes["deleted"]
+        ]
+        if not elements:
+            raise GithubError(f"Nenhum arquivo pôde ser sincronizado: {failures}", 502)
+
+        commit = self._commit_tree(repo, elements, message, branch)
+        return commit, changes, failures
+
+    def _tree_elements(self,
+                       repo: Repository,
+                       files: Dict[str, Union[str, bytes, bytearray, IO[bytes]]],
+                       max_workers: int
+                       ) -> Tuple[List[InputGitTreeElement], Dict[str, str]]:
+        """
+        Monta as entradas da tree. Texto UTF-8 é enviado na própria tree (o
+        GitHub cria o blob, sem uma chamada por arquivo); os binários são
+        criados como blobs em paralelo, com backoff nos limites de taxa, e os
+        arquivos grandes são enviados em streaming a partir do disco.
+
+        Os conclusion.json de uma classe são texto pequeno e vão todos na tree:
+        nenhum blob é criado e o lote custa só as chamadas do commit.
+        """
+        elements, failures, binaries, large = self._inline_elements(files)
+        if binaries or large:
+            uploaded, upload_failures = self._upload_blobs(
+                repo, binaries, large, max_workers
+            )
+            elements.extend(uploaded)
+            failures.update(upload_failures)
+        return elements, failures
+
+    def _inline_elements(self,
+                         files: Dict[str, Union[str, bytes, bytearray, IO[bytes]]]
+                         ) -> Tuple[List[InputGitTreeElement], Dict[str, str],
+                                    Dict[str, bytes], Dict[str, IO[bytes]]]:
+        """
+        Entradas com o texto na própria tree.
+        :return: (entradas, falhas, binários e arquivos grandes que precisam de blob)
+        """
+        elements: List[InputGitTreeElement] = []
+        failures: Dict[str, str] = {}
+        binaries: Dict[str, bytes] = {}
+        large: Dict[str, IO[bytes]] = {}
+
+        for path, content in files.items():
+            if is_large(content):
+                large[path] = content
+                continue
+
+            try:
+                raw_bytes = self._to_bytes(content)
+            except BadRequestError as e:
+                failures[path] = e.message
+                continue
+
+            try:
+                text = raw_bytes.decode("utf-8")
+            except UnicodeDecodeError:
+                binaries[path] = raw_bytes
+                continue
+            elements.append(InputGitTreeElement(
+                path=path, mode="100644", type="blob", content=text
+            ))
+
+        return elements, failures, binaries, large
+
+    def _upload_blobs(self,
+                      repo: Repository,
+                      binaries: Dict[str, bytes],
+                      large: Dict[str, IO[bytes]],
+                      max_workers: int
+                      ) -> Tuple[List[InputGitTreeElement], Dict[str, str]]:
+        """Cria os blobs em paralelo, no máximo 'max_workers' de cada vez."""
+        elements: List[InputGitTreeElement] = []
+        failures: Dict[str, str] = {}
+
+        workers = max(1, min(max_workers, len(binaries) + len(large)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._create_blob, repo, raw_bytes): path
+                for path, raw_bytes in binaries.items()
+            }
+            futures.update({
+                executor.submit(self._create_large_blob, repo, content): path
+                for path, content in large.items()
+            })
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    elements.append(InputGitTreeElement(
+                        path=path, mode="100644", type="blob", sha=future.result()
+                    ))
+                except GithubException as e:
+                    failures[path] = str(
+                        (e.data or {}).get("message") if isinstance(e.data, dict) else e
+                    )
+
+        return elements, failures
+
+    def _create_blob(self, repo: Repository, raw_bytes: bytes) -> str:
+        encoded = base64.b64encode(raw_bytes).decode("ascii")
+        return with_backoff(lambda: repo.create_git_blob(encoded, "base64")).sha
+
+    def _create_large_blob(self, repo: Repository, content: IO[bytes]) -> str:
+        with spooled(content) as (file, size):
+            return self._stream_blob(repo, file, size)
+
+    def _commit_tree(self,
+                     repo: Repository,
+                     elements: List[InputGitTreeElement],
+                     message: str,
+                     branch: str
+                     ) -> GitCommit:
+        """
+        Cria a tree e o commit sobre a ponta atual da branch e avança a ref.
+        Os commits numa mesma ref são sempre sequenciais: se a branch andou
+        no meio do caminho (update não fast-forward), refaz sobre a nova ponta.
+        Dentro do processo, os commits numa mesma branch esperam a sua vez.
+        """
+
+        with _ref_lock(repo.full_name, branch):
+            return self._commit_tree_unlocked(repo, elements, message, branch)
+
+    def _commit_tree_unlocked(self,
+                              repo: Repository,
+                              elements: List[InputGitTreeElement],
+                              message: str,
+                              branch: str
+                              ) -> GitCommit:
+        for attempt in range(COMMIT_ATTEMPTS):
+            try:
+                ref = repo.get_git_ref(f"heads/{branch}")
+            except GithubException as e:
+                if e.status != 404:
+                    raise
+                raise NotFoundError(resource_type="Branch", resource_identifier=branch)
 
+            parent = repo.get_git_commit(ref.object.sha)
+            tree = repo.create_git_tree(elements, base_tree=parent.tree)
+            commit = repo.create_git_commit(message, tree, [parent])
 
+            try:
+                ref.edit(commit.sha)
+                return commit
+            except GithubException as e:
+                if e.status != 422 or attempt == COMMIT_ATTEMPTS - 1:
+                    raise
@@ -0,0 +1,58 @@
+"""
+Consultas à API GraphQL do GitHub pelo transporte compartilhado.
+
+O `graphql_query` do PyGithub trata o POST como escrita e espera o intervalo
+entre escritas (GITHUB_SECONDS_BETWEEN_WRITES) antes de cada consulta; aqui a
+consulta é uma leitura comum, com o mesmo pool, agendador e métricas.
+"""
+
+import os
+from typing import Any, Dict
+
+from github.GithubException import GithubException, UnknownObjectException
+from github.Requester import Requester
+
+from . import transport
+
+GRAPHQL_TIMEOUT = float(os.getenv("GITHUB_GRAPHQL_TIMEOUT", "60"))
+
+
+def graphql_query(requester: Requester,
+                  query: str,
+                  variables: Dict[str, Any],
+                  partial: bool = False
+                  ) -> Dict[str, Any]:
+    """
+    :param partial: Aceita erros NOT_FOUND e devolve os campos não encontrados
+                    como None
+    :return: O campo 'data' da resposta
+    :raises UnknownObjectException: Objeto raiz não encontrado (erro NOT_FOUND),
+                                    se não 'partial'
+    :raises GithubException: Status de erro ou outros erros da consulta
+    """
+    headers = {"Accept": "application/json"}
+    requester.auth.authentication(headers)
+
+    with transport.session() as session:
+        response = session.post(requester.graphql_url,
+                                json={"query": query, "variables": variables},
+                                headers=headers, timeout=GRAPHQL_TIMEOUT)
+    response_headers = {k.lower(): v for k, v in response.headers.items()}
+    try:
+        data = response.json()
+    except ValueError:
+        data = {"message": response.text}
+
+    if response.status_code != 200:
+        raise GithubException(response.status_code, data, response_headers)
+
+    errors = data.get("errors") or []
+    if errors:
+        if all(error.get("type") == "NOT_FOUND" for error in errors):
+            if partial:
+                return data.get("data") or {}
+            raise UnknownObjectException(404, {"message": errors[0].get("message")},
+                                         response_headers)
+        message = "; ".join(error.get("message", "") for error in errors)
+        raise GithubException(400, {"message": message}, response_headers)
+    return data.get("data") or {}
@@ -0,0 +1,281 @@
+"""
+Controle do limite de requisições do GitHub por token.
+
+Cada resposta do GitHub informa quanto resta do limite (X-RateLimit-*) e, nos
+limites secundários, quanto tempo esperar (Retry-After). O `RateLimiter` guarda
+esses valores por token e, antes de cada requisição, decide se ela segue, se
+espera na fila (espaçando as chamadas quando o saldo está acabando) ou se é
+recusada com 429 quando a espera passaria do máximo permitido.
+"""
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+from github.Auth import Token
+
+from ..errors import RateLimitedError
+
+
+def _hash(authorization: str) -> str:
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+def token_key(request: requests.PreparedRequest) -> str:
+    return _hash(request.headers.get("Authorization", ""))
+
+
+def key_for_token(token: str) -> str:
+    """Mesma chave de `token_key`, a partir do token enviado à API."""
+    auth = Token(token)
+    return _hash(f"{auth.token_type} {auth.token}")
+
+
+def resource_of(request: requests.PreparedRequest) -> str:
+    """Grupo de limite do GitHub ao qual a requisição pertence."""
+    path = requests.utils.urlparse(request.url).path
+    if path.startswith("/search/") or "/api/v3/search/" in path:
+        return "search"
+    if path.endswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return (
+        "retry-after" in response.headers
+        or response.headers.get("x-ratelimit-remaining") == "0"
+    )
+
+
+@dataclass
+class _Budget:
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {"limit": self.limit, "remaining": self.remaining, "reset": self.reset}
+
+
+@dataclass
+class _TokenState:
+    budgets: Dict[str, _Budget] = field(default_factory=dict)
+    blocked_until: float = 0.0
+    last_sent: float = 0.0
+    in_flight: int = 0
+    queued: int = 0
+    throttled: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    condition: threading.Condition = field(default_factory=threading.Condition)
+
+
+class RateLimiter:
+    """
+    Agenda as requisições de cada token de acordo com o saldo informado pelo GitHub.
+
+    :param max_concurrent: Requisições simultâneas por token (o GitHub aplica
+                           limite secundário a rajadas concorrentes)
+    :param reserve: Saldo a partir do qual as chamadas passam a ser espaçadas
+                    até o reset da janela
+    :param max_wait: Espera máxima (s) na fila antes de responder 429
+    :param idle_after: Tempo (s) sem requisições após o qual o estado de um
+                       token é esquecido, se ele não tiver nada na fila nem
+                       espera pendente
+    """
+
+    def __init__(self,
+                 max_concurrent: int = 8,
+                 reserve: int = 50,
+                 max_wait: float = 30.0,
+                 idle_after: float = 900.0
+                 ) -> None:
+        self._max_concurrent = max_concurrent
+        self._reserve = reserve
+        self._max_wait = max_wait
+        self._idle_after = idle_after
+        self._states: Dict[str, _TokenState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> _TokenState:
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                # Só um token novo paga a limpeza: o dicionário não cresce
+                # com cada token que o processo já viu
+                self._forget_idle()
+                state = self._states[key] = _TokenState()
+            state.last_used = time.monotonic()
+            return state
+
+    def _forget_idle(self) -> None:
+        """Remove os tokens ociosos (chamado com self._lock)."""
+        idle_since = time.monotonic() - self._idle_after
+        now = time.time()
+        for key, state in list(self._states.items()):
+            if state.last_used > idle_since:
+                continue
+            with state.condition:
+                waiting = any(
+                    self._delay(state, resource, now) > 0
+                    for resource in ["core", *state.budgets]
+                )
+                if not (state.in_flight or state.queued or waiting):
+                    del self._states[key]
+
+    def _delay(self, state: _TokenState, resource: str, now: float) -> float:
+        """Tempo que a próxima requisição deve esperar (0 para seguir já)."""
+        delay = max(state.blocked_until - now, 0.0)
+
+        budget = state.budgets.get(resource)
+        if (
+            budget is None
+            or budget.remaining is None
+            or budget.reset is None
+            or budget.reset <= now
+        ):
+            return delay
+
+        window = budget.reset - now
+        if budget.remaining <= 0:
+            return max(delay, window)
+        if budget.remaining <= self._reserve:
+            # Espalha o saldo que sobrou até o reset em vez de gastá-lo numa rajada
+            return max(delay, state.last_sent + window / budget.remaining - now)
+        return delay
+
+    def acquire(self, key: str, resource: str = "core") -> None:
+        state = self._state(key)
+        deadline = time.monotonic() + self._max_wait
+
+        with state.condition:
+            state.queued += 1
+            try:
+                while True:
+                    delay = self._delay(state, resource, time.time())
+                    if delay <= 0 and state.in_flight < self._max_concurrent:
+                        break
+
+                    remaining_wait = deadline - time.monotonic()
+                    if delay > remaining_wait:
+                        raise RateLimitedError(retry_after=max(delay, 1.0))
+
+                    if delay > 0:
+                        state.throttled += 1
+                        # Jitter para que as requisições na fila não acordem
+                        # todas juntas
+                        delay = min(delay * random.uniform(1.0, 1.25), remaining_wait)
+                    state.condition.wait(delay if delay > 0 else remaining_wait)
+            finally:
+                state.queued -= 1
+            state.in_flight += 1
+            state.last_sent = time.time()
+
+    async def acquire_async(self, key: str, resource: str = "core",
+                            poll: float = 0.05) -> None:
+        """
+        Versão de `acquire` para o event loop: em vez de bloquear a thread na
+        fila, aguarda com asyncio.sleep e volta a conferir o saldo e as vagas.
+        """
+        state = self._state(key)
+        deadline = time.monotonic() + self._max_wait
+
+        with state.condition:
+            state.queued += 1
+        try:
+            while True:
+                with state.condition:
+                    delay = self._delay(state, resource, time.time())
+                    if delay <= 0 and state.in_flight < self._max_concurrent:
+                        state.in_flight += 1
+                        state.last_sent = time.time()
+                        return
+
+                    remaining_wait = deadline - time.monotonic()
+                    if delay > remaining_wait:
+                        raise RateLimitedError(retry_after=max(delay, 1.0))
+                    if delay > 0:
+                        state.throttled += 1
+                        delay = min(delay * random.uniform(1.0, 1.25), remaining_wait)
+
+                # Sem vaga livre, espera um pouco: o release não acorda corrotinas
+                idle = min(poll, max(remaining_wait, 0.0))
+                await asyncio.sleep(delay if delay > 0 else idle)
+        finally:
+            with state.condition:
+                state.queued -= 1
+
+    def release(self,
+                key: str,
+                response: Optional[requests.Response] = None,
+                resource: str = "core"
+                ) -> None:
+        state = self._state(key)
+
+        with state.condition:
+            state.in_flight -= 1
+            if response is not None:
+                self._update(state, response, resource)
+            state.condition.notify_all()
+
+    def _update(self, state: _TokenState, response: requests.Response,
+                resource: str) -> None:
+        headers = response.headers
+        resource = headers.get("x-ratelimit-resource", resource)
+
+        if "x-ratelimit-remaining" in headers:
+            budget = state.budgets.setdefault(resource, _Budget())
+            try:
+                budget.limit = int(headers.get("x-ratelimit-limit", budget.limit or 0))
+                budget.remaining = int(headers["x-ratelimit-remaining"])
+                budget.reset = float(
+                    headers.get("x-ratelimit-reset", budget.reset or 0)
+                )
+            except ValueError:
+                pass
+
+        if is_rate_limited(response):
+            retry_after = headers.get("retry-after")
+            try:
+                wait = float(retry_after) if retry_after is not None else 60.0
+            except ValueError:
+                wait = 60.0
+            state.blocked_until = max(state.blocked_until, time.time() + wait)
+
+    def snapshot(self, key: Optional[str] = None) -> List[Dict]:
+        """
+        Saldo e fila de cada token conhecido, identificados pelo hash do token.
+        :param key: Só o token com esta chave (de `key_for_token`)
+        """
+        with self._lock:
+            states = [(k, state) for k, state in self._states.items()
+                      if key is None or k == key]
+
+        now = time.time()
+        result = []
+        for key, state in states:
+            with state.condition:
+                resources = {name: budget.to_dict()
+                             for name, budget in state.budgets.items()}
+                result.append({
+                    "token": key[:12],
+                    "resources": resources,
+                    "blocked_for": round(max(state.blocked_until - now, 0.0), 3),
+                    "in_flight": state.in_flight,
+                    "queue_depth": state.queued,
+                    "throttled": state.throttled
+                })
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
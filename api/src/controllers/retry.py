@@ -0,0 +1,45 @@
+import random
+import time
+from typing import Callable, TypeVar
+
+from github.GithubException import GithubException
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = 4
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+
+def is_retryable(e: GithubException) -> bool:
+    """Limites de taxa (429 e o limite secundário em 403) e falhas 5xx."""
+    if e.status == 429 or e.status >= 500:
+        return True
+    if e.status == 403:
+        message = (
+            str((e.data or {}).get("message", "")) if isinstance(e.data, dict) else ""
+        )
+        return "rate limit" in message.lower() or "retry-after" in (e.headers or {})
+    return False
+
+
+def retry_delay(e: GithubException, attempt: int) -> float:
+    """Respeita o Retry-After do GitHub; sem ele, usa backoff exponencial com jitter."""
+    retry_after = (e.headers or {}).get("retry-after")
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), MAX_DELAY)
+        except ValueError:
+            pass
+    delay = min(BASE_DELAY * 2 ** attempt, MAX_DELAY)
+    return delay * random.uniform(0.5, 1.5)
+
+
+def with_backoff(func: Callable[[], T], attempts: int = MAX_ATTEMPTS) -> T:
+    for attempt in range(attempts):
+        try:
+            return func()
+        except GithubException as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            time.sleep(retry_delay(e, attempt))
@@ -0,0 +1,220 @@
+"""
+Transporte HTTP compartilhado por todos os clientes do PyGithub do processo.
+
+Por padrão cada cliente `Github` mantém uma única conexão própria, que não pode
+ser usada por duas threads ao mesmo tempo. Aqui cada requisição recebe um objeto
+de conexão leve, mas todos usam o mesmo pool de conexões keep-alive (urllib3).
+"""
+
+import os
+import threading
+import time
+from typing import Optional, Union
+
+import requests
+from requests.adapters import DEFAULT_RETRIES, HTTPAdapter
+from urllib3.util.retry import Retry
+from github.Requester import (
+    Requester,
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+)
+
+from ..metrics import observe_github_call
+from .etag_cache import ETagCache
+from .rate_limit import RateLimiter, token_key, resource_of, is_rate_limited
+
+POOL_SIZE = int(os.getenv("GITHUB_HTTP_POOL_SIZE", "32"))
+RATE_LIMIT_RETRIES = int(os.getenv("GITHUB_RATE_LIMIT_RETRIES", "2"))
+
+etag_cache = ETagCache(
+    max_entries=int(os.getenv("GITHUB_ETAG_CACHE_SIZE", "1024")),
+    max_bytes=int(os.getenv("GITHUB_ETAG_CACHE_BYTES", str(64 * 1024 * 1024)))
+)
+
+rate_limiter = RateLimiter(
+    max_concurrent=int(os.getenv("GITHUB_MAX_CONCURRENT_PER_TOKEN", "8")),
+    reserve=int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "50")),
+    max_wait=float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT", "30")),
+    # Mesmo prazo do pool de clientes: um token ocioso sai dos dois
+    idle_after=float(os.getenv("GITHUB_CLIENT_POOL_TTL", "900"))
+)
+
+
+def _server_error_retry(retry: Union[int, Retry, None]) -> Union[int, Retry]:
+    """
+    Política de repetição do cliente (o GithubRetry do PyGithub, por padrão)
+    só para falhas de conexão e do servidor: as recusas por limite (403 e 429)
+    ficam com o RateLimiter, que aplica o Retry-After a todas as requisições
+    do token.
+    """
+    if not isinstance(retry, Retry):
+        return DEFAULT_RETRIES if retry is None else retry
+    statuses = [status for status in retry.status_forcelist or ()
+                if status not in (403, 429)]
+    return Retry(total=retry.total, connect=retry.connect, read=retry.read,
+                 redirect=retry.redirect, status=retry.status, other=retry.other,
+                 allowed_methods=retry.allowed_methods, status_forcelist=statuses,
+                 backoff_factor=retry.backoff_factor, backoff_max=retry.backoff_max,
+                 raise_on_redirect=retry.raise_on_redirect,
+                 raise_on_status=retry.raise_on_status,
+                 respect_retry_after_header=retry.respect_retry_after_header)
+
+
+class GithubHTTPAdapter(HTTPAdapter):
+    """
+    Adapter das conexões do PyGithub. Revalida as leituras guardadas no cache
+    de ETags em vez de baixá-las novamente e passa cada requisição pelo
+    agendador do limite de requisições do token.
+
+    :param pool: Adapter cujo pool de conexões é reaproveitado (ver `with_retry`)
+    """
+
+    def __init__(self, cache: ETagCache, limiter: RateLimiter,
+                 retries: int = RATE_LIMIT_RETRIES,
+                 pool: Optional["GithubHTTPAdapter"] = None, **kwargs) -> None:
+        self._pool = pool
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.limiter = limiter
+        self.retries = retries
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        if self._pool is None:
+            super().init_poolmanager(*args, **kwargs)
+        else:
+            self.poolmanager = self._pool.poolmanager
+            self.proxy_manager = self._pool.proxy_manager
+
+    def with_retry(self, retry: Union[int, Retry, None]) -> "GithubHTTPAdapter":
+        """
+        Adapter sobre o mesmo pool de conexões com a política de repetição de
+        um cliente do PyGithub, para falhas de conexão e respostas 5xx.
+        """
+        return GithubHTTPAdapter(self.cache, self.limiter, self.retries, pool=self,
+                                 max_retries=_server_error_retry(retry))
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False,
+             **kwargs) -> requests.Response:
+        key = token_key(request)
+        resource = resource_of(request)
+
+        for attempt in range(self.retries + 1):
+            # Espera na fila do token se o saldo acabou ou o GitHub pediu Retry-After
+            self.limiter.acquire(key, resource)
+            response = None
+            started = time.perf_counter()
+            try:
+                # Cópia por tentativa: o cache acrescenta cabeçalhos
+                # condicionais à requisição
+                response = self._send_cached(request.copy(), stream=stream, **kwargs)
+            finally:
+                self.limiter.release(key, response, resource)
+                status = response.status_code if response is not None else None
+                observe_github_call(request.method, request.url, status,
+                                    time.perf_counter() - started)
+
+            # Requisições recusadas pelo limite não foram processadas e podem ser
+            # repetidas, exceto as de corpo em streaming, que já foi consumido
+            streamed_body = hasattr(request.body, "read")
+            last_attempt = attempt == self.retries
+            if last_attempt or streamed_body or not is_rate_limited(response):
+                return response
+            response.close()
+
+    def close(self) -> None:
+        # O pool é do processo: fechar uma sessão de `session()` não o esvazia
+        pass
+
+    def _send_cached(self, request: requests.PreparedRequest, stream: bool = False,
+                     **kwargs) -> requests.Response:
+        key = self.cache.key(request) if self.cache.enabled and not stream else None
+        cached = self.cache.get(key) if key else None
+
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            self.cache.record(hit=True)
+            return cached.to_response(request, response)
+
+        if key is not None:
+            self.cache.record(hit=False)
+            if response.status_code == 200:
+                self.cache.store(key, response)
+
+        return response
+
+
+_adapter: Optional[GithubHTTPAdapter] = None
+_adapter_lock = threading.Lock()
+
+
+def shared_adapter() -> GithubHTTPAdapter:
+    global _adapter
+    if _adapter is None:
+        with _adapter_lock:
+            if _adapter is None:
+                _adapter = GithubHTTPAdapter(etag_cache, rate_limiter,
+                                             pool_connections=POOL_SIZE,
+                                             pool_maxsize=POOL_SIZE)
+    return _adapter
+
+
+def session() -> requests.Session:
+    """Sessão para chamadas feitas fora do PyGithub, sobre o mesmo pool e agendador."""
+    new_session = requests.Session()
+    new_session.mount("https://", shared_adapter())
+    new_session.mount("http://", shared_adapter())
+    return new_session
+
+
+def _init_connection(cnx, protocol: str, host: str, port: Optional[int],
+                     timeout: Optional[int], retry: Union[int, Retry, None],
+                     **kwargs) -> None:
+    # Mesmos atributos das classes do PyGithub, mas sem criar um pool por conexão:
+    # o tamanho do pool é o do processo (GITHUB_HTTP_POOL_SIZE), não 'pool_size'
+    cnx.port = port if port else (443 if protocol == "https" else 80)
+    cnx.host = host
+    cnx.protocol = protocol
+    cnx.timeout = timeout
+    cnx.verify = kwargs.get("verify", True)
+    cnx.retry = DEFAULT_RETRIES if retry is None else retry
+    cnx.pool_size = POOL_SIZE
+    cnx.session = requests.Session()
+    cnx.session.auth = Requester.noopAuth
+    cnx.adapter = shared_adapter().with_retry(retry)
+    cnx.session.mount(f"{protocol}://", cnx.adapter)
+
+
+class PooledHTTPSConnection(HTTPSRequestsConnectionClass):
+
+    def __init__(self, host: str, port: Optional[int] = None, strict: bool = False,
+                 timeout: Optional[int] = None, retry=None,
+                 pool_size: Optional[int] = None, **kwargs) -> None:
+        _init_connection(self, "https", host, port, timeout, retry, **kwargs)
+
+    def close(self) -> None:
+        # O pool pertence ao processo e não é fechado junto com o cliente
+        pass
+
+
+class PooledHTTPConnection(HTTPRequestsConnectionClass):
+
+    def __init__(self, host: str, port: Optional[int] = None, strict: bool = False,
+                 timeout: Optional[int] = None, retry=None,
+                 pool_size: Optional[int] = None, **kwargs) -> None:
+        _init_connection(self, "http", host, port, timeout, retry, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+def install() -> None:
+    """Faz o PyGithub usar o transporte compartilhado em todos os clientes."""
+    Requester.injectConnectionClasses(PooledHTTPConnection, PooledHTTPSConnection)
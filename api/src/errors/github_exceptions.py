@@ -48,3 +48,37 @@ class AlreadyExistsError(BadRequestError):
     def __init__(self, resource_type: str = "Resource", resource_identifier: str = ""):
         message = f"{resource_type} '{resource_identifier}' already exists."
         super().__init__(message)
+
+
+class ValidationError(BadRequestError):
+    """Exception raised when a document does not follow its schema."""
+
+    def __init__(self, errors: list, total: int = 0):
+        count = max(total, len(errors))
+        super().__init__(f"The document has {count} validation error(s).")
+        self.errors = list(errors)
+
+    def send_error(self):
+        return {**super().send_error(), 'errors': self.errors}
+
+
+class ConflictError(GithubError):
+    """Exception raised when a resource changed since the version the client knows."""
+
+    def __init__(self, resource_type: str = "File", resource_identifier: str = ""):
+        message = (f"{resource_type} '{resource_identifier}' was modified. "
+                   "Fetch the current version and try again.")
+        super().__init__(message, 409)
+
+
+class RateLimitedError(GithubError):
+    """Exception raised when the GitHub rate limit for the token would be exceeded."""
+
+    def __init__(self, retry_after: float = 60,
+                 message: str = ("GitHub rate limit exceeded for this token. "
+                                 "Try again later.")):
+        super().__init__(message, 429)
+        self.retry_after = int(retry_after + 0.999)
+
+    def send_error(self):
+        return {**super().send_error(), 'retry_after': self.retry_after}
@@ -0,0 +1,2 @@
+from .store import Job, JobStore
+from .runner import JobRunner, JobProgress
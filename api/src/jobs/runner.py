@@ -0,0 +1,123 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .store import Job, JobStore, DONE, FAILED, OWNER, RUNNING, owner_is_dead
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgress:
+    """
+    Progresso de um job, salvo a cada atualização. Ao retomar um job
+    interrompido, o handler lê daqui as etapas que já foram concluídas.
+    """
+
+    def __init__(self, store: JobStore, job: Job) -> None:
+        self._store = store
+        self._job_id = job.id
+        self._data: Dict[str, Any] = dict(job.progress)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def update(self, **values: Any) -> None:
+        with self._lock:
+            self._data.update(values)
+            self._store.update_progress(self._job_id, self._data)
+
+    def append(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data.setdefault(key, []).append(value)
+            self._store.update_progress(self._job_id, self._data)
+
+
+JobHandler = Callable[[Job, JobProgress], None]
+
+
+class JobRunner:
+    """
+    Executa jobs em um pool limitado de threads. Os jobs ficam no JobStore,
+    então os que foram interrompidos por um reinício são retomados por resume()
+    e, se o processo dono morrer depois disso, por reclaim().
+
+    Enquanto o handler roda, o job dá sinal de vida a cada 'heartbeat' s,
+    independente do progresso: uma etapa longa (um commit com novas
+    tentativas, a espera pelo template) não faz outro processo retomá-lo.
+    Só um job sem sinal há mais de 'stale_after' s é considerado abandonado.
+    """
+
+    def __init__(self,
+                 store: JobStore,
+                 max_workers: int = 2,
+                 stale_after: float = 300,
+                 heartbeat: float = 30
+                 ) -> None:
+        if stale_after < 3 * heartbeat:
+            raise ValueError("stale_after must be at least three heartbeats")
+        self.store = store
+        self._stale_after = stale_after
+        self._heartbeat = heartbeat
+        self._handlers: Dict[str, JobHandler] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="job")
+        self._resumed = False
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Job:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        job = self.store.create(kind, payload)
+        self._executor.submit(self._run, job.id)
+        return job
+
+    def resume(self) -> None:
+        """Reenfileira, uma vez por processo, os jobs que não terminaram."""
+        with self._lock:
+            if self._resumed:
+                return
+            self._resumed = True
+        for job in self.store.pending():
+            self._executor.submit(self._run, job.id)
+
+    def reclaim(self, job: Job) -> None:
+        """
+        Retoma um job que consta em execução por um processo que já morreu,
+        como um que caiu depois que este processo fez o resume().
+        """
+        if job.status == RUNNING and job.owner != OWNER and owner_is_dead(job.owner):
+            self._executor.submit(self._run, job.id)
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.claim(job_id, self._stale_after)
+        if job is None:
+            return  # outro processo já está executando este job
+
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            self.store.finish(job.id, FAILED, f"Unknown job kind '{job.kind}'")
+            return
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._beat, args=(job.id, done),
+                                     name=f"job-heartbeat-{job.id}", daemon=True)
+        heartbeat.start()
+        try:
+            handler(job, JobProgress(self.store, job))
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            self.store.finish(job.id, FAILED, getattr(e, "message", None) or str(e))
+        else:
+            self.store.finish(job.id, DONE)
+        finally:
+            done.set()
+
+    def _beat(self, job_id: str, done: threading.Event) -> None:
+        while not done.wait(self._heartbeat):
+            self.store.touch(job_id)
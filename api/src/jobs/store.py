@@ -0,0 +1,185 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Identifica o processo atual: host, PID e um id de inicialização, que
+# distingue um processo novo que reaproveitou o PID (ex.: PID 1 em contêiner)
+BOOT_ID = uuid.uuid4().hex
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{BOOT_ID}"
+
+
+def owner_is_dead(owner: Optional[str]) -> bool:
+    """
+    Se o processo que reservou o job com certeza não existe mais. Só dá para
+    saber de processos deste mesmo host; nos demais vale o tempo sem sinal.
+    """
+    if not owner:
+        return False
+    host, _, rest = owner.partition(":")
+    pid, _, boot_id = rest.partition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return boot_id != BOOT_ID
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    progress: Dict[str, Any]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+    owner: Optional[str] = None
+
+    def to_dict(self, include_payload: bool = False) -> Dict:
+        data = asdict(self)
+        data.pop("owner")
+        if not include_payload:
+            data.pop("payload")
+        return data
+
+
+class JobStore:
+    """
+    Guarda os jobs em SQLite para que sobrevivam a um reinício do servidor
+    e possam ser consultados por qualquer processo.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    progress TEXT NOT NULL,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT
+                )
+                """
+            )
+            # Bancos criados antes da coluna 'owner'
+            columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def _to_job(self, row: sqlite3.Row) -> Job:
+        return Job(
+            row["id"],
+            row["kind"],
+            row["status"],
+            json.loads(row["payload"]),
+            json.loads(row["progress"]),
+            row["error"],
+            row["created_at"],
+            row["updated_at"],
+            row["owner"]
+        )
+
+    def create(self, kind: str, payload: Dict[str, Any]) -> Job:
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as db:
+            db.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, NULL, ?, ?, NULL)",
+                (job_id, kind, QUEUED, json.dumps(payload), "{}", now, now)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim(self, job_id: str, stale_after: float) -> Optional[Job]:
+        """
+        Marca o job como em execução por este processo, se ele estiver na fila,
+        se o processo que o executava morreu (mesmo host) ou se parou de dar
+        sinal de vida há mais de 'stale_after' s.
+        :return: O job reservado ou None se outro processo já o executa
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        orphaned = job.status == RUNNING and owner_is_dead(job.owner)
+
+        now = time.time()
+        with closing(self._connect()) as db:
+            # O dono lido acima entra na condição: só um processo fica com o órfão
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, updated_at = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND "
+                "(updated_at < ? OR (? AND owner IS ?))))",
+                (RUNNING, OWNER, now, job_id, QUEUED, RUNNING, now - stale_after,
+                 orphaned, job.owner)
+            )
+            claimed = cursor.rowcount == 1
+        return self.get(job_id) if claimed else None
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        with closing(self._connect()) as db:
+            db.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id)
+            )
+
+    def touch(self, job_id: str) -> None:
+        """Sinal de vida do job em execução por este processo."""
+        with closing(self._connect()) as db:
+            db.execute(
+                "UPDATE jobs SET updated_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (time.time(), job_id, RUNNING, OWNER)
+            )
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        with closing(self._connect()) as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def pending(self) -> List[Job]:
+        """Jobs que ainda não terminaram (na fila ou interrompidos no meio)."""
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
@@ -0,0 +1,3 @@
+from .registry import (CONTENT_TYPE, Registry, Counter, Histogram, GaugeCallback,
+                       CounterCallback)
+from .instrumentation import registry, instrument_app, observe_github_call
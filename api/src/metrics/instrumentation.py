@@ -0,0 +1,79 @@
+import re
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from flask import Flask, g, request
+
+from .registry import Registry, Counter, Histogram
+
+registry = Registry()
+
+github_requests = registry.register(Counter(
+    "github_requests_total",
+    "Chamadas feitas à API do GitHub.",
+    ("method", "endpoint", "status")
+))
+github_request_duration = registry.register(Histogram(
+    "github_request_duration_seconds",
+    "Tempo até a resposta (cabeçalhos) das chamadas à API do GitHub.",
+    ("method", "endpoint")
+))
+http_requests = registry.register(Counter(
+    "http_requests_total",
+    "Requisições atendidas pela aplicação.",
+    ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Tempo de processamento das requisições da aplicação "
+    "(sem o envio de respostas em streaming).",
+    ("method", "route")
+))
+
+# Trocas que tiram da URL os valores variáveis, para manter poucas séries por endpoint
+_ENDPOINT_PATTERNS = (
+    (re.compile(r"^(/api/v3)?/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"/contents/.*$"), "/contents/{path}"),
+    (re.compile(r"/git/(blobs|trees|commits)/[^/]+$"), r"/git/\1/{sha}"),
+    (re.compile(r"/git/refs?/heads/.*$"), "/git/ref/{ref}"),
+    (re.compile(r"/branches/.*$"), "/branches/{branch}"),
+)
+
+
+def github_endpoint(url: str) -> str:
+    """
+    Modelo do endpoint do GitHub de uma URL
+    (ex.: /repos/{owner}/{repo}/git/trees/{sha}).
+    """
+    path = urlparse(url).path
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def observe_github_call(method: str, url: str, status: Optional[int],
+                        duration: float) -> None:
+    endpoint = github_endpoint(url)
+    status_label = str(status) if status is not None else "error"
+    github_requests.inc(method, endpoint, status_label)
+    github_request_duration.observe(duration, method, endpoint)
+
+
+def instrument_app(app: Flask) -> None:
+    """Mede o tempo de cada rota da aplicação, pela regra da rota e pelo status."""
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            rule = request.url_rule
+            route = rule.rule if rule is not None else "unmatched"
+            http_requests.inc(request.method, route, str(response.status_code))
+            http_request_duration.observe(time.perf_counter() - started,
+                                          request.method, route)
+        return response
@@ -0,0 +1,150 @@
+"""
+Registro mínimo de métricas no formato de texto do Prometheus.
+
+Registrar um valor custa uma busca num dicionário sob um lock; a montagem do
+texto só acontece quando alguém consulta /metrics.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"'
+                     for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def lines(self) -> Iterator[str]:
+        """Linhas de amostra da métrica, sem o HELP e o TYPE."""
+
+    def render(self) -> str:
+        header = [f"# HELP {self.name} {_escape(self.documentation)}",
+                  f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(header + list(self.lines()))
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def lines(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}{label_text} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS
+                 ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._buckets = tuple(sorted(buckets))
+        # Por combinação de labels: contagem por faixa (sem acumular), soma e total
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            empty = ([0] * (len(self._buckets) + 1), [0.0])
+            counts, total = self._values.setdefault(labels, empty)
+            counts[index] += 1
+            total[0] += value
+
+    def lines(self) -> Iterator[str]:
+        with self._lock:
+            values = [(labels, list(counts), total[0])
+                      for labels, (counts, total) in self._values.items()]
+
+        bounds = self._buckets + (float("inf"),)
+        for labels, counts, total in sorted(values):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",),
+                                               labels + (_format_value(bound),))
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class GaugeCallback(Metric):
+    """Gauge calculado na hora da consulta (ex.: tamanho de um cache)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str,
+                 callback: Callable[[], float]) -> None:
+        super().__init__(name, documentation)
+        self._callback = callback
+
+    def lines(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self._callback())}"
+
+
+class CounterCallback(GaugeCallback):
+    """Contador mantido em outro objeto e lido na hora da consulta."""
+    kind = "counter"
+
+
+class Registry:
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            # Registrar de novo o mesmo nome devolve a métrica existente
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
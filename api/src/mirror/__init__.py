@@ -0,0 +1,23 @@
+import os
+import threading
+from typing import Optional
+
+from .store import MirrorStore
+from .refresh import refresh_repo, refresh_repos
+
+_store: Optional[MirrorStore] = None
+_store_lock = threading.Lock()
+
+
+def mirror_enabled() -> bool:
+    # Opcional: sem MIRROR_DB_PATH as rotas de /api/mirror não são registradas
+    return bool(os.getenv("MIRROR_DB_PATH"))
+
+
+def mirror_store() -> MirrorStore:
+    """Espelho do processo (MIRROR_DB_PATH), aberto no primeiro uso."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MirrorStore(os.getenv("MIRROR_DB_PATH"))
+        return _store
@@ -0,0 +1,130 @@
+"""
+Atualização incremental do espelho: o commit da branch é comparado com o
+espelhado e, só quando mudou, a árvore é lida de novo. Dos arquivos da classe
+só são buscados os blobs cujo SHA ainda não está no espelho.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from github.GithubException import GithubException
+
+from ..controllers import GithubController
+from ..errors import GithubError
+from ..models import MirroredRepoData, class_requirements
+from ..services.class_reader import parse_class
+from ..validation import CLASS_FILE
+from .store import MirrorStore
+
+# Repositórios atualizados ao mesmo tempo numa atualização completa
+MIRROR_REFRESH_CONCURRENCY = int(os.getenv("MIRROR_REFRESH_CONCURRENCY", "4"))
+
+
+def _is_class_file(path: str) -> bool:
+    return path == CLASS_FILE or path.endswith("/conclusion.json")
+
+
+def _decode(content: bytes):
+    try:
+        return json.loads(content)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def refresh_repo(git: GithubController,
+                 store: MirrorStore,
+                 repo_name: str,
+                 branch: str = "main"
+                 ) -> MirroredRepoData:
+    """
+    Atualiza o espelho de um repositório. Se o commit da branch é o mesmo já
+    espelhado, custa só a leitura da branch.
+    :raises GithubError: requirements.json fora do formato de uma classe (422)
+    """
+    owner = git.get_user().login
+    head = git.head_commit(repo_name, branch)
+
+    if store.head(owner, repo_name, branch) == head:
+        return next(repo for repo in store.repos(owner, [repo_name])
+                    if repo.branch == branch)
+
+    # A árvore é lida pelo commit, não pela branch, que pode ter andado nesse
+    # meio tempo
+    tree = git.list_files(repo_name, "", head)
+    entries = [
+        (element.path, element.type, element.sha,
+         element.size if element.type == "blob" else None)
+        for element in tree
+    ]
+
+    wanted = {element.path: element.sha for element in tree
+              if element.type == "blob" and _is_class_file(element.path)}
+    contents = store.blobs(wanted.values())
+    missing = [sha for sha in wanted.values() if sha not in contents]
+    fetched = git.read_blobs(repo_name, missing)
+    contents.update(fetched)
+
+    requirements = []
+    if CLASS_FILE in wanted:
+        # Mesma validação da leitura pelo GitHub: uma classe inválida não é
+        # espelhada
+        data = parse_class(contents[wanted[CLASS_FILE]])
+        conclusions = {path: _decode(contents[sha])
+                       for path, sha in wanted.items() if path != CLASS_FILE}
+        requirements = class_requirements(repo_name, data, conclusions, head)
+
+    synced_at = store.save(owner, repo_name, branch, head, entries, fetched,
+                           requirements)
+    return MirroredRepoData(repo_name, branch, head, synced_at, len(requirements),
+                            True, len(fetched))
+
+
+def _owned_repos(git: GithubController) -> List[str]:
+    # Só os repositórios do próprio usuário: o espelho lê cada um pelo nome, no
+    # dono do token (os de colaborador e de organizações sempre falhariam)
+    return [repo.name for repo in git.get_repos(per_page=100, affiliation="owner")]
+
+
+def refresh_repos(git: GithubController,
+                  store: MirrorStore,
+                  names: Optional[List[str]] = None,
+                  branch: str = "main",
+                  max_workers: int = MIRROR_REFRESH_CONCURRENCY
+                  ) -> List[MirroredRepoData]:
+    """
+    Atualiza vários repositórios em paralelo. Sem 'names', espelha todos os
+    repositórios de que o usuário é dono e remove do espelho os que deixaram
+    de existir. A falha de um repositório não interrompe os demais.
+    :return: Resultado de cada repositório, na ordem dos nomes
+    """
+    owner = git.get_user().login
+    full = names is None
+    names = _owned_repos(git) if full else list(dict.fromkeys(names))
+
+    results: Dict[str, MirroredRepoData] = {}
+    if names:
+        workers = max(1, min(max_workers, len(names)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(refresh_repo, git, store, name, branch): name
+                       for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except GithubError as e:
+                    results[name] = MirroredRepoData.from_error(name, branch, e.message)
+                except GithubException as e:
+                    if e.status == 401:
+                        raise
+                    data = e.data if isinstance(e.data, dict) else {}
+                    message = data.get("message") or str(e)
+                    results[name] = MirroredRepoData.from_error(name, branch, message)
+
+    if full:
+        for mirrored in store.repos(owner):
+            if mirrored.name not in results:
+                store.forget(owner, mirrored.name)
+
+    return [results[name] for name in names]
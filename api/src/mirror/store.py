@@ -0,0 +1,266 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models import RequirementData, MirroredRepoData
+
+# Uma entrada da árvore espelhada: (caminho, tipo, sha, tamanho)
+TreeEntry = Tuple[str, str, str, Optional[int]]
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS repos (
+        owner TEXT NOT NULL,
+        name TEXT NOT NULL,
+        branch TEXT NOT NULL,
+        head_sha TEXT NOT NULL,
+        synced_at REAL NOT NULL,
+        PRIMARY KEY (owner, name, branch)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS repos_head ON repos (head_sha)",
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        owner TEXT NOT NULL,
+        repo TEXT NOT NULL,
+        branch TEXT NOT NULL,
+        path TEXT NOT NULL,
+        type TEXT NOT NULL,
+        sha TEXT NOT NULL,
+        size INTEGER,
+        PRIMARY KEY (owner, repo, branch, path)
+    )
+    """,
+    # Conteúdo dos arquivos da classe pelo SHA do blob: o mesmo conteúdo, em
+    # qualquer repositório ou commit, é buscado no GitHub uma única vez
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        sha TEXT PRIMARY KEY,
+        content BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS requirements (
+        owner TEXT NOT NULL,
+        repo TEXT NOT NULL,
+        branch TEXT NOT NULL,
+        requirement_id TEXT NOT NULL,
+        group_id TEXT NOT NULL,
+        group_name TEXT,
+        description TEXT,
+        path TEXT NOT NULL,
+        conclusion TEXT,
+        concluded INTEGER NOT NULL,
+        commit_sha TEXT NOT NULL,
+        PRIMARY KEY (owner, repo, branch, group_id, requirement_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS requirements_group "
+    "ON requirements (owner, group_id, concluded)",
+    "CREATE INDEX IF NOT EXISTS requirements_id "
+    "ON requirements (owner, requirement_id)",
+    "CREATE INDEX IF NOT EXISTS requirements_commit ON requirements (commit_sha)",
+]
+
+
+class MirrorStore:
+    """
+    Espelho local dos repositórios de classe: árvore, requirements.json e
+    conclusion.json de cada repositório, no commit indicado em 'repos'.
+
+    Fica em SQLite (WAL) para ser compartilhado entre processos; cada
+    atualização de um repositório é gravada numa única transação.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            self._migrate(db)
+            for statement in SCHEMA:
+                db.execute(statement)
+
+    def _migrate(self, db: sqlite3.Connection) -> None:
+        """
+        Espelhos antigos identificavam o requisito só pelo id, mas o mesmo id
+        pode aparecer em grupos diferentes. A tabela é recriada com o grupo na
+        chave e os repositórios voltam a ser lidos na próxima atualização (os
+        blobs continuam no espelho).
+        """
+        columns = db.execute("PRAGMA table_info(requirements)")
+        keys = {row["name"] for row in columns if row["pk"]}
+        if keys and "group_id" not in keys:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DROP TABLE requirements")
+            db.execute("DELETE FROM repos")
+            db.execute("COMMIT")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def head(self, owner: str, repo: str, branch: str) -> Optional[str]:
+        with closing(self._connect()) as db:
+            row = db.execute(
+                "SELECT head_sha FROM repos "
+                "WHERE owner = ? AND name = ? AND branch = ?",
+                (owner, repo, branch)
+            ).fetchone()
+        return row["head_sha"] if row else None
+
+    def blobs(self, shas: Iterable[str]) -> Dict[str, bytes]:
+        """Conteúdos já espelhados, entre os SHAs informados."""
+        shas = list(dict.fromkeys(shas))
+        found: Dict[str, bytes] = {}
+        with closing(self._connect()) as db:
+            # Em lotes, abaixo do limite de parâmetros do SQLite
+            for start in range(0, len(shas), 500):
+                batch = shas[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                rows = db.execute(
+                    f"SELECT sha, content FROM blobs WHERE sha IN ({placeholders})",
+                    batch
+                ).fetchall()
+                found.update((row["sha"], bytes(row["content"])) for row in rows)
+        return found
+
+    def save(self,
+             owner: str,
+             repo: str,
+             branch: str,
+             head_sha: str,
+             tree: List[TreeEntry],
+             blobs: Dict[str, bytes],
+             requirements: List[RequirementData]
+             ) -> float:
+        """
+        Substitui o espelho do repositório pelo estado do commit 'head_sha'.
+        :param blobs: Conteúdos novos, guardados pelo SHA
+        :return: Momento da gravação
+        """
+        now = time.time()
+        with closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany("INSERT OR IGNORE INTO blobs VALUES (?, ?)",
+                               blobs.items())
+                db.execute(
+                    "DELETE FROM files WHERE owner = ? AND repo = ? AND branch = ?",
+                    (owner, repo, branch)
+                )
+                db.executemany(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(owner, repo, branch, *entry) for entry in tree]
+                )
+                db.execute(
+                    "DELETE FROM requirements "
+                    "WHERE owner = ? AND repo = ? AND branch = ?",
+                    (owner, repo, branch)
+                )
+                db.executemany(
+                    "INSERT INTO requirements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (owner, repo, branch, r.requirement_id, r.group_id,
+                         r.group_name, r.description, r.path,
+                         json.dumps(r.conclusion), int(r.concluded), head_sha)
+                        for r in requirements
+                    ]
+                )
+                db.execute(
+                    "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?)",
+                    (owner, repo, branch, head_sha, now)
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return now
+
+    def forget(self, owner: str, repo: str) -> None:
+        """Remove o repositório do espelho (todas as branches)."""
+        with closing(self._connect()) as db:
+            db.execute("BEGIN IMMEDIATE")
+            tables = (("repos", "name"), ("files", "repo"), ("requirements", "repo"))
+            for table, column in tables:
+                db.execute(f"DELETE FROM {table} WHERE owner = ? AND {column} = ?",
+                           (owner, repo))
+            db.execute("COMMIT")
+
+    def repos(self, owner: str,
+              names: Optional[List[str]] = None) -> List[MirroredRepoData]:
+        query = (
+            "SELECT r.name, r.branch, r.head_sha, r.synced_at, "
+            "(SELECT COUNT(*) FROM requirements q "
+            " WHERE q.owner = r.owner AND q.repo = r.name AND q.branch = r.branch)"
+            " AS requirements "
+            "FROM repos r WHERE r.owner = ?"
+        )
+        params: List = [owner]
+        if names is not None:
+            query += f" AND r.name IN ({', '.join('?' * len(names))})"
+            params.extend(names)
+        with closing(self._connect()) as db:
+            rows = db.execute(query + " ORDER BY r.name, r.branch", params).fetchall()
+        return [
+            MirroredRepoData(row["name"], row["branch"], row["head_sha"],
+                             row["synced_at"], row["requirements"])
+            for row in rows
+        ]
+
+    def files(self, owner: str, repo: str, branch: str,
+              prefix: str = "") -> List[sqlite3.Row]:
+        query = ("SELECT path, type, sha, size FROM files "
+                 "WHERE owner = ? AND repo = ? AND branch = ?")
+        params: List = [owner, repo, branch]
+        if prefix:
+            # Intervalo de texto em vez de LIKE: usa a chave primária e não
+            # interpreta '%' e '_'
+            query += " AND path >= ? AND path < ?"
+            params.extend([prefix + "/", prefix + "0"])
+        with closing(self._connect()) as db:
+            return db.execute(query + " ORDER BY path", params).fetchall()
+
+    def requirements(self,
+                     owner: str,
+                     branch: str = "main",
+                     repo: Optional[str] = None,
+                     group_id: Optional[str] = None,
+                     requirement_id: Optional[str] = None,
+                     concluded: Optional[bool] = None
+                     ) -> List[RequirementData]:
+        query = "SELECT * FROM requirements WHERE owner = ? AND branch = ?"
+        params: List = [owner, branch]
+        filters = (("repo", repo), ("group_id", group_id),
+                   ("requirement_id", requirement_id))
+        for column, value in filters:
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        if concluded is not None:
+            query += " AND concluded = ?"
+            params.append(int(concluded))
+
+        with closing(self._connect()) as db:
+            rows = db.execute(query + " ORDER BY repo, group_id, requirement_id",
+                              params).fetchall()
+        return [self._to_requirement(row) for row in rows]
+
+    def _to_requirement(self, row: sqlite3.Row) -> RequirementData:
+        return RequirementData(
+            row["repo"],
+            row["requirement_id"],
+            row["group_id"],
+            row["group_name"],
+            row["description"],
+            row["path"],
+            json.loads(row["conclusion"]),
+            bool(row["concluded"]),
+            row["commit_sha"]
+        )
@@ -1,2 +1,9 @@
 from .repository import RepositoryData
-from .file import ContentFileData
\ No newline at end of file
+from .file import ContentFileData
+from .commit import CommitData
+from .sync import SyncData
+from .provision import ProvisionData
+from .requirement import (RequirementData, GroupData, ClassData, class_requirements,
+                          is_concluded)
+from .mirror import MirroredRepoData
+from .progress import GroupProgressData, ClassProgressData, DashboardData
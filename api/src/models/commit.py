@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from github.GitCommit import GitCommit
+
+
+@dataclass(frozen=True)
+class CommitData:
+    sha: str
+    html_url: str
+    message: str
+    files: List[str]
+    failures: Dict[str, str] = field(default_factory=dict)
+
+    def from_git_commit(commit: GitCommit,
+                        files: List[str],
+                        failures: Optional[Dict[str, str]] = None):
+        failures = failures or {}
+        return CommitData(
+            commit.sha,
+            commit.html_url,
+            commit.message,
+            [path for path in files if path not in failures],
+            dict(failures)
+        )
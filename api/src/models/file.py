@@ -1,6 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Iterable, Optional
+from urllib.parse import quote
 
 from github.ContentFile import ContentFile
+from github.GitTreeElement import GitTreeElement
+from github.Repository import Repository
 
 @dataclass(frozen=True)
 class ContentFileData:
@@ -14,11 +18,17 @@ class ContentFileData:
     language: str
     type: str
 
-    def from_content_file(file: ContentFile):
-        try:
-            content = file.decoded_content.decode('utf-8')
-        except:
-            content = ""
+    def from_content_file(file: ContentFile,
+                          repository_name: Optional[str] = None,
+                          include_content: bool = True):
+        # Só lê atributos já carregados: 'decoded_content' e 'language' em
+        # objetos incompletos (ex.: itens de uma pasta) disparariam outra requisição
+        content = ""
+        if include_content:
+            try:
+                content = file.decoded_content.decode('utf-8')
+            except Exception:
+                content = ""
 
         return ContentFileData(
             file.path,
@@ -27,17 +37,46 @@ class ContentFileData:
             file.sha,
             file.download_url,
             content,
-            file.repository.name,
-            file.language,
+            repository_name or file.repository.name,
+            file.language if file.completed else None,
             file.type
         )
-    
-
-
 
+    def from_tree_element(element: GitTreeElement,
+                          repo: Repository,
+                          branch: str = "main",
+                          raw_content: Optional[bytes] = None):
+        is_file = element.type == "blob"
+        kind = "blob" if is_file else "tree"
 
+        try:
+            content = raw_content.decode('utf-8') if raw_content is not None else ""
+        except UnicodeDecodeError:
+            content = ""
 
+        raw_url = None
+        if is_file:
+            raw_url = ("https://raw.githubusercontent.com/"
+                       f"{repo.full_name}/{quote(branch)}/{quote(element.path)}")
 
+        return ContentFileData(
+            element.path,
+            element.path.rsplit("/", 1)[-1],
+            f"{repo.html_url}/{kind}/{branch}/{element.path}",
+            element.sha,
+            raw_url,
+            content,
+            repo.name,
+            None,
+            "file" if is_file else "dir"
+        )
 
+    def to_dict(self, selected: Optional[Iterable[str]] = None) -> Dict:
+        data = asdict(self)
+        if selected is None:
+            return data
+        return {name: data[name] for name in selected}
 
 
+CONTENT_FILE_FIELDS = tuple(field.name for field in fields(ContentFileData))
+METADATA_FIELDS = tuple(name for name in CONTENT_FILE_FIELDS if name != "content")
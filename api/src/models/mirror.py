@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class MirroredRepoData:
+    name: str
+    branch: str
+    head_sha: Optional[str]
+    synced_at: Optional[float]
+    requirements: int
+    refreshed: bool = False
+    blobs_fetched: int = 0
+    error: Optional[str] = None
+
+    def from_error(name: str, branch: str, message: str):
+        return MirroredRepoData(name, branch, None, None, 0, error=message)
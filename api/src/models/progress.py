@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .requirement import ClassData
+
+
+@dataclass(frozen=True)
+class GroupProgressData:
+    group_id: str
+    group_name: Optional[str]
+    total: int
+    concluded: int
+
+
+@dataclass(frozen=True)
+class ClassProgressData:
+    repository_name: str
+    name: Optional[str]
+    commit: Optional[str]
+    total: int
+    concluded: int
+    groups: List[GroupProgressData]
+
+    def from_class(data: ClassData):
+        return ClassProgressData(
+            data.repository_name,
+            data.name,
+            data.commit,
+            data.total,
+            data.concluded,
+            [
+                GroupProgressData(group.group_id, group.group_name, group.total,
+                                  group.concluded)
+                for group in data.groups
+            ]
+        )
+
+    def from_dict(data: Dict):
+        groups = [GroupProgressData(**group) for group in data["groups"]]
+        return ClassProgressData(**{**data, "groups": groups})
+
+
+@dataclass(frozen=True)
+class DashboardData:
+    branch: str
+    total: int
+    concluded: int
+    classes: List[ClassProgressData]
+    errors: Dict[str, str] = field(default_factory=dict)
+    fetched: int = 0
+    cached: int = 0
+
+    def from_classes(branch: str,
+                     classes: List[ClassProgressData],
+                     errors: Dict[str, str],
+                     fetched: int,
+                     cached: int):
+        return DashboardData(
+            branch,
+            sum(item.total for item in classes),
+            sum(item.concluded for item in classes),
+            classes,
+            dict(errors),
+            fetched,
+            cached
+        )
+
+    def from_dict(data: Dict):
+        classes = [ClassProgressData.from_dict(item) for item in data["classes"]]
+        return DashboardData(**{**data, "classes": classes})
@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from github.GitCommit import GitCommit
+from github.Repository import Repository
+
+
+@dataclass(frozen=True)
+class ProvisionData:
+    name: str
+    created: bool
+    html_url: Optional[str] = None
+    commit: Optional[str] = None
+    files: List[str] = field(default_factory=list)
+    failures: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def from_repository(repo: Repository,
+                        commit: Optional[GitCommit],
+                        files: List[str],
+                        failures: Optional[Dict[str, str]] = None):
+        failures = failures or {}
+        return ProvisionData(
+            repo.name,
+            True,
+            repo.html_url,
+            commit.sha if commit is not None else None,
+            [path for path in files if path not in failures],
+            dict(failures)
+        )
+
+    def from_error(name: str, message: str):
+        return ProvisionData(name, False, error=message)
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..validation import requirement_path
+
+
+def is_concluded(conclusion: Any) -> bool:
+    # O upload grava {"date": null}; o requisito é concluído quando a data é preenchida
+    return isinstance(conclusion, dict) and bool(conclusion.get("date"))
+
+
+@dataclass(frozen=True)
+class RequirementData:
+    repository_name: str
+    requirement_id: str
+    group_id: str
+    group_name: Optional[str]
+    description: Optional[str]
+    path: str
+    conclusion: Optional[Dict]
+    concluded: bool
+    commit: Optional[str] = None
+
+    def from_requirement(repo_name: str,
+                         requirement: Dict,
+                         group_name: Optional[str],
+                         conclusion: Optional[Dict],
+                         commit: Optional[str] = None):
+        return RequirementData(
+            repo_name,
+            str(requirement.get("requirementId")),
+            str(requirement.get("groupId")),
+            group_name,
+            requirement.get("requirementDescription"),
+            requirement_path(requirement.get("groupId"), group_name,
+                             requirement.get("requirementId"),
+                             requirement.get("requirementDescription")),
+            conclusion,
+            is_concluded(conclusion),
+            commit
+        )
+
+
+def class_requirements(repo_name: str,
+                       data: Dict,
+                       conclusions: Dict[str, Any],
+                       commit: Optional[str] = None) -> List[RequirementData]:
+    """
+    Junta os requisitos do requirements.json com o conclusion.json de cada um.
+    :param conclusions: Conteúdo já decodificado de cada conclusion.json, pelo
+                        caminho
+    """
+    groups = {group.get("groupId"): group.get("groupName")
+              for group in data.get("groups", [])}
+    requirements = []
+    for requirement in data.get("requirements", []):
+        group_name = groups.get(requirement.get("groupId"), "Grupo não encontrado")
+        path = requirement_path(requirement.get("groupId"), group_name,
+                                requirement.get("requirementId"),
+                                requirement.get("requirementDescription"))
+        requirements.append(RequirementData.from_requirement(
+            repo_name, requirement, group_name, conclusions.get(path), commit
+        ))
+    return requirements
+
+
+@dataclass(frozen=True)
+class GroupData:
+    group_id: str
+    group_name: Optional[str]
+    total: int
+    concluded: int
+    requirements: List[RequirementData]
+
+
+@dataclass(frozen=True)
+class ClassData:
+    repository_name: str
+    commit: Optional[str]
+    name: Optional[str]
+    description: Optional[str]
+    total: int
+    concluded: int
+    groups: List[GroupData]
+
+    def from_requirements(repo_name: str,
+                          commit: Optional[str],
+                          data: Dict,
+                          requirements: List[RequirementData]):
+        # Grupos na ordem do requirements.json; requisitos de grupos
+        # inexistentes ficam ao final
+        groups = data.get("groups", [])
+        grouped: Dict[str, List[RequirementData]] = {
+            str(group.get("groupId")): [] for group in groups
+        }
+        names = {str(group.get("groupId")): group.get("groupName") for group in groups}
+        for requirement in requirements:
+            grouped.setdefault(requirement.group_id, []).append(requirement)
+            names.setdefault(requirement.group_id, requirement.group_name)
+
+        info = data.get("info") or {}
+        return ClassData(
+            repo_name,
+            commit,
+            info.get("name"),
+            info.get("description"),
+            len(requirements),
+            sum(requirement.concluded for requirement in requirements),
+            [
+                GroupData(group_id, names[group_id], len(items),
+                          sum(item.concluded for item in items), items)
+                for group_id, items in grouped.items()
+            ]
+        )
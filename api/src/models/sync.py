@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from github.GitCommit import GitCommit
+
+
+@dataclass(frozen=True)
+class SyncData:
+    sha: Optional[str]
+    html_url: Optional[str]
+    added: List[str]
+    changed: List[str]
+    deleted: List[str]
+    unchanged: int
+    failures: Dict[str, str] = field(default_factory=dict)
+
+    def from_sync(commit: Optional[GitCommit],
+                  changes: Dict[str, List[str]],
+                  failures: Optional[Dict[str, str]] = None):
+        return SyncData(
+            commit.sha if commit is not None else None,
+            commit.html_url if commit is not None else None,
+            list(changes["added"]),
+            list(changes["changed"]),
+            list(changes["deleted"]),
+            len(changes["unchanged"]),
+            dict(failures or {})
+        )
@@ -0,0 +1,118 @@
+"""
+Versões assíncronas das leituras de `repos_bp`, usadas pelo ponto de entrada
+ASGI. Mesmas URLs, parâmetros e respostas das rotas síncronas (o endpoint é o
+mesmo, resolvido pelo url_map do Flask); só a espera pelo GitHub muda.
+"""
+
+from bisect import bisect_right
+from typing import Awaitable, Callable, Dict, Tuple
+
+from flask import g, jsonify, request
+
+from ..models import RepositoryData, ContentFileData
+from ..models.file import CONTENT_FILE_FIELDS, METADATA_FIELDS
+from ..controllers.async_controller import AsyncGithubController
+from ..errors import BadRequestError
+from .token_required import token_required
+from .pagination import (
+    encode_cursor, decode_cursor, cursor_int, cursor_str, int_arg, bool_arg,
+    add_next_page
+)
+from .repository import MAX_PAGE_SIZE, _fields_arg, _stream_format
+
+
+@token_required
+async def list_repos():
+    position = decode_cursor(request.args.get("cursor"))
+    per_page = (cursor_int(position, "per_page", maximum=100)
+                or int_arg("per_page", maximum=100))
+    page = cursor_int(position, "page") or int_arg("page")
+
+    git = AsyncGithubController(g.token)
+    if page is None and per_page is None:
+        repos = await git.get_repos()
+        return jsonify([RepositoryData.from_repository(repo) for repo in repos]), 200
+
+    per_page = per_page or 30
+    page = page or 1
+    repos = await git.get_repos(per_page, page)
+
+    # Uma página cheia indica que pode haver uma próxima
+    next_cursor = None
+    if len(repos) == per_page:
+        next_cursor = encode_cursor({"page": page + 1, "per_page": per_page})
+
+    response = jsonify([RepositoryData.from_repository(repo) for repo in repos])
+    return add_next_page(response, next_cursor), 200
+
+
+@token_required
+async def get_repo(repo_name: str):
+    repo = await AsyncGithubController(g.token).get_repo_by_name(repo_name)
+    return jsonify(RepositoryData.from_repository(repo)), 200
+
+
+@token_required
+async def list_files(repo_name: str):
+    path = request.args.get('path', '')
+    branch = request.args.get('branch', 'main')
+    depth = int_arg('depth')
+    limit = int_arg('limit', maximum=MAX_PAGE_SIZE)
+    after = cursor_str(decode_cursor(request.args.get('cursor')), 'after')
+    include_content = bool_arg('include_content')
+    fields = _fields_arg(METADATA_FIELDS, include_content)
+
+    git = AsyncGithubController(g.token)
+    # Repositório antes da árvore: mesma ordem de erros da rota síncrona
+    # (repositório, branch e caminho)
+    repo = await git.get_repo_by_name(repo_name)
+    files = await git.list_files(repo_name, path, branch, depth)
+
+    if after is not None:
+        files = files[bisect_right(files, after, key=lambda file: file.path):]
+
+    next_cursor = None
+    if limit is not None and len(files) > limit:
+        files = files[:limit]
+        next_cursor = encode_cursor({"after": files[-1].path})
+
+    contents = {}
+    if 'content' in fields:
+        shas = [file.sha for file in files if file.type == "blob"]
+        contents = await git.read_blobs(repo_name, shas)
+
+    response = jsonify([
+        ContentFileData.from_tree_element(file, repo, branch,
+                                          contents.get(file.sha)).to_dict(fields)
+        for file in files
+    ])
+    return add_next_page(response, next_cursor), 200
+
+
+@token_required
+async def get_file(repo_name: str, path: str):
+    branch = request.args.get('branch', 'main')
+    include_content = bool_arg('include_content', True)
+    fields = _fields_arg(CONTENT_FILE_FIELDS if include_content else METADATA_FIELDS,
+                         False)
+
+    file = await AsyncGithubController(g.token).get_file(repo_name, path, branch)
+    data = ContentFileData.from_content_file(file, repo_name, 'content' in fields)
+    return jsonify(data.to_dict(fields)), 200
+
+
+def _not_streamed() -> bool:
+    # As listagens em streaming (e os parâmetros inválidos) ficam com a rota síncrona
+    try:
+        return _stream_format() is None
+    except BadRequestError:
+        return False
+
+
+# Endpoint do Flask -> (view assíncrona, condição para usá-la no lugar da síncrona)
+ASYNC_VIEWS: Dict[str, Tuple[Callable[..., Awaitable], Callable[[], bool]]] = {
+    "repositories.list_repos": (list_repos, _not_streamed),
+    "repositories.get_repo": (get_repo, lambda: True),
+    "repositories.list_files": (list_files, lambda: True),
+    "repositories.get_file": (get_file, lambda: True),
+}
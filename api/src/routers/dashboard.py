@@ -0,0 +1,28 @@
+from flask import Blueprint, jsonify, request, g
+from github.GithubException import GithubException
+
+from ..controllers import GithubController, client_pool
+from ..services import classes_progress
+from .errors import handle_github_exception
+from .token_required import token_required
+
+# Progresso de todas as classes do usuário. Só as classes cujo commit mudou
+# desde a última consulta são lidas de novo do GitHub.
+dashboard_bp = Blueprint("dashboard", __name__)
+
+
+dashboard_bp.register_error_handler(GithubException, handle_github_exception)
+
+
+@dashboard_bp.route("/", methods=["GET"])
+@token_required
+def get_dashboard():
+    """
+    Conclusão de cada classe e de cada grupo na branch informada. Repositórios
+    que não são classes ficam de fora; falhas de leitura vêm em 'errors'.
+    """
+    branch = request.args.get('branch', 'main')
+
+    with GithubController(g.token, True, client_pool) as git:
+        dashboard = classes_progress(git, branch)
+    return jsonify(dashboard), 200
@@ -0,0 +1,35 @@
+from flask import jsonify
+from github.GithubException import GithubException
+
+from ..errors import GithubError, RateLimitedError
+
+
+def handle_github_error(e: GithubError):
+    """
+    Resposta de erro para os GithubError levantados pela API, registrada uma
+    única vez na aplicação (app.py) e válida para todos os blueprints.
+    """
+    response = jsonify(e.send_error())
+    if isinstance(e, RateLimitedError):
+        response.headers["Retry-After"] = str(e.retry_after)
+    return response, e.status_code
+
+
+def handle_github_exception(e: GithubException):
+    """
+    Resposta de erro para exceções do PyGithub que chegam às rotas, com o
+    status devolvido pelo GitHub. Registrada em cada blueprint que fala com
+    o GitHub pelo `GithubController`.
+    """
+    args = e.args[1]
+    response = jsonify(
+        {
+            'message': args.get('message'),
+            'status_code': args.get('status')
+        }
+    )
+    # Repassa o tempo de espera pedido pelo GitHub nos limites secundários
+    retry_after = (e.headers or {}).get('retry-after')
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response, e.args[0]
@@ -0,0 +1,44 @@
+from flask import Blueprint, Response
+
+from ..controllers import client_pool, rate_limiter
+from ..controllers.transport import etag_cache
+from ..metrics import CONTENT_TYPE, registry, GaugeCallback, CounterCallback
+
+# Blueprint com as métricas da aplicação no formato do Prometheus
+metrics_bp = Blueprint("metrics", __name__)
+
+registry.register(CounterCallback(
+    "github_etag_cache_hits_total",
+    "Leituras do GitHub revalidadas pelo cache de ETags (respostas 304).",
+    lambda: etag_cache.hits
+))
+registry.register(CounterCallback(
+    "github_etag_cache_misses_total",
+    "Leituras do GitHub que não estavam no cache de ETags ou mudaram.",
+    lambda: etag_cache.misses
+))
+registry.register(GaugeCallback(
+    "github_etag_cache_entries",
+    "Respostas guardadas no cache de ETags.",
+    lambda: len(etag_cache)
+))
+registry.register(GaugeCallback(
+    "github_etag_cache_bytes",
+    "Soma dos corpos guardados no cache de ETags, em bytes.",
+    lambda: etag_cache.size
+))
+registry.register(GaugeCallback(
+    "github_client_pool_size",
+    "Clientes do GitHub autenticados no pool.",
+    lambda: len(client_pool)
+))
+registry.register(GaugeCallback(
+    "github_rate_limit_queue_depth",
+    "Requisições esperando na fila do limite de requisições, somando todos os tokens.",
+    lambda: sum(entry["queue_depth"] for entry in rate_limiter.snapshot())
+))
+
+
+@metrics_bp.route("", methods=["GET"])
+def get_metrics():
+    return Response(registry.render(), content_type=CONTENT_TYPE)
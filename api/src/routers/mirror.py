@@ -0,0 +1,108 @@
+from flask import Blueprint, jsonify, request, g
+from github.GithubException import GithubException
+
+from ..controllers import GithubController, client_pool
+from ..errors import BadRequestError, NotFoundError
+from ..mirror import mirror_store, refresh_repos
+from .errors import handle_github_exception
+from .token_required import token_required
+from .pagination import bool_arg, json_body
+
+# Consultas ao espelho local dos repositórios de classe (MIRROR_DB_PATH).
+# As leituras não vão ao GitHub; só as atualizações comparam o commit da branch.
+mirror_bp = Blueprint("mirror", __name__)
+
+
+mirror_bp.register_error_handler(GithubException, handle_github_exception)
+
+
+def _names(value) -> list:
+    if isinstance(value, str):
+        value = [value]
+    valid = isinstance(value, list) and all(isinstance(name, str) and name
+                                            for name in value)
+    if not value or not valid:
+        raise BadRequestError("Campo 'repositories' deve ser um nome ou uma lista "
+                              "de nomes")
+    return value
+
+
+@mirror_bp.route("/refresh", methods=["POST"])
+@token_required
+def refresh():
+    """
+    Atualiza o espelho dos repositórios informados ou, sem 'repositories',
+    de todos os repositórios do usuário. Só os que mudaram são lidos de novo.
+    """
+    data = json_body()
+    names = None
+    if data.get("repositories") is not None:
+        names = _names(data["repositories"])
+    branch = data.get("branch") or "main"
+
+    with GithubController(g.token, True, client_pool) as git:
+        results = refresh_repos(git, mirror_store(), names, branch)
+
+    status = 207 if any(result.error for result in results) else 200
+    return jsonify(results), status
+
+
+@mirror_bp.route("/repositories", methods=["GET"])
+@token_required
+def list_repos():
+    with GithubController(g.token, True, client_pool) as git:
+        owner = git.get_user().login
+    return jsonify(mirror_store().repos(owner)), 200
+
+
+@mirror_bp.route("/repositories/<string:repo_name>/files", methods=["GET"])
+@token_required
+def list_files(repo_name: str):
+    path = request.args.get('path', '').strip('/')
+    branch = request.args.get('branch', 'main')
+
+    with GithubController(g.token, True, client_pool) as git:
+        owner = git.get_user().login
+        if bool_arg('refresh'):
+            refresh_repos(git, mirror_store(), [repo_name], branch)
+
+    store = mirror_store()
+    if store.head(owner, repo_name, branch) is None:
+        raise NotFoundError(resource_type="Mirrored repository",
+                            resource_identifier=repo_name)
+
+    files = store.files(owner, repo_name, branch, path)
+    if path and not files:
+        raise NotFoundError(resource_type="Path", resource_identifier=path)
+    return jsonify([dict(file) for file in files]), 200
+
+
+@mirror_bp.route("/requirements", methods=["GET"])
+@token_required
+def list_requirements():
+    """
+    Requisitos espelhados de todas as classes do usuário, filtrados por
+    'repository', 'group_id', 'requirement_id' e 'concluded'. Com
+    'refresh=true' os repositórios consultados são atualizados antes.
+    """
+    repo_name = request.args.get('repository')
+    branch = request.args.get('branch', 'main')
+    concluded = bool_arg('concluded') if request.args.get('concluded') else None
+
+    with GithubController(g.token, True, client_pool) as git:
+        owner = git.get_user().login
+        if bool_arg('refresh'):
+            names = [repo_name]
+            if not repo_name:
+                names = [repo.name for repo in mirror_store().repos(owner)]
+            refresh_repos(git, mirror_store(), names, branch)
+
+    requirements = mirror_store().requirements(
+        owner,
+        branch,
+        repo=repo_name,
+        group_id=request.args.get('group_id'),
+        requirement_id=request.args.get('requirement_id'),
+        concluded=concluded
+    )
+    return jsonify(requirements), 200
@@ -0,0 +1,95 @@
+import base64
+import json
+from typing import Dict, Optional
+
+from flask import Response, request, url_for
+
+from ..errors import BadRequestError
+
+
+def encode_cursor(position: Dict) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Dict:
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise BadRequestError("Parâmetro 'cursor' inválido")
+    if not isinstance(position, dict):
+        raise BadRequestError("Parâmetro 'cursor' inválido")
+    return position
+
+
+def int_arg(name: str, default: Optional[int] = None, minimum: int = 1,
+            maximum: Optional[int] = None) -> Optional[int]:
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequestError(f"Parâmetro '{name}' deve ser um número inteiro")
+    return _in_range(name, number, minimum, maximum)
+
+
+def _in_range(name: str, number: int, minimum: int, maximum: Optional[int]) -> int:
+    if number < minimum or (maximum is not None and number > maximum):
+        raise BadRequestError(f"Parâmetro '{name}' fora do intervalo permitido")
+    return number
+
+
+def cursor_int(position: Dict, key: str, minimum: int = 1,
+               maximum: Optional[int] = None) -> Optional[int]:
+    """
+    Número guardado no cursor, com as mesmas verificações de `int_arg`: o
+    cursor vem do cliente e não pode furar os limites do parâmetro.
+    """
+    value = position.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise BadRequestError("Parâmetro 'cursor' inválido")
+    return _in_range("cursor", value, minimum, maximum)
+
+
+def cursor_str(position: Dict, key: str) -> Optional[str]:
+    """Texto guardado no cursor (ex.: o último caminho de uma página)."""
+    value = position.get(key)
+    if value is not None and not isinstance(value, str):
+        raise BadRequestError("Parâmetro 'cursor' inválido")
+    return value
+
+
+def bool_arg(name: str, default: bool = False) -> bool:
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "sim")
+
+
+def json_body() -> Dict:
+    """Corpo JSON da requisição; sem corpo, um objeto vazio."""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise BadRequestError("Corpo JSON deve ser um objeto")
+    return data
+
+
+def add_next_page(response: Response, next_cursor: Optional[str]) -> Response:
+    """
+    Informa a próxima página nos cabeçalhos 'X-Next-Cursor' e 'Link',
+    mantendo o corpo da resposta no mesmo formato de antes.
+    """
+    if next_cursor:
+        args = {**request.args.to_dict(), "cursor": next_cursor}
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
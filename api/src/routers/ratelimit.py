@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify, g
+
+from ..controllers import rate_limiter
+from ..controllers.rate_limit import key_for_token
+from .token_required import token_required
+
+# Blueprint com o saldo do limite de requisições do GitHub por token
+ratelimit_bp = Blueprint("ratelimit", __name__)
+
+
+@ratelimit_bp.route("/", methods=["GET"])
+@token_required
+def get_rate_limit():
+    """
+    Saldo e fila de requisições do token de quem chamou, identificado pelo
+    início do hash. Os demais tokens do processo não aparecem: o header só
+    prova que o chamador tem o próprio token. A lista vem vazia se o token
+    ainda não fez chamadas ao GitHub por este processo.
+    """
+    return jsonify({"tokens": rate_limiter.snapshot(key_for_token(g.token))}), 200
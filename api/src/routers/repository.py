@@ -1,45 +1,119 @@
-from flask import Blueprint, jsonify, request, g
+from flask import (
+    Blueprint, Response, current_app, jsonify, request, g, stream_with_context
+)
 from github.GithubException import GithubException
 import base64
+import binascii
+import mimetypes
+from bisect import bisect_right
+from itertools import chain
+from typing import Optional, Tuple
 
 from ..models import RepositoryData, ContentFileData
-from ..controllers import GithubController
-from ..errors import GithubError, BadRequestError
+from ..models.file import CONTENT_FILE_FIELDS, METADATA_FIELDS
+from ..controllers import GithubController, client_pool
+from ..controllers.blob_download import stream_blob
+from ..services import RepositoryService, read_class
+from ..errors import BadRequestError
+from .errors import handle_github_exception
 from .token_required import token_required
+from .pagination import (
+    encode_cursor, decode_cursor, cursor_int, cursor_str, int_arg, bool_arg,
+    json_body, add_next_page
+)
+
+MAX_PAGE_SIZE = 1000
 
 # Criar um Blueprint para rotas de repositórios
 repos_bp = Blueprint("repositories", __name__)
 
 
-@repos_bp.errorhandler(GithubError)
-def handle_github_exception(e):
-    return jsonify(e.send_error()), e.status_code
+repos_bp.register_error_handler(GithubException, handle_github_exception)
+
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+def _stream_format() -> Optional[str]:
+    stream = request.args.get("stream")
+    if stream:
+        if stream not in STREAM_FORMATS:
+            raise BadRequestError("Parâmetro 'stream' deve ser 'ndjson' ou 'json'")
+        return stream
+    if request.accept_mimetypes.best == STREAM_FORMATS["ndjson"]:
+        return "ndjson"
+    return None
+
 
-@repos_bp.errorhandler(GithubException)
-def handle_github_exception(e):
-    args = e.args[1]
-    return jsonify(
-        {
-            'message': args.get('message'),
-            'status_code': args.get('status')
-        }
-    ), e.args[0]
+def _stream_repos(stream: str, per_page: int) -> Response:
+    """
+    Envia cada repositório assim que a página correspondente chega do GitHub,
+    em NDJSON ou em um array JSON enviado em partes.
+    """
+    # Busca a primeira página antes de responder, para que erros do GitHub
+    # ainda possam ser devolvidos com o status correto
+    with GithubController(g.token, True, client_pool) as git:
+        repos = iter(git.get_repos(per_page))
+        first = next(repos, None)
+
+    def generate():
+        with git:
+            if stream == "json":
+                yield "["
+            for index, repo in enumerate(chain([first] if first else [], repos)):
+                data = current_app.json.dumps(RepositoryData.from_repository(repo))
+                if stream == "ndjson":
+                    yield data + "\n"
+                else:
+                    yield data if index == 0 else "," + data
+            if stream == "json":
+                yield "]"
+
+    return Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[stream])
 
 
 @repos_bp.route("/", methods=["GET"])
 @token_required
 def list_repos():
-    with GithubController(g.token, True) as git:
-        repos = git.get_repos()
-        return jsonify(
-            [RepositoryData.from_repository(repo) for repo in repos]
-        ), 200
+    position = decode_cursor(request.args.get("cursor"))
+    per_page = (cursor_int(position, "per_page", maximum=100)
+                or int_arg("per_page", maximum=100))
+    page = cursor_int(position, "page") or int_arg("page")
+
+    stream = _stream_format()
+    if stream:
+        # O streaming sempre percorre a lista inteira, desde a primeira página
+        if page is not None:
+            raise BadRequestError("Parâmetro 'page' não pode ser usado com streaming")
+        return _stream_repos(stream, per_page or 100), 200
+
+    with GithubController(g.token, True, client_pool) as git:
+        if page is None and per_page is None:
+            repos = git.get_repos()
+            return jsonify(
+                [RepositoryData.from_repository(repo) for repo in repos]
+            ), 200
+
+        per_page = per_page or 30
+        page = page or 1
+        repos = git.get_repos(per_page).get_page(page - 1)
+
+    # Uma página cheia indica que pode haver uma próxima
+    next_cursor = None
+    if len(repos) == per_page:
+        next_cursor = encode_cursor({"page": page + 1, "per_page": per_page})
+
+    response = jsonify([RepositoryData.from_repository(repo) for repo in repos])
+    return add_next_page(response, next_cursor), 200
 
 
 @repos_bp.route("/<string:repo_name>", methods=["GET"])
 @token_required
 def get_repo(repo_name: str):
-    with GithubController(g.token, True) as git:
+    with GithubController(g.token, True, client_pool) as git:
         repo = git.get_repo_by_name(repo_name)
         return jsonify(RepositoryData.from_repository(repo)), 200
 
@@ -59,16 +133,53 @@ def create_repo():
     gitignore_template = data.get("gitignore_template", "Python")
     license_template = data.get("license_template", "mit")
 
-    with GithubController(g.token, True) as git:
-        repo = git.create_repo(
-            name=name,
-            description=description,
-            private=private,
-            auto_init=auto_init,
-            gitignore_template=gitignore_template,
-            license_template=license_template
-        )
-        return jsonify(RepositoryData.from_repository(repo)), 201
+    repo = RepositoryService(g.token).create_repo(
+        name=name,
+        description=description,
+        private=private,
+        auto_init=auto_init,
+        gitignore_template=gitignore_template,
+        license_template=license_template
+    )
+    return jsonify(repo), 201
+
+
+@repos_bp.route("/provision", methods=["POST"])
+@token_required
+def provision_repos():
+    """
+    Cria vários repositórios a partir de um template, em paralelo, e envia os
+    arquivos de cada um em um único commit. Responde com o resultado por repositório.
+    """
+    data = json_body()
+    template = data.get("template")
+    items = data.get("repositories") or []
+
+    if not template:
+        raise BadRequestError("Campo 'template' é obrigatório")
+    if not isinstance(items, list) or not items:
+        raise BadRequestError("Campo 'repositories' deve ser uma lista não vazia")
+
+    repos = []
+    for item in items:
+        if not isinstance(item, dict) or not item.get("name"):
+            raise BadRequestError("Cada item de 'repositories' precisa do campo 'name'")
+        description = item.get("description", "Repository created via API")
+        repos.append((item["name"], description, _json_files(item.get("files") or [])))
+
+    if len({name for name, _, _ in repos}) != len(repos):
+        raise BadRequestError("Os nomes em 'repositories' devem ser únicos")
+
+    results = RepositoryService(g.token).provision_repos(
+        template=template,
+        repos=repos,
+        message=data.get("message", "Add files via script"),
+        private=data.get("private", False)
+    )
+
+    # 207 quando parte dos repositórios (ou de seus arquivos) falhou
+    failed = any(result.error or result.failures for result in results)
+    return jsonify({"repositories": results}), 207 if failed else 201
 
 
 @repos_bp.route('/<string:repo_name>', methods=['PATCH'])
@@ -80,7 +191,7 @@ def update_repo_description(repo_name: str):
     if not new_description:
         raise BadRequestError("Campo 'description' é obrigatório")
 
-    with GithubController(g.token, True) as git:
+    with GithubController(g.token, True, client_pool) as git:
         repo = git.update_repo_description(repo_name, new_description)
         return jsonify(RepositoryData.from_repository(repo)), 200
 
@@ -88,31 +199,144 @@ def update_repo_description(repo_name: str):
 @repos_bp.route('/<string:repo_name>', methods=['DELETE'])
 @token_required
 def delete_repo(repo_name: str):
-    with GithubController(g.token, True) as git:
+    with GithubController(g.token, True, client_pool) as git:
         result = git.delete_repo(repo_name)
         return jsonify(result), 200
     
 
+def _fields_arg(default: Tuple[str, ...], include_content: bool) -> Tuple[str, ...]:
+    """Campos pedidos em '?fields=a,b', validados contra os de ContentFileData."""
+    value = request.args.get('fields')
+    selected = default
+    if value:
+        selected = tuple(name.strip() for name in value.split(',') if name.strip())
+
+    unknown = [name for name in selected if name not in CONTENT_FILE_FIELDS]
+    if unknown:
+        raise BadRequestError(f"Campos desconhecidos em 'fields': {', '.join(unknown)}")
+
+    if include_content and 'content' not in selected:
+        selected += ('content',)
+    return selected
+
+
 @repos_bp.route('/<string:repo_name>/files', methods=['GET'])
 @token_required
 def list_files(repo_name: str):
     path = request.args.get('path', '')
     branch = request.args.get('branch', 'main')
+    depth = int_arg('depth')
+    limit = int_arg('limit', maximum=MAX_PAGE_SIZE)
+    after = cursor_str(decode_cursor(request.args.get('cursor')), 'after')
+    include_content = bool_arg('include_content')
+    fields = _fields_arg(METADATA_FIELDS, include_content)
 
-    with GithubController(g.token, True) as git:
-        files = git.list_files(repo_name, path, branch)
-        return jsonify(
-            [ContentFileData.from_content_file(file) for file in files]
-        ), 200
-
-
-@repos_bp.route('/<string:repo_name>/files/<string:path>', methods=['GET'])
+    with GithubController(g.token, True, client_pool) as git:
+        repo = git.get_repo_by_name(repo_name)
+        files = git.list_files(repo_name, path, branch, depth)
+
+        # A lista vem ordenada pelo caminho: o cursor guarda o último caminho enviado
+        if after is not None:
+            files = files[bisect_right(files, after, key=lambda file: file.path):]
+
+        next_cursor = None
+        if limit is not None and len(files) > limit:
+            files = files[:limit]
+            next_cursor = encode_cursor({"after": files[-1].path})
+
+        # Por padrão só há metadados; o conteúdo custa uma chamada por arquivo
+        contents = {}
+        if 'content' in fields:
+            contents = git.read_blobs(
+                repo_name, [file.sha for file in files if file.type == "blob"]
+            )
+
+    response = jsonify([
+        ContentFileData.from_tree_element(
+            file, repo, branch, contents.get(file.sha)
+        ).to_dict(fields)
+        for file in files
+    ])
+    return add_next_page(response, next_cursor), 200
+
+
+@repos_bp.route('/<string:repo_name>/files/<path:path>', methods=['GET'])
 @token_required
 def get_file(repo_name: str, path: str):
     branch = request.args.get('branch', 'main')
-    with GithubController(g.token, True) as git:
+    include_content = bool_arg('include_content', True)
+    fields = _fields_arg(
+        CONTENT_FILE_FIELDS if include_content else METADATA_FIELDS, False
+    )
+
+    with GithubController(g.token, True, client_pool) as git:
         file = git.get_file(repo_name, path, branch)
-        return jsonify(ContentFileData.from_content_file(file)), 200
+        if isinstance(file, list):
+            raise BadRequestError(f"'{path}' é uma pasta, não um arquivo")
+        data = ContentFileData.from_content_file(file, repo_name, 'content' in fields)
+        return jsonify(data.to_dict(fields)), 200
+
+
+@repos_bp.route('/<string:repo_name>/requirements', methods=['GET'])
+@token_required
+def get_requirements(repo_name: str):
+    """
+    A classe inteira numa resposta: grupos do requirements.json, cada um com
+    os seus requisitos e o conclusion.json de cada requisito.
+    """
+    branch = request.args.get('branch', 'main')
+
+    with GithubController(g.token, True, client_pool) as git:
+        return jsonify(read_class(git, repo_name, branch)), 200
+
+
+@repos_bp.route('/<string:repo_name>/raw/<path:path>', methods=['GET'])
+@token_required
+def download_file(repo_name: str, path: str):
+    """
+    Conteúdo bruto do arquivo, enviado em pedaços direto do blob. Aceita
+    Range (um intervalo) e If-None-Match, com o SHA do blob como ETag.
+    """
+    branch = request.args.get('branch', 'main')
+
+    # SHA e tamanho sem o conteúdo; os bytes vêm uma única vez, do blob
+    with GithubController(g.token, True, client_pool) as git:
+        sha, size = git.file_blob(repo_name, path, branch)
+        repo = git.get_repo_by_name(repo_name)
+
+    headers = {
+        "ETag": f'"{sha}"',
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache"
+    }
+    if request.if_none_match.contains(sha):
+        return Response(status=304, headers=headers)
+
+    start, stop, status = 0, size, 200
+
+    # If-Range com outro ETag: o arquivo mudou, então vai inteiro
+    byte_range = request.range
+    if byte_range is not None and request.if_range.etag not in (None, sha):
+        byte_range = None
+
+    if byte_range is not None and len(byte_range.ranges) == 1:
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status=416, headers=headers)
+        start, stop = bounds
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+
+    headers["Content-Length"] = str(stop - start)
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    return Response(
+        stream_with_context(stream_blob(repo, sha, start, stop)),
+        status=status,
+        headers=headers,
+        content_type=content_type
+    )
 
 
 @repos_bp.route('/<string:repo_name>/files', methods=['POST'])
@@ -129,19 +353,167 @@ def upload_file(repo_name: str):
     if not path or not file:
         raise BadRequestError("Campos 'path' e 'file' são obrigatórios")
 
-
-    with GithubController(g.token, True) as git:
-        result = git.upload_file(
-            repo_name=repo_name,
-            path=path,
-            content=file,
-            message=message,
-            branch=branch
+    result = RepositoryService(g.token).upload_file(
+        repo_name=repo_name,
+        path=path,
+        content=file,
+        message=message,
+        branch=branch
+    )
+    return jsonify(result), 201
+
+
+def _json_files(items: list) -> dict:
+    if not isinstance(items, list):
+        raise BadRequestError("Campo 'files' deve ser uma lista")
+
+    files = {}
+    for item in items:
+        if not isinstance(item, dict):
+            raise BadRequestError("Cada item de 'files' deve ser um objeto")
+        path = item.get("path")
+        content = item.get("content")
+        if not isinstance(path, str) or not isinstance(content, str) or not path:
+            raise BadRequestError(
+                "Cada item de 'files' precisa dos campos 'path' e 'content' (textos)"
+            )
+        # Caminho relativo à raiz do repositório, sem segmentos vazios, '.' ou '..'
+        if any(part in ("", ".", "..") for part in path.split("/")):
+            raise BadRequestError(f"Caminho inválido em 'files': '{path}'")
+        if item.get("encoding", "utf-8") == "base64":
+            try:
+                content = base64.b64decode(content, validate=True)
+            except (binascii.Error, TypeError, ValueError):
+                raise BadRequestError(f"Conteúdo base64 inválido em '{path}'")
+        files[path] = content
+    return files
+
+
+def _read_batch_files() -> dict:
+    """
+    Lê os arquivos do lote a partir de um JSON
+    ({"files": [{"path", "content", "encoding"}]}) ou de um multipart com
+    os campos 'file' e 'path' repetidos na mesma ordem.
+    """
+    if request.is_json:
+        return _json_files(json_body().get("files") or [])
+
+    uploads = request.files.getlist("file")
+    paths = request.form.getlist("path")
+    if len(uploads) != len(paths):
+        raise BadRequestError(
+            "Cada campo 'file' deve ter um campo 'path' correspondente"
         )
+    return dict(zip(paths, uploads))
 
-    return jsonify(ContentFileData.from_content_file(result)), 201
+
+@repos_bp.route('/<string:repo_name>/files/batch', methods=['POST'])
+@token_required
+def upload_files(repo_name: str):
+    branch = request.args.get('branch', 'main')
+    if request.is_json:
+        message = json_body().get("message", "Add files via script")
+    else:
+        message = request.form.get("message", "Add files via script")
+
+    files = _read_batch_files()
+    if not files:
+        raise BadRequestError("Ao menos um arquivo deve ser enviado")
+
+    commit = RepositoryService(g.token).upload_files(
+        repo_name=repo_name,
+        files=files,
+        message=message,
+        branch=branch
+    )
+
+    # 207 quando o commit saiu sem alguns arquivos; os erros vão em 'failures'
+    return jsonify(commit), 207 if commit.failures else 201
 
 
+@repos_bp.route('/<string:repo_name>/files/sync', methods=['POST'])
+@token_required
+def sync_files(repo_name: str):
+    """
+    Deixa a branch com os arquivos enviados, commitando só o que mudou.
+    'prune' lista padrões glob de caminhos a remover quando não vierem no envio
+    (no multipart, um campo 'prune' por padrão).
+    """
+    branch = request.args.get('branch', 'main')
+    if request.is_json:
+        data = json_body()
+        prune = data.get("prune") or []
+    else:
+        data = request.form
+        prune = request.form.getlist("prune")
+
+    valid_prune = isinstance(prune, list) and all(isinstance(pattern, str)
+                                                  for pattern in prune)
+    if not valid_prune:
+        raise BadRequestError("Campo 'prune' deve ser uma lista de padrões")
+
+    files = _read_batch_files()
+    if not files:
+        raise BadRequestError("Ao menos um arquivo deve ser enviado")
+
+    result = RepositoryService(g.token).sync_files(
+        repo_name=repo_name,
+        files=files,
+        message=data.get("message", "Sync files via script"),
+        branch=branch,
+        prune=prune
+    )
+
+    # 201 quando houve commit; 200 quando a branch já estava igual
+    return jsonify(result), 201 if result.sha else 200
+
+
+@repos_bp.route('/<string:repo_name>/files', methods=['DELETE'])
+@token_required
+def delete_files(repo_name: str):
+    """
+    Remove em um único commit os arquivos de 'paths': caminhos de arquivo,
+    pastas (com tudo o que houver dentro) ou padrões glob.
+    """
+    branch = request.args.get('branch', 'main')
+    data = json_body()
+    paths = data.get("paths")
+
+    if isinstance(paths, str):
+        paths = [paths]
+    valid_paths = isinstance(paths, list) and all(
+        isinstance(path, str) and path.strip("/") for path in paths)
+    if not paths or not valid_paths:
+        raise BadRequestError("Campo 'paths' deve ser uma lista de caminhos, pastas "
+                              "ou padrões glob")
+
+    commit = RepositoryService(g.token).delete_files(
+        repo_name=repo_name,
+        paths=paths,
+        message=data.get("message", "Delete files via script"),
+        branch=branch
+    )
+    return jsonify(commit), 200
+
+
+def _expected_sha() -> Optional[str]:
+    """
+    SHA atual do arquivo informado pelo cliente, via If-Match (o ETag devolvido
+    por GET .../raw e pelo próprio PUT) ou pelo campo de formulário 'sha'.
+    """
+    sha = request.form.get('sha') or None
+
+    if_match = request.if_match
+    if if_match and not if_match.star_tag:
+        tags = list(if_match)
+        if len(tags) != 1:
+            raise BadRequestError("If-Match deve trazer um único SHA")
+        if sha is not None and sha != tags[0]:
+            raise BadRequestError("If-Match e o campo 'sha' informam SHAs diferentes")
+        sha = tags[0]
+
+    return sha
+
 
 @repos_bp.route('/<string:repo_name>/files/<path:path>', methods=['PUT'])
 @token_required
@@ -154,26 +526,28 @@ def update_file(repo_name: str, path: str):
     if not file:
         raise BadRequestError("Campos 'file' (novo conteúdo) é obrigatório")
 
-    with GithubController(g.token, True) as git:
+    with GithubController(g.token, True, client_pool) as git:
         result = git.update_file_content(
             repo_name=repo_name,
             path=path,
             new_content=file,  # file-like
             message=message,
-            branch=branch
+            branch=branch,
+            sha=_expected_sha()
         )
 
-    return jsonify(ContentFileData.from_content_file(result)), 200
-
+    response = jsonify(ContentFileData.from_content_file(result, repo_name))
+    response.headers["ETag"] = f'"{result.sha}"'
+    return response, 200
 
 
-@repos_bp.route('/<string:repo_name>/files/<string:path>', methods=['DELETE'])
+@repos_bp.route('/<string:repo_name>/files/<path:path>', methods=['DELETE'])
 @token_required
 def delete_file(repo_name: str, path: str):
     branch = request.args.get('branch', 'main')
     data = request.get_json(silent=True) or {}
     message = data.get('message', 'Delete file via script')
-    with GithubController(g.token, True) as git:
+    with GithubController(g.token, True, client_pool) as git:
         result = git.delete_file(
             repo_name,
             path,
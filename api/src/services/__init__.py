@@ -0,0 +1,20 @@
+import os
+from typing import Optional, Union
+
+from .repository_service import RepositoryService
+from .http_client import RepositoryClient
+from .class_reader import parse_class, read_class
+from .progress import classes_progress
+
+
+def repository_service(token: str,
+                       api_url: Optional[str] = None
+                       ) -> Union[RepositoryService, RepositoryClient]:
+    """
+    Serviço de repositórios para o token: no próprio processo por padrão, ou
+    um cliente HTTP quando a API roda em outro host (API_URL).
+    """
+    api_url = api_url or os.getenv("API_URL")
+    if api_url:
+        return RepositoryClient(api_url, token)
+    return RepositoryService(token)
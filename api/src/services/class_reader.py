@@ -0,0 +1,61 @@
+"""
+Leitura de uma classe inteira (requirements.json e todos os conclusion.json)
+em poucas consultas GraphQL, em vez de uma chamada por arquivo.
+"""
+
+import json
+from typing import Any, Dict, Union
+
+from ..controllers import GithubController
+from ..errors import GithubError, NotFoundError, ValidationError
+from ..models import ClassData, class_requirements
+from ..validation import CLASS_FILE, validate_class
+
+
+def _decode(text: Union[str, bytes]) -> Any:
+    try:
+        return json.loads(text)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def parse_class(text: Union[str, bytes]) -> Dict:
+    """
+    Conteúdo do requirements.json, já validado.
+    :raises GithubError: Conteúdo fora do formato de uma classe (422)
+    """
+    data = _decode(text)
+    try:
+        if not isinstance(data, dict):
+            raise ValidationError(["$: deveria ser um objeto"])
+        validate_class(data)
+    except ValidationError as e:
+        raise GithubError(f"O {CLASS_FILE} do repositório não é uma classe válida: "
+                          f"{'; '.join(e.errors)}", 422)
+    return data
+
+
+def read_class(git: GithubController, repo_name: str,
+               branch: str = "main") -> ClassData:
+    """
+    Requisitos da classe agrupados como no requirements.json, cada um com o
+    seu conclusion.json. A primeira consulta lê o requirements.json e fixa o
+    commit; a segunda lê todos os conclusion.json desse commit.
+    :raises NotFoundError: Repositório, branch ou requirements.json inexistente
+    :raises GithubError: requirements.json fora do formato de uma classe (422)
+    """
+    commit, texts = git.read_text_files(repo_name, [CLASS_FILE], branch)
+    if texts[CLASS_FILE] is None:
+        raise NotFoundError(resource_type="File", resource_identifier=CLASS_FILE)
+
+    data = parse_class(texts[CLASS_FILE])
+    paths = [requirement.path
+             for requirement in class_requirements(repo_name, data, {})]
+    conclusions = {}
+    if paths:
+        _, texts = git.read_text_files(repo_name, paths, commit)
+        conclusions = {path: _decode(text)
+                       for path, text in texts.items() if text is not None}
+
+    requirements = class_requirements(repo_name, data, conclusions, commit)
+    return ClassData.from_requirements(repo_name, commit, data, requirements)
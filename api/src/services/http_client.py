@@ -0,0 +1,193 @@
+import base64
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..errors import GithubError, AlreadyExistsError
+from ..models import (RepositoryData, ContentFileData, CommitData, SyncData,
+                      ProvisionData, DashboardData)
+from .repository_service import Content
+
+POOL_SIZE = int(os.getenv("API_HTTP_POOL_SIZE", "8"))
+TIMEOUT = float(os.getenv("API_HTTP_TIMEOUT", "60"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """Sessão keep-alive reaproveitada por todos os clientes do processo."""
+    global _session
+    # Sob o lock, requisições simultâneas não criam duas sessões
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+class RepositoryClient:
+    """
+    Mesma interface do `RepositoryService`, mas falando com a API por HTTP.
+    Usado quando a API roda em outro host (variável API_URL).
+    """
+
+    def __init__(self, base_url: str, token: str,
+                 session: Optional[requests.Session] = None) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._headers = {"x-api-token": token}
+        self._session = session or shared_session()
+
+    def _request(self,
+                 method: str,
+                 path: str,
+                 already_exists: Optional[Callable[[], AlreadyExistsError]] = None,
+                 **kwargs
+                 ) -> Dict:
+        response = self._session.request(method, f"{self._base_url}{path}",
+                                         headers=self._headers, timeout=TIMEOUT,
+                                         **kwargs)
+
+        if response.status_code in (200, 201, 207):
+            return response.json()
+
+        try:
+            message = response.json().get("message") or response.text
+        except ValueError:
+            message = response.text
+
+        exists = already_exists and "already exists" in message
+        if response.status_code == 400 and exists:
+            raise already_exists()
+        raise GithubError(message, response.status_code)
+
+    def create_repo(self,
+                    name: str,
+                    description: Optional[str] = "Repository created via API",
+                    private: bool = False,
+                    auto_init: bool = True,
+                    gitignore_template: Optional[str] = "Python",
+                    license_template: Optional[str] = "mit"
+                    ) -> RepositoryData:
+        data = self._request(
+            "POST",
+            "/repositories/",
+            lambda: AlreadyExistsError(resource_type="Repository",
+                                       resource_identifier=name),
+            json={
+                "name": name,
+                "description": description,
+                "private": private,
+                "auto_init": auto_init,
+                "gitignore_template": gitignore_template,
+                "license_template": license_template
+            }
+        )
+        return RepositoryData(**data)
+
+    def upload_file(self,
+                    repo_name: str,
+                    path: str,
+                    content: Content,
+                    message: Optional[str] = "Add file via script",
+                    branch: Optional[str] = "main"
+                    ) -> ContentFileData:
+        data = self._request(
+            "POST",
+            f"/repositories/{repo_name}/files",
+            lambda: AlreadyExistsError(resource_type="File", resource_identifier=path),
+            params={"branch": branch},
+            data={"path": path, "message": message},
+            files={"file": (path.rsplit("/", 1)[-1], _raw(content),
+                            "application/octet-stream")}
+        )
+        return ContentFileData(**data)
+
+    def upload_files(self,
+                     repo_name: str,
+                     files: Dict[str, Content],
+                     message: Optional[str] = "Add files via script",
+                     branch: Optional[str] = "main"
+                     ) -> CommitData:
+        payload = {
+            "message": message,
+            "files": [_file_item(path, content) for path, content in files.items()]
+        }
+        data = self._request("POST", f"/repositories/{repo_name}/files/batch",
+                             params={"branch": branch}, json=payload)
+        return CommitData(**data)
+
+    def sync_files(self,
+                   repo_name: str,
+                   files: Dict[str, Content],
+                   message: Optional[str] = "Sync files via script",
+                   branch: Optional[str] = "main",
+                   prune: Optional[List[str]] = None
+                   ) -> SyncData:
+        payload = {
+            "message": message,
+            "prune": prune or [],
+            "files": [_file_item(path, content) for path, content in files.items()]
+        }
+        data = self._request("POST", f"/repositories/{repo_name}/files/sync",
+                             params={"branch": branch}, json=payload)
+        return SyncData(**data)
+
+    def delete_files(self,
+                     repo_name: str,
+                     paths: List[str],
+                     message: Optional[str] = "Delete files via script",
+                     branch: Optional[str] = "main"
+                     ) -> CommitData:
+        data = self._request("DELETE", f"/repositories/{repo_name}/files",
+                             params={"branch": branch},
+                             json={"paths": paths, "message": message})
+        return CommitData(**data)
+
+    def provision_repos(self,
+                        template: str,
+                        repos: List[Tuple[str, str, Dict[str, Content]]],
+                        message: Optional[str] = "Add files via script",
+                        private: bool = False
+                        ) -> List[ProvisionData]:
+        payload = {
+            "template": template,
+            "message": message,
+            "private": private,
+            "repositories": [
+                {
+                    "name": name,
+                    "description": description,
+                    "files": [_file_item(path, content)
+                              for path, content in files.items()]
+                }
+                for name, description, files in repos
+            ]
+        }
+        data = self._request("POST", "/repositories/provision", json=payload)
+        return [ProvisionData(**item) for item in data["repositories"]]
+
+    def classes_progress(self, branch: str = "main") -> DashboardData:
+        data = self._request("GET", "/dashboard/", params={"branch": branch})
+        return DashboardData.from_dict(data)
+
+
+def _raw(content: Content) -> bytes:
+    if isinstance(content, str):
+        return content.encode("utf-8")
+    if isinstance(content, (bytes, bytearray)):
+        return bytes(content)
+    return content.read()
+
+
+def _file_item(path: str, content: Content) -> Dict:
+    if isinstance(content, str):
+        return {"path": path, "content": content}
+    encoded = base64.b64encode(_raw(content)).decode("ascii")
+    return {"path": path, "content": encoded, "encoding": "base64"}
@@ -0,0 +1,155 @@
+"""
+Progresso de todas as classes do usuário. Os commits das branches de todos os
+repositórios vêm numa consulta GraphQL; só as classes cujo commit mudou desde a
+última leitura são lidas de novo, em paralelo.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from github.GithubException import GithubException
+
+from ..controllers import GithubController
+from ..errors import GithubError, NotFoundError
+from ..models import ClassProgressData, DashboardData
+from ..validation import CLASS_FILE
+from .class_reader import read_class
+
+# Classes lidas ao mesmo tempo e resumos guardados em memória
+DASHBOARD_CONCURRENCY = int(os.getenv("DASHBOARD_CONCURRENCY", "8"))
+DASHBOARD_CACHE_SIZE = int(os.getenv("DASHBOARD_CACHE_SIZE", "1024"))
+
+# (dono, repositório, branch) -> (commit, resumo ou None se não é classe, erro
+# de formato)
+_Entry = Tuple[str, Optional[ClassProgressData], Optional[str]]
+_cache: "OrderedDict[Tuple[str, str, str], _Entry]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(key: Tuple[str, str, str], head: str) -> Optional[_Entry]:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry[0] != head:
+            return None
+        _cache.move_to_end(key)
+        return entry
+
+
+def _remember(key: Tuple[str, str, str], entry: _Entry) -> None:
+    with _cache_lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > DASHBOARD_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _summarize(git: GithubController, repo_name: str, head: str) -> _Entry:
+    # Só o resultado de um commit é guardado: ausência de requirements.json e
+    # classe inválida não mudam enquanto o commit não mudar
+    try:
+        summary = ClassProgressData.from_class(read_class(git, repo_name, head))
+        return head, summary, None
+    except NotFoundError:
+        return head, None, None
+    except GithubError as e:
+        if e.status_code != 422:
+            raise
+        return head, None, e.message
+
+
+def _partition(owner: str,
+               names: List[str],
+               heads: Dict[str, str],
+               branch: str
+               ) -> Tuple[Dict[str, _Entry], List[str]]:
+    """
+    :return: Tupla (resumos do cache ainda no mesmo commit, repositórios que
+             precisam ser lidos de novo)
+    """
+    entries: Dict[str, _Entry] = {}
+    changed: List[str] = []
+    for name in names:
+        head = heads.get(name)
+        if head is None:
+            continue
+        entry = _cached((owner, name, branch), head)
+        if entry is None:
+            changed.append(name)
+        else:
+            entries[name] = entry
+    return entries, changed
+
+
+def _summarize_changed(git: GithubController,
+                       owner: str,
+                       changed: List[str],
+                       heads: Dict[str, str],
+                       branch: str,
+                       max_workers: int
+                       ) -> Tuple[Dict[str, _Entry], Dict[str, str]]:
+    """
+    Lê em paralelo as classes que mudaram e guarda os resumos no cache.
+    :return: Tupla (resumos lidos, mensagem de erro de cada repositório que falhou)
+    """
+    entries: Dict[str, _Entry] = {}
+    errors: Dict[str, str] = {}
+    workers = max(1, min(max_workers, len(changed)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_summarize, git, name, heads[name]): name
+                   for name in changed}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                entries[name] = future.result()
+            except GithubError as e:
+                errors[name] = e.message
+                continue
+            except GithubException as e:
+                if e.status == 401:
+                    raise
+                message = e.data.get("message") if isinstance(e.data, dict) else None
+                errors[name] = message or str(e)
+                continue
+            _remember((owner, name, branch), entries[name])
+    return entries, errors
+
+
+def classes_progress(git: GithubController,
+                     branch: str = "main",
+                     max_workers: int = DASHBOARD_CONCURRENCY
+                     ) -> DashboardData:
+    """
+    Conclusão de cada classe e de cada grupo, na ordem da listagem de
+    repositórios. Repositórios sem requirements.json ou sem a branch ficam de
+    fora; a falha de um repositório vai para 'errors' e não interrompe os demais.
+    """
+    owner = git.get_user().login
+    # Só os repositórios do próprio usuário: as leituras abaixo são pelo nome,
+    # no dono do token, e um repositório de outro dono cairia num homônimo
+    names = [repo.name for repo in git.get_repos(per_page=100, affiliation="owner")]
+    # Repositórios sem requirements.json na branch já ficam de fora nesta consulta
+    heads = git.head_commits(names, branch, require_file=CLASS_FILE)
+
+    entries, changed = _partition(owner, names, heads, branch)
+    cached = len(entries)
+
+    errors: Dict[str, str] = {}
+    if changed:
+        read, errors = _summarize_changed(git, owner, changed, heads, branch,
+                                          max_workers)
+        entries.update(read)
+
+    classes = []
+    for name in names:
+        if name not in entries:
+            continue
+        _, summary, error = entries[name]
+        if error is not None:
+            errors[name] = error
+        elif summary is not None:
+            classes.append(summary)
+
+    return DashboardData.from_classes(branch, classes, errors, len(changed), cached)
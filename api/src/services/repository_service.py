@@ -0,0 +1,189 @@
+from contextlib import contextmanager
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
+
+from github.GithubException import GithubException
+
+from ..controllers import GithubController, GithubClientPool, client_pool
+from ..controllers.github_controller import _glob_match
+from ..errors import GithubError, RateLimitedError
+from ..models import (RepositoryData, ContentFileData, CommitData, SyncData,
+                      ProvisionData, DashboardData)
+from .progress import classes_progress
+
+Content = Union[str, bytes, bytearray, IO[bytes]]
+
+
+class RepositoryService:
+    """
+    Operações da API sobre repositórios, chamadas no próprio processo tanto
+    pelas rotas de `repos_bp` quanto pela interface web (/upload).
+
+    Usa o pool de clientes do GitHub, então o token é validado uma única vez
+    e as chamadas não passam de novo pelo servidor HTTP da aplicação.
+    """
+
+    def __init__(self, token: str,
+                 pool: Optional[GithubClientPool] = client_pool) -> None:
+        self._token = token
+        self._pool = pool
+
+    @contextmanager
+    def _controller(self) -> Iterator[GithubController]:
+        # Quem chama o serviço só precisa tratar GithubError, seja qual for a origem
+        try:
+            with GithubController(self._token, True, self._pool) as git:
+                yield git
+        except GithubException as e:
+            raise _github_error(e) from e
+
+    def create_repo(self,
+                    name: str,
+                    description: Optional[str] = "Repository created via API",
+                    private: bool = False,
+                    auto_init: bool = True,
+                    gitignore_template: Optional[str] = "Python",
+                    license_template: Optional[str] = "mit"
+                    ) -> RepositoryData:
+        with self._controller() as git:
+            repo = git.create_repo(
+                name=name,
+                description=description,
+                private=private,
+                auto_init=auto_init,
+                gitignore_template=gitignore_template,
+                license_template=license_template
+            )
+            return RepositoryData.from_repository(repo)
+
+    def upload_file(self,
+                    repo_name: str,
+                    path: str,
+                    content: Content,
+                    message: Optional[str] = "Add file via script",
+                    branch: Optional[str] = "main"
+                    ) -> ContentFileData:
+        with self._controller() as git:
+            result = git.upload_file(
+                repo_name=repo_name,
+                path=path,
+                content=content,
+                message=message,
+                branch=branch
+            )
+            return ContentFileData.from_content_file(result, repo_name)
+
+    def upload_files(self,
+                     repo_name: str,
+                     files: Dict[str, Content],
+                     message: Optional[str] = "Add files via script",
+                     branch: Optional[str] = "main"
+                     ) -> CommitData:
+        """
+        :param files: Dicionário {caminho no repositório: conteúdo}
+        :return: Commit criado; arquivos que falharam ficam em 'failures'
+        """
+        with self._controller() as git:
+            commit, failures = git.upload_files(
+                repo_name=repo_name,
+                files=files,
+                message=message,
+                branch=branch
+            )
+            return CommitData.from_git_commit(commit, list(files), failures)
+
+    def sync_files(self,
+                   repo_name: str,
+                   files: Dict[str, Content],
+                   message: Optional[str] = "Sync files via script",
+                   branch: Optional[str] = "main",
+                   prune: Optional[List[str]] = None
+                   ) -> SyncData:
+        """
+        :param files: Dicionário {caminho no repositório: conteúdo desejado}
+        :param prune: Padrões glob dos caminhos que devem ser removidos quando
+                      não estiverem em 'files' (ex.: "*/*/conclusion.json"),
+                      com as mesmas regras do delete ('*' não atravessa '/')
+        :return: O que foi adicionado, alterado e removido; sem commit se nada mudou
+        """
+        with self._controller() as git:
+            commit, changes, failures = git.sync_files(
+                repo_name=repo_name,
+                files=files,
+                message=message,
+                branch=branch,
+                prune=matches_any(prune)
+            )
+            return SyncData.from_sync(commit, changes, failures)
+
+    def delete_files(self,
+                     repo_name: str,
+                     paths: List[str],
+                     message: Optional[str] = "Delete files via script",
+                     branch: Optional[str] = "main"
+                     ) -> CommitData:
+        """
+        :param paths: Arquivos, pastas ou padrões glob a remover, em um único commit
+        :return: Commit criado, com os caminhos removidos em 'files'
+        """
+        with self._controller() as git:
+            commit, deleted = git.delete_files(
+                repo_name=repo_name,
+                patterns=paths,
+                message=message,
+                branch=branch
+            )
+            return CommitData.from_git_commit(commit, deleted)
+
+    def provision_repos(self,
+                        template: str,
+                        repos: List[Tuple[str, str, Dict[str, Content]]],
+                        message: Optional[str] = "Add files via script",
+                        private: bool = False
+                        ) -> List[ProvisionData]:
+        """
+        :param template: Repositório template ("nome" do usuário ou "dono/nome")
+        :param repos: Lista de (nome, descrição, {caminho: conteúdo}) de cada
+                      repositório
+        :return: Resultado de cada repositório, na ordem recebida
+        """
+        with self._controller() as git:
+            created, errors = git.provision_repos(
+                template=template,
+                repos=repos,
+                message=message,
+                private=private
+            )
+
+        results = []
+        for name, _, files in repos:
+            if name in errors:
+                results.append(ProvisionData.from_error(name, errors[name]))
+            else:
+                repo, commit, failures = created[name]
+                results.append(ProvisionData.from_repository(repo, commit, list(files),
+                                                             failures))
+        return results
+
+    def classes_progress(self, branch: str = "main") -> DashboardData:
+        """Conclusão de todas as classes do usuário, por classe e por grupo."""
+        with self._controller() as git:
+            return classes_progress(git, branch)
+
+
+def matches_any(patterns: Optional[List[str]]):
+    """Predicado de poda a partir de padrões glob (None = não remove nada)."""
+    if not patterns:
+        return None
+    return lambda path: any(_glob_match(path, pattern) for pattern in patterns)
+
+
+def _github_error(e: GithubException) -> GithubError:
+    message = e.data.get("message") if isinstance(e.data, dict) else None
+    retry_after = (e.headers or {}).get("retry-after")
+    if retry_after is not None:
+        try:
+            return RateLimitedError(float(retry_after),
+                                    message or "GitHub rate limit exceeded.")
+        except ValueError:
+            pass
+    return GithubError(message or str(e), e.status)
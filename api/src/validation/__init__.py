@@ -0,0 +1,3 @@
+from .schema import compile_schema
+from .class_file import (CLASS_FILE, CLASS_SCHEMA, read_class_file, validate_class,
+                         requirement_path)
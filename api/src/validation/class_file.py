@@ -0,0 +1,146 @@
+"""
+Validação do arquivo de uma classe (requirements.json) antes de qualquer
+chamada ao GitHub: tamanho, JSON, esquema de info/groups/requirements e
+coerência entre requisitos e grupos.
+"""
+
+import json
+import os
+from typing import IO, Dict, List, Tuple
+
+from ..errors import BadRequestError, ValidationError
+from .schema import compile_schema
+
+# Arquivo da classe na raiz de cada repositório
+CLASS_FILE = "requirements.json"
+
+# Tamanho máximo aceito; o arquivo é lido em pedaços e recusado ao passar dele
+MAX_CLASS_FILE_SIZE = int(os.getenv("MAX_CLASS_FILE_SIZE", str(5 * 1024 * 1024)))
+READ_CHUNK_SIZE = 64 * 1024
+
+# Erros listados na resposta; o restante só é contado
+MAX_REPORTED_ERRORS = 20
+
+# Nomes de grupo e descrições viram pastas no repositório
+PATH_COMPONENT = {"type": "string", "minLength": 1, "notContains": ["/"]}
+IDENTIFIER = {"type": ["integer", "string"]}
+
+CLASS_SCHEMA = {
+    "type": "object",
+    "required": ["info", "groups", "requirements"],
+    "properties": {
+        "info": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {
+                "name": {"type": "string", "minLength": 1, "notContains": ["/"]},
+                "description": {"type": ["string", "null"]},
+            },
+        },
+        "groups": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["groupId", "groupName"],
+                "properties": {"groupId": IDENTIFIER, "groupName": PATH_COMPONENT},
+            },
+        },
+        "requirements": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["requirementId", "groupId", "requirementDescription"],
+                "properties": {
+                    "requirementId": IDENTIFIER,
+                    "groupId": IDENTIFIER,
+                    "requirementDescription": PATH_COMPONENT,
+                    "conclusion": {"type": ["object", "null"]},
+                },
+            },
+        },
+    },
+}
+
+_validate_schema = compile_schema(CLASS_SCHEMA)
+
+
+def read_class_file(file: IO[bytes],
+                    max_size: int = MAX_CLASS_FILE_SIZE) -> Tuple[str, Dict]:
+    """
+    Lê e valida o arquivo da classe.
+    :return: Tupla (conteúdo em texto, documento)
+    :raises BadRequestError: Arquivo grande demais, vazio ou que não é um JSON
+    :raises ValidationError: Documento fora do esquema, com a lista de problemas
+    """
+    chunks: List[bytes] = []
+    size = 0
+    for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+        if not chunks and not chunk.lstrip().startswith(b"{") and chunk.strip():
+            # Não é um objeto JSON: recusa sem ler o resto do arquivo
+            raise BadRequestError("O arquivo enviado não é um JSON válido: "
+                                  "deveria ser um objeto.")
+        size += len(chunk)
+        if size > max_size:
+            raise BadRequestError(f"O arquivo passa do tamanho máximo de "
+                                  f"{max_size} bytes.")
+        chunks.append(chunk)
+
+    try:
+        content = b"".join(chunks).decode("utf-8")
+        data = json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise BadRequestError("O arquivo enviado não é um JSON válido. Erro: " + str(e))
+
+    validate_class(data)
+    return content, data
+
+
+def validate_class(data: Dict) -> None:
+    """
+    :raises ValidationError: Com um item "caminho: problema" por erro encontrado
+    """
+    errors: List[str] = []
+    _validate_schema(data, "$", errors)
+
+    if not errors:
+        errors.extend(_check_references(data))
+
+    if errors:
+        raise ValidationError(errors[:MAX_REPORTED_ERRORS], len(errors))
+
+
+def requirement_path(group_id, group_name: str, requirement_id,
+                     description: str) -> str:
+    """
+    Caminho do conclusion.json de um requisito:
+    "<grupo> - <nome>/<NN> - <descrição>".
+    """
+    number = str(requirement_id).zfill(2)
+    return f"{group_id} - {group_name}/{number} - {description}/conclusion.json"
+
+
+def _check_references(data: Dict) -> List[str]:
+    errors = []
+
+    groups = set()
+    for index, group in enumerate(data["groups"]):
+        if group["groupId"] in groups:
+            errors.append(f"$.groups[{index}].groupId: "
+                          f"grupo {group['groupId']!r} repetido")
+        groups.add(group["groupId"])
+
+    # O caminho de cada requisito fica dentro da pasta do grupo: o mesmo id
+    # pode aparecer em grupos diferentes, mas não duas vezes no mesmo grupo
+    requirements = set()
+    for index, requirement in enumerate(data["requirements"]):
+        group_id, requirement_id = requirement["groupId"], requirement["requirementId"]
+        if group_id not in groups:
+            errors.append(f"$.requirements[{index}].groupId: grupo {group_id!r} "
+                          "não existe em 'groups'")
+        key = (group_id, requirement_id)
+        if key in requirements:
+            errors.append(f"$.requirements[{index}].requirementId: requisito "
+                          f"{requirement_id!r} repetido no grupo {group_id!r}")
+        requirements.add(key)
+
+    return errors
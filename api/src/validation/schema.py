@@ -0,0 +1,113 @@
+"""
+Validação de documentos JSON por um subconjunto do JSON Schema.
+
+O esquema é compilado uma única vez em uma árvore de funções, então validar um
+documento não reinterpreta o esquema a cada nó. Suporta 'type' (um ou vários),
+'properties', 'required', 'additionalProperties', 'items', 'minItems',
+'minLength' e 'notContains' (texto que não pode aparecer na string).
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+Validator = Callable[[Any, str, List[str]], None]
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: (isinstance(value, (int, float))
+                             and not isinstance(value, bool)),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _check_type(schema: Dict) -> Validator:
+    types = schema["type"]
+    names = [types] if isinstance(types, str) else list(types)
+    accepted = [_TYPES[name] for name in names]
+    expected = " ou ".join(names)
+
+    def check_type(value, path, errors):
+        if not any(accept(value) for accept in accepted):
+            errors.append(f"{path}: deveria ser {expected}")
+    return check_type
+
+
+def _check_object(schema: Dict) -> Validator:
+    properties = {name: compile_schema(sub)
+                  for name, sub in schema.get("properties", {}).items()}
+    required = list(schema.get("required", []))
+    closed = schema.get("additionalProperties", True) is False
+
+    def check_object(value, path, errors):
+        if not isinstance(value, dict):
+            return
+        for name in required:
+            if name not in value:
+                errors.append(f"{path}.{name}: campo obrigatório")
+        for name, item in value.items():
+            validator = properties.get(name)
+            if validator is not None:
+                validator(item, f"{path}.{name}", errors)
+            elif closed:
+                errors.append(f"{path}.{name}: campo não permitido")
+    return check_object
+
+
+def _check_array(schema: Dict) -> Validator:
+    items = compile_schema(schema["items"]) if "items" in schema else None
+    min_items = schema.get("minItems", 0)
+
+    def check_array(value, path, errors):
+        if not isinstance(value, list):
+            return
+        if len(value) < min_items:
+            errors.append(f"{path}: deveria ter ao menos {min_items} item(ns)")
+        if items is not None:
+            for index, item in enumerate(value):
+                items(item, f"{path}[{index}]", errors)
+    return check_array
+
+
+def _check_string(schema: Dict) -> Validator:
+    min_length = schema.get("minLength", 0)
+    forbidden = list(schema.get("notContains", []))
+
+    def check_string(value, path, errors):
+        if not isinstance(value, str):
+            return
+        if len(value.strip()) < min_length:
+            errors.append(f"{path}: não pode ser vazio")
+        for text in forbidden:
+            if text in value:
+                errors.append(f"{path}: não pode conter '{text}'")
+    return check_string
+
+
+# Palavras-chave do esquema -> construtor da verificação que as trata
+_BUILDERS: Dict[Tuple[str, ...], Callable[[Dict], Validator]] = {
+    ("type",): _check_type,
+    ("properties", "required"): _check_object,
+    ("items", "minItems"): _check_array,
+    ("minLength", "notContains"): _check_string,
+}
+
+
+def compile_schema(schema: Dict) -> Validator:
+    """
+    :param schema: Esquema (subconjunto do JSON Schema)
+    :return: Função (valor, caminho, erros) que acrescenta em 'erros' as
+             mensagens "caminho: problema" do que não segue o esquema
+    """
+    checks = [
+        build(schema)
+        for keywords, build in _BUILDERS.items()
+        if any(keyword in schema for keyword in keywords)
+    ]
+
+    def validate(value, path, errors):
+        for check in checks:
+            check(value, path, errors)
+    return validate
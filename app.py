@@ -1,23 +1,54 @@
 from flask import Flask, redirect, request, render_template, jsonify, url_for
-from api.src.errors import BadRequestError, GithubError, AlreadyExistsError
+from api.src.errors import (BadRequestError, GithubError, AlreadyExistsError,
+                            NotFoundError)
+from api.src.jobs import JobStore, JobRunner
+from api.src.routers.errors import handle_github_error
+from api.src.services import repository_service
+from api.src.validation import read_class_file, requirement_path
+from assets import AssetPipeline
 
 
 from dotenv import load_dotenv
 import os
-import requests
 import json
 
 load_dotenv()
 
-API_URL = 'http://localhost:3000/api'
-HEADERS = {
-    'x-api-token': os.getenv('GITHUB_API_TOKEN')
-}
+# Sem API_URL a interface chama a camada de serviço no próprio processo;
+# com ela, usa um cliente HTTP (sessão keep-alive) para a API em outro host
+API_URL = os.getenv('API_URL')
 
 
 app = Flask(__name__, 
             template_folder='app/templates', 
-            static_folder='app/static')
+            static_folder=None)
+
+# Estáticos com hash no nome, pré-comprimidos (gzip/brotli) e servidos da memória
+static_assets = AssetPipeline(os.path.join(app.root_path, 'app', 'static'))
+static_assets.register(app)
+app.jinja_env.globals['asset_url'] = static_assets.url
+
+# Quantidade de arquivos de requisito enviados em cada commit
+UPLOAD_BATCH_SIZE = int(os.getenv('UPLOAD_BATCH_SIZE', '50'))
+
+# Repositório template ("nome" ou "dono/nome") usado ao criar várias classes de uma vez
+CLASS_TEMPLATE_REPO = os.getenv('CLASS_TEMPLATE_REPO')
+
+job_runner = JobRunner(
+    JobStore(os.getenv('JOBS_DB_PATH',
+                       os.path.join(app.instance_path, 'jobs.sqlite3'))),
+    max_workers=int(os.getenv('UPLOAD_WORKERS', '2'))
+)
+
+
+app.register_error_handler(GithubError, handle_github_error)
+
+
+@app.before_request
+def resume_pending_jobs():
+    # Retoma, no processo que atende as requisições, os jobs interrompidos
+    # por um reinício
+    job_runner.resume()
 
 
 
@@ -35,6 +66,13 @@ def index():
     return render_template('index.html', page_info=page_info, github_token=token)
 
 
+@app.route("/progress")
+def classes_progress():
+    """Conclusão das classes para o painel da página inicial."""
+    dashboard = github_service().classes_progress(request.args.get('branch', 'main'))
+    return jsonify(dashboard), 200
+
+
 @app.route("/register-token")
 def register_token():
     page_info = {
@@ -54,56 +92,230 @@ def create_new_class():
     return render_template('create_new_class.html', page_info=page_info)
 
 
+def github_service():
+    return repository_service(os.getenv('GITHUB_API_TOKEN'), API_URL)
+
+
 def create_github_repo(repo_name: str, description: str = ""):
-    url = f"{API_URL}/repositories" 
-    payload = {
-        "name": repo_name,
-        "description": description
-    }
-    response = requests.post(url, headers=HEADERS, json=payload)
+    return github_service().create_repo(name=repo_name, description=description)
 
-    if response.status_code == 201:
-        return response.json()
-    else:
-        raise AlreadyExistsError(resource_type="Repositório", resource_identifier=repo_name)
 
+def upload_file_in_repo(repo_name, filename, content, path_in_repo):
+    return github_service().upload_file(
+        repo_name=repo_name,
+        path=path_in_repo,
+        content=content,
+        message=f"Add {filename} via script"
+    )
 
-def upload_file_in_repo(repo_name, file, path_in_repo):
-    files = {
-        "file": (file.filename, file, "application/octet-stream")
-    }
-    data = {
-        "path": path_in_repo,
-        "message": f"Add {file.filename} via script"             # Opcional
-    }
 
-    api_url_post = f'{API_URL}/repositories/{repo_name}/files'
-    res = requests.post(api_url_post, headers=HEADERS, files=files, data=data)
+def requirement_file(group_id, group_name, id, requirement):
+    path_in_repo = requirement_path(group_id, group_name, id,
+                                    requirement.get("requirementDescription"))
+    content = json.dumps(requirement.get("conclusion"))
+    return path_in_repo, content
 
-    if res.status_code == 201:
-        return res.json()
-    else:
-        raise GithubError(f"Erro ao criar repositório: {res.status_code} - {res.text}", 500)
 
+def create_requirement_files(repo_name, files):
+    return github_service().upload_files(
+        repo_name=repo_name,
+        files=dict(files),
+        message=f"Add {len(files)} conclusion.json files via script"
+    )
 
-def create_requirement_file(repo_name, group_id, group_name, id, requirement):
-    path_in_repo = f'{group_id} - {group_name}/{str(id).zfill(2)} - {requirement.get("requirementDescription")}/conclusion.json'
-    content = json.dumps(requirement.get("conclusion")).encode('utf-8')
-    files = {
-        "file": ('conclusion.json', content, "application/json")
-    }
-    data = {
-        "path": path_in_repo,
-        "message": f"Add conclusion.json for requirement {id} via script" 
-    }
 
-    api_url_post = f'{API_URL}/repositories/{repo_name}/files'
-    res = requests.post(api_url_post, headers=HEADERS, files=files, data=data)
+def requirement_files(data):
+    # 1. Cria um dicionário para busca rápida: {id: nome}
+    # Isso transforma uma busca lenta (O(n)) em uma busca instantânea (O(1))
+    grupos_map = {g.get('groupId'): g.get('groupName') for g in data.get('groups', [])}
+    requirements = data.get('requirements', [])
+
+    files = []
+    for req in requirements:
+        req_id = req.get("requirementId")
+        group_id = req.get("groupId")
+
+        # Busca o nome no mapa. Se não existir, retorna "Não encontrado" (ou None)
+        group_name = grupos_map.get(group_id, "Grupo não encontrado")
+
+        files.append(requirement_file(group_id, group_name, req_id, req))
+
+    return files
+
+
+def class_files(content, data):
+    # Todos os arquivos da classe: requirements.json e um conclusion.json por requisito
+    files = dict(requirement_files(data))
+    files['requirements.json'] = content
+    return files
+
+
+def run_step(progress, step, done_flag, action):
+    """
+    Executa uma etapa que cria algo no GitHub uma única vez. Se o job caiu
+    durante a etapa, o recurso pode já ter sido criado por ele: nesse caso o
+    AlreadyExistsError não é um erro.
+    """
+    if progress.get(done_flag):
+        return
+    resumed = progress.get("step") == step
+    progress.update(step=step)
+    try:
+        action()
+    except AlreadyExistsError:
+        if not resumed:
+            raise
+    progress.update(**{done_flag: True})
+
+
+def write_requirements(repo_name, files, progress):
+    # Envia os arquivos em lotes, um commit por lote
+    next_index = progress.get("next_index", 0)
+    progress.update(step="writing_requirements", files_total=len(files))
+
+    for start in range(next_index, len(files), UPLOAD_BATCH_SIZE):
+        batch = files[start:start + UPLOAD_BATCH_SIZE]
+        try:
+            result = create_requirement_files(repo_name, batch)
+            written = progress.get("files_written", 0) + len(result.files)
+            progress.update(files_written=written)
+            for path, message in result.failures.items():
+                progress.append("failures", {"paths": [path], "message": message})
+        except GithubError as e:
+            paths = [path for path, _ in batch]
+            progress.append("failures", {"paths": paths, "message": e.message})
+        progress.update(next_index=start + len(batch))
+
+
+def upload_class(job, progress):
+    """
+    Cria o repositório da classe e envia os arquivos em etapas, registrando o
+    progresso de cada uma para que um job interrompido continue de onde parou.
+    """
+    content = job.payload["content"]
+    data = json.loads(content)
+
+    info = data.get('info')
+    repo_name = info.get('name')
+    repo_description = info.get('description', '')
+
+    run_step(progress, "creating_repo", "repo_created",
+             lambda: create_github_repo(repo_name, repo_description))
+    run_step(progress, "uploading_requirements", "requirements_uploaded",
+             lambda: upload_file_in_repo(repo_name, 'requirements.json',
+                                         content.encode('utf-8'), 'requirements.json'))
+
+    write_requirements(repo_name, requirement_files(data), progress)
+    progress.update(step="done")
+
+
+job_runner.register("upload_class", upload_class)
+
+
+# Arquivos de requisito que a sincronização pode remover quando saem da classe
+REQUIREMENT_PATTERNS = ["*/*/conclusion.json"]
+
+
+def sync_class(job, progress):
+    """
+    Sincroniza uma classe já enviada: compara os arquivos gerados com a árvore
+    do repositório e faz um único commit só com o que foi adicionado, alterado
+    ou removido. Se nada mudou, não há commit. Cria o repositório se preciso.
+    """
+    content = job.payload["content"]
+    data = json.loads(content)
+
+    info = data.get('info')
+    repo_name = info.get('name')
+
+    files = class_files(content, data)
+
+    progress.update(step="syncing", files_total=len(files))
+    service = github_service()
+    message = f"Sync {repo_name} from requirements.json"
+
+    try:
+        result = service.sync_files(repo_name, files, message=message,
+                                    prune=REQUIREMENT_PATTERNS)
+    except GithubError as e:
+        if e.status_code != 404:
+            raise
+        # Primeira sincronização: o repositório ainda não existe
+        progress.update(step="creating_repo")
+        service.create_repo(name=repo_name, description=info.get('description', ''))
+        progress.update(step="syncing")
+        result = service.sync_files(repo_name, files, message=message,
+                                    prune=REQUIREMENT_PATTERNS)
+
+    for path, failure in result.failures.items():
+        progress.append("failures", {"paths": [path], "message": failure})
+
+    progress.update(
+        step="done",
+        commit=result.sha,
+        added=len(result.added),
+        changed=len(result.changed),
+        deleted=len(result.deleted),
+        unchanged=result.unchanged
+    )
+
+
+job_runner.register("sync_class", sync_class)
+
+
+def provision_classes(job, progress):
+    """
+    Cria várias classes de uma vez a partir do repositório template: os
+    repositórios são criados em paralelo e cada um recebe seus arquivos em um
+    único commit. O resultado de cada classe fica no progresso do job.
+    """
+    repos = []
+    for content in job.payload["contents"]:
+        data = json.loads(content)
+        info = data.get('info')
+        files = class_files(content, data)
+        repos.append((info.get('name'), info.get('description', ''), files))
+
+    progress.update(step="provisioning", repos_total=len(repos))
+    results = github_service().provision_repos(
+        template=job.payload["template"],
+        repos=repos,
+        message="Add class files via script"
+    )
+
+    progress.update(
+        step="done",
+        repositories=[
+            {"name": r.name, "created": r.created, "html_url": r.html_url,
+             "error": r.error}
+            for r in results
+        ]
+    )
+    for r in results:
+        if r.error:
+            progress.append("failures", {"paths": [r.name], "message": r.error})
+        for path, message in r.failures.items():
+            progress.append("failures", {"paths": [f"{r.name}/{path}"],
+                                         "message": message})
+
+
+job_runner.register("provision_classes", provision_classes)
+
+
+def uploaded_class(file):
+    if not file or file.filename == '':
+        raise BadRequestError("Nenhum arquivo foi enviado na requisição.")
+
+    # Validado antes de qualquer chamada ao GitHub; o job recebe só o texto
+    return read_class_file(file.stream)
+
+
+def job_accepted(job):
+    return jsonify({
+        "job_id": job.id,
+        "status_url": url_for('upload_status', job_id=job.id)
+    }), 202
 
-    if res.status_code == 201:
-        return res.json()
-    else:
-        raise GithubError(f"Erro ao criar repositório: {res.status_code} - {res.text}", 500)
 
 @app.route("/upload", methods=["POST", "GET"])
 def upload_file():
@@ -112,39 +324,51 @@ def upload_file():
         if 'file' not in request.files:
             raise BadRequestError("Nenhum arquivo foi enviado na requisição.")
         
-        file = request.files['file']
+        content, _ = uploaded_class(request.files['file'])
 
-        if not file or file.filename == '':
-            raise BadRequestError("Nenhum arquivo foi enviado na requisição.")
-
-        try:
-            content = file.read()
-            data = json.loads(content.decode("utf-8"))
-            file.seek(0)
+        # Em modo "sync" só o que mudou em relação ao repositório é commitado
+        mode = request.form.get('mode', 'create')
+        if mode not in ("create", "sync"):
+            raise BadRequestError("O modo deve ser 'create' ou 'sync'.")
 
+        # O trabalho com o GitHub roda em segundo plano; a página acompanha
+        # pelo status do job
+        kind = "sync_class" if mode == "sync" else "upload_class"
+        job = job_runner.submit(kind, {"content": content})
 
-            info = data.get('info')
-            repo_name = info.get('name')
-            repo_description = info.get('description', '')
-            create_github_repo(repo_name, repo_description)
-            upload_file_in_repo(repo_name, file, 'requirements.json')
+        if request.accept_mimetypes.best == "application/json":
+            return job_accepted(job)
 
+    return redirect(url_for('index'))
 
-            # 1. Cria um dicionário para busca rápida: {id: nome}
-            # Isso transforma uma busca lenta (O(n)) em uma busca instantânea (O(1))
-            grupos_map = {g.get('groupId'): g.get('groupName') for g in data.get('groups', [])}
-            requirements = data.get('requirements', [])
-
-            # for req in requirements:
-            #     req_id = req.get("requirementId")
-            #     group_id = req.get("groupId")
-                
-            #     # Busca o nome no mapa. Se não existir, retorna "Não encontrado" (ou None)
-            #     group_name = grupos_map.get(group_id, "Grupo não encontrado")
-                
-            #     create_requirement_file(repo_name, group_id, group_name, req_id, req)
-
-        except json.JSONDecodeError as e:
-            raise BadRequestError("O arquivo enviado não é um JSON válido. Erro: " + str(e))
 
-    return redirect(url_for('index'))
+@app.route("/upload/provision", methods=["POST"])
+def provision_upload():
+    """Várias classes (campo 'file' repetido) criadas a partir do template."""
+    template = request.form.get('template') or CLASS_TEMPLATE_REPO
+    if not template:
+        raise BadRequestError("Informe o repositório template "
+                              "('template' ou CLASS_TEMPLATE_REPO).")
+
+    classes = [uploaded_class(file) for file in request.files.getlist('file')]
+    if not classes:
+        raise BadRequestError("Nenhum arquivo foi enviado na requisição.")
+
+    contents = [content for content, _ in classes]
+    names = [data['info']['name'] for _, data in classes]
+    if len(set(names)) != len(names):
+        raise BadRequestError("Cada classe deve ter um 'info.name' diferente.")
+
+    job = job_runner.submit("provision_classes",
+                            {"contents": contents, "template": template})
+    return job_accepted(job)
+
+
+@app.route("/upload/jobs/<string:job_id>", methods=["GET"])
+def upload_status(job_id: str):
+    job = job_runner.store.get(job_id)
+    if job is None:
+        raise NotFoundError(resource_type="Job", resource_identifier=job_id)
+    # Quem acompanha o job também o retoma se o processo que o executava morreu
+    job_runner.reclaim(job)
+    return jsonify(job.to_dict()), 200
@@ -1,9 +1,72 @@
 const form = document.getElementById("form");
 const statusMsg = document.getElementById("statusMessage");
 
-form.addEventListener("submit", (e) => {
-  statusMsg.textContent =
-    "Arquivo enviado com sucesso! Esperando processamento...";
-  statusMsg.classList.remove("d-none", "alert-danger");
-  statusMsg.classList.add("alert-success");
+const POLL_INTERVAL_MS = 1000;
+
+const STEPS = {
+  creating_repo: "Criando repositório...",
+  uploading_requirements: "Enviando requirements.json...",
+  writing_requirements: "Criando arquivos dos requisitos...",
+  syncing: "Comparando com o repositório...",
+  done: "Concluído!",
+};
+
+function showStatus(text, type) {
+  statusMsg.textContent = text;
+  statusMsg.classList.remove("d-none", "alert-danger", "alert-success", "alert-info");
+  statusMsg.classList.add(`alert-${type}`);
+}
+
+function describe(job) {
+  const progress = job.progress || {};
+  let text = STEPS[progress.step] || "Na fila de processamento...";
+
+  if (progress.unchanged !== undefined) {
+    text += progress.commit
+      ? ` ${progress.added} adicionado(s), ${progress.changed} alterado(s), ${progress.deleted} removido(s).`
+      : " Nenhuma alteração: o repositório já estava atualizado.";
+  } else if (progress.files_total !== undefined && progress.step !== "syncing") {
+    text += ` ${progress.files_written || 0} de ${progress.files_total} arquivos criados.`;
+  }
+  if (progress.failures && progress.failures.length) {
+    text += ` ${progress.failures.length} arquivo(s) falharam.`;
+  }
+  return text;
+}
+
+async function poll(statusUrl) {
+  const response = await fetch(statusUrl, { headers: { Accept: "application/json" } });
+  const job = await response.json();
+
+  if (job.status === "failed") {
+    showStatus(`Falha no processamento: ${job.error}`, "danger");
+    return;
+  }
+  if (job.status === "done") {
+    const failed = job.progress.failures && job.progress.failures.length;
+    showStatus(describe(job), failed ? "danger" : "success");
+    return;
+  }
+
+  showStatus(describe(job), "info");
+  setTimeout(() => poll(statusUrl), POLL_INTERVAL_MS);
+}
+
+form.addEventListener("submit", async (e) => {
+  e.preventDefault();
+  showStatus("Arquivo enviado com sucesso! Esperando processamento...", "success");
+
+  const response = await fetch(form.action, {
+    method: "POST",
+    body: new FormData(form),
+    headers: { Accept: "application/json" },
+  });
+  const data = await response.json();
+
+  if (!response.ok) {
+    const details = data.errors ? ` ${data.errors.join("; ")}` : "";
+    showStatus((data.message || "Erro ao enviar o arquivo.") + details, "danger");
+    return;
+  }
+  poll(data.status_url);
 });
@@ -1 +1,71 @@
+const progressStatus = document.getElementById("progress-status");
+const progressList = document.getElementById("progress-list");
 
+function percent(concluded, total) {
+  return total ? Math.round((concluded / total) * 100) : 0;
+}
+
+function progressBar(concluded, total) {
+  const value = percent(concluded, total);
+  return `
+    <div class="progress" role="progressbar" aria-valuenow="${value}" aria-valuemin="0" aria-valuemax="100">
+      <div class="progress-bar" style="width: ${value}%">${value}%</div>
+    </div>`;
+}
+
+function escapeHtml(text) {
+  const div = document.createElement("div");
+  div.textContent = text ?? "";
+  return div.innerHTML;
+}
+
+function classRows(item) {
+  const rows = [`
+    <tr class="table-light">
+      <th>${escapeHtml(item.name || item.repository_name)}</th>
+      <td>${item.concluded} de ${item.total}</td>
+      <td class="w-50">${progressBar(item.concluded, item.total)}</td>
+    </tr>`];
+
+  for (const group of item.groups) {
+    rows.push(`
+      <tr class="progress-group">
+        <td>${escapeHtml(group.group_name || group.group_id)}</td>
+        <td>${group.concluded} de ${group.total}</td>
+        <td>${progressBar(group.concluded, group.total)}</td>
+      </tr>`);
+  }
+  return rows.join("");
+}
+
+function renderProgress(dashboard) {
+  const errors = Object.entries(dashboard.errors || {});
+
+  if (!dashboard.classes.length) {
+    progressStatus.textContent = "Nenhuma classe encontrada.";
+  } else {
+    progressStatus.textContent =
+      `${dashboard.classes.length} classe(s): ${dashboard.concluded} de ${dashboard.total} ` +
+      `requisitos concluídos (${percent(dashboard.concluded, dashboard.total)}%).`;
+  }
+
+  progressList.innerHTML = `
+    <table class="table table-sm align-middle">
+      <tbody>${dashboard.classes.map(classRows).join("")}</tbody>
+    </table>
+    ${errors.map(([name, message]) =>
+      `<div class="alert alert-danger py-1">${escapeHtml(name)}: ${escapeHtml(message)}</div>`).join("")}`;
+}
+
+async function loadProgress() {
+  const response = await fetch("/progress", { headers: { Accept: "application/json" } });
+  const data = await response.json();
+
+  if (!response.ok) {
+    progressStatus.textContent = data.message || "Erro ao carregar o progresso das classes.";
+    return;
+  }
+  renderProgress(data);
+}
+
+loadProgress();
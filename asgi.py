@@ -0,0 +1,7 @@
+from main import app
+from api.src.asgi import AsyncApp
+
+# Ponto de entrada ASGI: as leituras de /api/repositories rodam no event loop
+# e as demais rotas na aplicação WSGI (pip install -r requirements-async.txt)
+#   uvicorn asgi:application --port 3000
+application = AsyncApp(app)
@@ -0,0 +1 @@
+from .pipeline import Asset, AssetPipeline, RenderedPage, send_asset, hashed_name
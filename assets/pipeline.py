@@ -0,0 +1,159 @@
+"""
+Arquivos estáticos servidos da memória: cada arquivo ganha um nome com o hash
+do conteúdo (style.3f2a9c1b7d04.css) e variantes gzip e brotli, geradas uma
+única vez na inicialização. A URL com hash nunca muda de conteúdo, então vai
+com `Cache-Control: immutable`; a URL sem hash continua válida, revalidada
+pelo ETag.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Union
+
+from flask import Blueprint, Flask, Response, abort, request, url_for
+
+try:
+    import brotli
+except ImportError:  # Opcional: sem o pacote, só gzip
+    brotli = None
+
+# Abaixo disso a compressão não compensa o cabeçalho extra
+MIN_COMPRESS_SIZE = 512
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+
+@dataclass(frozen=True)
+class Asset:
+    data: bytes
+    mimetype: str
+    digest: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def from_bytes(data: bytes, mimetype: str):
+        """
+        Conteúdo com o hash e as variantes comprimidas que ficarem menores que
+        o original.
+        """
+        encoded = {}
+        if len(data) >= MIN_COMPRESS_SIZE and mimetype.startswith(COMPRESSIBLE):
+            if brotli is not None:
+                encoded["br"] = brotli.compress(data, quality=11)
+            # mtime fixo: o mesmo conteúdo gera sempre os mesmos bytes
+            encoded["gzip"] = gzip.compress(data, compresslevel=9, mtime=0)
+        return Asset(
+            data,
+            mimetype,
+            hashlib.sha256(data).hexdigest()[:12],
+            {encoding: body for encoding, body in encoded.items()
+             if len(body) < len(data)}
+        )
+
+
+def hashed_name(filename: str, digest: str) -> str:
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{digest}{ext}"
+
+
+def _guess_type(filename: str) -> str:
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def send_asset(asset: Asset, cache_control: str = REVALIDATE) -> Response:
+    """
+    Resposta com a melhor codificação aceita pelo cliente (brotli, gzip ou
+    nenhuma). Cada codificação tem o seu ETag forte, e um If-None-Match que
+    casa devolve 304 sem corpo.
+    """
+    encoding = None
+    for candidate in ("br", "gzip"):
+        if candidate in asset.encoded and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+
+    body = asset.encoded[encoding] if encoding else asset.data
+    response = Response(body, mimetype=asset.mimetype)
+    response.set_etag(f"{asset.digest}-{encoding}" if encoding else asset.digest)
+    response.headers["Cache-Control"] = cache_control
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.content_encoding = encoding
+    return response.make_conditional(request)
+
+
+class AssetPipeline:
+    """
+    Arquivos de uma pasta estática, lidos e comprimidos na criação. A rota
+    registrada em `register` atende o nome com hash e o original; `url` monta
+    a URL com hash para os templates.
+    """
+
+    def __init__(self, folder: str, endpoint: str = "static") -> None:
+        self._folder = folder
+        self._endpoint = endpoint
+        self._url_endpoint = endpoint
+        self._assets: Dict[str, Asset] = {}
+        self._hashed: Dict[str, str] = {}
+
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, folder).replace(os.sep, "/")
+                with open(path, "rb") as file:
+                    asset = Asset.from_bytes(file.read(), _guess_type(filename))
+                self._assets[filename] = asset
+                self._hashed[hashed_name(filename, asset.digest)] = filename
+
+    def register(self, app_or_blueprint: Union[Flask, Blueprint],
+                 url_path: str = "/static") -> None:
+        """Rota `<url_path>/<arquivo>` com o nome de endpoint da pipeline."""
+        app_or_blueprint.add_url_rule(f"{url_path}/<path:filename>", self._endpoint,
+                                      self.send)
+        if isinstance(app_or_blueprint, Blueprint):
+            self._url_endpoint = f"{app_or_blueprint.name}.{self._endpoint}"
+
+    def url(self, filename: str) -> str:
+        """
+        URL do arquivo com o hash do conteúdo; arquivos desconhecidos ficam com
+        o nome original.
+        """
+        asset = self._assets.get(filename)
+        if asset is not None:
+            filename = hashed_name(filename, asset.digest)
+        return url_for(self._url_endpoint, filename=filename)
+
+    def send(self, filename: str) -> Response:
+        original = self._hashed.get(filename)
+        if original is not None:
+            return send_asset(self._assets[original], IMMUTABLE)
+
+        asset = self._assets.get(filename)
+        if asset is None:
+            abort(404)
+        return send_asset(asset, REVALIDATE)
+
+
+class RenderedPage:
+    """
+    Página estática renderizada pelo Jinja só no primeiro acesso e depois
+    servida da memória, já comprimida.
+    """
+
+    def __init__(self, render: Callable[[], str]) -> None:
+        self._render = render
+        self._asset: Optional[Asset] = None
+        self._lock = threading.Lock()
+
+    def send(self) -> Response:
+        if self._asset is None:
+            with self._lock:
+                if self._asset is None:
+                    html = self._render().encode("utf-8")
+                    self._asset = Asset.from_bytes(html, "text/html")
+        return send_asset(self._asset, REVALIDATE)
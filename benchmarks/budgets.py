@@ -0,0 +1,27 @@
+# Máximo de chamadas à API do GitHub por requisição, com o cliente do token já
+# no pool. Uma mudança que acrescente idas ao GitHub faz o benchmark falhar.
+CALL_BUDGETS = {
+    "list_repos": 1,
+    "get_repo": 1,
+    "create_repo": 1,
+    "provision_repo": 7,
+    "update_repo": 2,
+    "delete_repo": 2,
+    "list_files": 2,
+    "get_file": 2,
+    "class_requirements": 2,
+    "dashboard": 4,  # primeira vez; depois só listagem e commits (2)
+    "download_file": 3,
+    "upload_file": 2,
+    "update_file": 3,
+    "update_file_if_match": 2,
+    "delete_file": 3,
+    "delete_prefix": 7,
+    "upload_batch": 6,
+    "sync_unchanged": 2,
+    "mirror_refresh": 5,  # primeira vez; depois só repositório e branch (2)
+    "mirror_requirements": 0,
+    "ratelimit": 0,
+    "docs": 0,
+    "upload_class": 9,
+}
@@ -0,0 +1,828 @@
+"""
+Servidor local que imita o subconjunto da API REST do GitHub usado pelo
+GithubController. Mantém os repositórios em memória, conta as chamadas
+recebidas por endpoint e pode simular a latência de cada chamada.
+"""
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+OWNER = "tester"
+
+
+def git_sha(kind: str, data: bytes) -> str:
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode() + data).hexdigest()
+
+
+class FakeRepo:
+    def __init__(
+        self, repo_id: int, name: str, description: str = "", private: bool = False
+    ):
+        self.id = repo_id
+        self.name = name
+        self.description = description
+        self.private = private
+        self.is_template = False
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, List[dict]] = {}
+        self.commits: Dict[str, dict] = {}
+        self.refs: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    # --- objetos git ---------------------------------------------------
+
+    def put_blob(self, data: bytes) -> str:
+        sha = git_sha("blob", data)
+        self.blobs[sha] = data
+        return sha
+
+    def put_tree(self, entries: List[dict]) -> str:
+        entries = sorted(entries, key=lambda e: e["path"])
+        sha = git_sha("tree", json.dumps(entries, sort_keys=True).encode())
+        self.trees[sha] = entries
+        return sha
+
+    def put_commit(self, tree: str, parents: List[str], message: str) -> str:
+        body = json.dumps(
+            {"tree": tree, "parents": parents, "message": message, "t": time.time()}
+        )
+        sha = git_sha("commit", body.encode())
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def flatten(self, tree_sha: str, prefix: str = "") -> Dict[str, dict]:
+        """Mapeia caminho completo -> entrada (somente blobs)."""
+        files = {}
+        for entry in self.trees[tree_sha]:
+            path = prefix + entry["path"]
+            if entry["type"] == "tree":
+                files.update(self.flatten(entry["sha"], path + "/"))
+            else:
+                files[path] = entry
+        return files
+
+    def build(self, files: Dict[str, dict]) -> str:
+        """Constrói as árvores aninhadas a partir de {caminho: entrada blob}."""
+        children: Dict[str, dict] = {}
+        for path, entry in files.items():
+            head, _, rest = path.partition("/")
+            if rest:
+                children.setdefault(head, {})[rest] = entry
+            else:
+                children[head] = entry
+        entries = []
+        for name, value in children.items():
+            if value.get("type") == "blob" and isinstance(value.get("sha"), str):
+                entries.append(
+                    {
+                        "path": name,
+                        "mode": value["mode"],
+                        "type": "blob",
+                        "sha": value["sha"],
+                    }
+                )
+            else:
+                entries.append(
+                    {
+                        "path": name,
+                        "mode": "040000",
+                        "type": "tree",
+                        "sha": self.build(value),
+                    }
+                )
+        return self.put_tree(entries)
+
+    def head_files(self, ref: str) -> Dict[str, dict]:
+        sha = self.resolve(ref)
+        return self.flatten(self.commits[sha]["tree"])
+
+    def resolve(self, ref: str) -> Optional[str]:
+        if ref in self.refs:
+            return self.refs[ref]
+        if ref in self.commits:
+            return ref
+        return None
+
+    def commit_files(self, branch: str, files: Dict[str, dict], message: str) -> str:
+        parent = self.refs.get(branch)
+        tree = self.build(files)
+        sha = self.put_commit(tree, [parent] if parent else [], message)
+        self.refs[branch] = sha
+        return sha
+
+
+class FakeGithub:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.repos: Dict[str, FakeRepo] = {}
+        self.calls: Counter = Counter()
+        self.lock = threading.Lock()
+        self.next_id = 1
+        self.bad_tokens = {"bad-token"}
+        self.remaining = 5000
+        self.reset_in = 3600
+        self.reject_next = 0
+        self.fail_next = 0
+        self.retry_after = 1
+        self.truncate_at: Optional[int] = None
+
+    def create_repo(
+        self,
+        name: str,
+        description: str = "",
+        auto_init: bool = True,
+        private: bool = False,
+    ) -> FakeRepo:
+        with self.lock:
+            repo = FakeRepo(self.next_id, name, description, private)
+            self.next_id += 1
+            self.repos[name] = repo
+        if auto_init:
+            sha = repo.put_blob(f"# {name}\n".encode())
+            repo.commit_files(
+                "main",
+                {"README.md": {"mode": "100644", "type": "blob", "sha": sha}},
+                "Initial commit",
+            )
+        return repo
+
+    def reset_calls(self) -> None:
+        with self.lock:
+            self.calls.clear()
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+def _route_key(verb: str, path: str) -> str:
+    path = re.sub(r"^/repos/[^/]+/[^/]+", "/repos/{owner}/{repo}", path)
+    path = re.sub(r"/contents/.*$", "/contents/{path}", path)
+    path = re.sub(r"/git/(blobs|trees|commits)/[^/]+$", r"/git/\1/{sha}", path)
+    path = re.sub(r"/git/refs?/heads/.*$", "/git/ref/{ref}", path)
+    path = re.sub(r"/branches/.*$", "/branches/{branch}", path)
+    return f"{verb} {path}"
+
+
+def _unused_variables(query: str) -> List[str]:
+    """Variáveis declaradas na consulta e não usadas (o GitHub recusa a consulta)."""
+    declarations, _, body = query.partition(")")
+    declared = re.findall(r"\$(\w+):", declarations)
+    used = set(re.findall(r"\$(\w+)", body))
+    return [name for name in declared if name not in used]
+
+
+# Rotas fora de /repos/{dono}/{nome}: (verbo, padrão do caminho, método)
+ROUTES = [
+    ("GET", r"/user", "get_user"),
+    ("GET", r"/user/repos", "list_repos"),
+    ("POST", r"/user/repos", "create_repo"),
+    ("POST", r"/graphql", "post_graphql"),
+    ("GET", r"/raw/[^/]+/(?P<name>[^/]+)/(?P<ref>[^/]+)/(?P<file_path>.+)", "get_raw"),
+]
+
+# Rotas de um repositório, casadas com o resto do caminho depois de /repos/{dono}/{nome}
+REPO_ROUTES = [
+    ("GET", r"", "get_repo"),
+    ("PATCH", r"", "update_repo"),
+    ("DELETE", r"", "delete_repo"),
+    ("POST", r"/generate", "generate_repo"),
+    ("GET", r"/branches/(?P<branch>.+)", "get_branch"),
+    ("GET", r"/contents(?:/(?P<path>.*))?", "get_contents"),
+    ("PUT", r"/contents(?:/(?P<path>.*))?", "put_contents"),
+    ("DELETE", r"/contents(?:/(?P<path>.*))?", "delete_contents"),
+    ("GET", r"/git/refs?/(?P<ref>heads/(?P<branch>.+))", "get_ref"),
+    ("PATCH", r"/git/refs?/(?P<ref>heads/(?P<branch>.+))", "update_ref"),
+    ("POST", r"/git/blobs", "create_blob"),
+    ("GET", r"/git/blobs/(?P<sha>[^/]+)", "get_blob"),
+    ("POST", r"/git/trees", "create_tree"),
+    ("GET", r"/git/trees/(?P<ref>.+)", "get_tree"),
+    ("POST", r"/git/commits", "create_commit"),
+    ("GET", r"/git/commits/(?P<sha>[^/]+)", "get_commit"),
+]
+
+
+def _match(routes: list, verb: str, path: str):
+    for route_verb, pattern, name in routes:
+        if route_verb == verb:
+            match = re.fullmatch(pattern, path)
+            if match:
+                return name, {
+                    key: value or "" for key, value in match.groupdict().items()
+                }
+    return None, {}
+
+
+class FakeGithubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+    state: FakeGithub
+
+    def log_message(self, *args):
+        pass
+
+    # --- utilitários ----------------------------------------------
+
+    @property
+    def base(self) -> str:
+        return f"http://{self.headers.get('Host')}"
+
+    def body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            data = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                data += self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            data = self.rfile.read(length) if length else b""
+        return json.loads(data) if data else {}
+
+    def send(
+        self,
+        status: int,
+        payload=None,
+        headers: Optional[dict] = None,
+        raw: Optional[bytes] = None,
+    ):
+        data = (
+            raw
+            if raw is not None
+            else (b"" if payload is None else json.dumps(payload).encode())
+        )
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        if (
+            status == 200
+            and self.command == "GET"
+            and self.headers.get("If-None-Match") == etag
+        ):
+            status, data = 304, b""
+        self.send_response(status)
+        self.send_header(
+            "Content-Type",
+            "application/octet-stream" if raw is not None else "application/json",
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", str(self.state.remaining))
+        self.send_header(
+            "X-RateLimit-Reset", str(int(time.time()) + self.state.reset_in)
+        )
+        self.send_header("X-RateLimit-Resource", "core")
+        if self.command == "GET" and status in (200, 304):
+            self.send_header("ETag", etag)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def not_found(self):
+        self.send(404, {"message": "Not Found", "status": "404"})
+
+    def repo_json(self, repo: FakeRepo) -> dict:
+        url = f"{self.base}/repos/{OWNER}/{repo.name}"
+        return {
+            "id": repo.id,
+            "name": repo.name,
+            "full_name": f"{OWNER}/{repo.name}",
+            "description": repo.description,
+            "private": repo.private,
+            "html_url": f"https://github.com/{OWNER}/{repo.name}",
+            "url": url,
+            "default_branch": "main",
+            "owner": {"login": OWNER},
+            "is_template": repo.is_template,
+        }
+
+    def content_json(
+        self,
+        repo: FakeRepo,
+        path: str,
+        entry: dict,
+        ref: str,
+        with_content: bool = True,
+    ) -> dict:
+        url = f"{self.base}/repos/{OWNER}/{repo.name}/contents/{path}?ref={ref}"
+        data = {
+            "type": "file" if entry["type"] == "blob" else "dir",
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "sha": entry["sha"],
+            "size": len(repo.blobs.get(entry["sha"], b"")),
+            "url": url,
+            "html_url": f"https://github.com/{OWNER}/{repo.name}/blob/{ref}/{path}",
+            "git_url": f"{self.repo_url(repo)}/git/blobs/{entry['sha']}",
+            "download_url": (
+                f"{self.base}/raw/{OWNER}/{repo.name}/{ref}/{path}"
+                if entry["type"] == "blob"
+                else None
+            ),
+        }
+        if with_content and entry["type"] == "blob":
+            data["encoding"] = "base64"
+            data["content"] = base64.b64encode(repo.blobs[entry["sha"]]).decode()
+        return data
+
+    def commit_json(self, repo: FakeRepo, sha: str) -> dict:
+        commit = repo.commits[sha]
+        base = f"{self.base}/repos/{OWNER}/{repo.name}"
+        return {
+            "sha": sha,
+            "url": f"{base}/git/commits/{sha}",
+            "message": commit["message"],
+            "html_url": f"https://github.com/{OWNER}/{repo.name}/commit/{sha}",
+            "tree": {
+                "sha": commit["tree"],
+                "url": f"{base}/git/trees/{commit['tree']}",
+            },
+            "parents": [
+                {"sha": p, "url": f"{base}/git/commits/{p}"} for p in commit["parents"]
+            ],
+        }
+
+    # --- despacho -------------------------------------------------
+
+    def handle_any(self):
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        refusal = self.count_call(parsed.path)
+        if refusal is not None:
+            self.body()
+        if refusal == 403:
+            return self.send(
+                403,
+                {
+                    "message": "You have exceeded a secondary rate limit",
+                    "status": "403",
+                },
+                headers={"Retry-After": str(self.state.retry_after)},
+            )
+        if refusal == 502:
+            return self.send(502, {"message": "Server Error", "status": "502"})
+
+        auth = self.headers.get("Authorization", "")
+        if not path.startswith("/raw/") and (
+            not auth or auth.split()[-1] in self.state.bad_tokens
+        ):
+            return self.send(401, {"message": "Bad credentials", "status": "401"})
+
+        try:
+            return self.dispatch(self.command, path, query)
+        except KeyError:
+            return self.not_found()
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_any
+
+    def count_call(self, raw_path: str) -> Optional[int]:
+        """
+        Conta a chamada, gasta o saldo e espera a latência.
+        :return: Status da recusa (403 por limite, 502 por falha do servidor)
+                 ou None se a chamada deve ser atendida
+        """
+        state = self.state
+        refusal = None
+        with state.lock:
+            state.calls[_route_key(self.command, raw_path)] += 1
+            if state.remaining > 0:
+                state.remaining -= 1
+            if state.reject_next > 0:
+                state.reject_next -= 1
+                refusal = 403
+            elif state.fail_next > 0:
+                state.fail_next -= 1
+                refusal = 502
+        if state.latency:
+            time.sleep(state.latency)
+        return refusal
+
+    def dispatch(self, verb: str, path: str, query: dict):
+        match = re.match(r"^/repos/([^/]+)/([^/]+)(/.*)?$", path)
+        if match:
+            repo = self.state.repos[match.group(2)]
+            name, params = _match(REPO_ROUTES, verb, match.group(3) or "")
+            if name is None:
+                return self.not_found()
+            with repo.lock:
+                return getattr(self, name)(repo, query, **params)
+
+        name, params = _match(ROUTES, verb, path)
+        if name is None:
+            return self.not_found()
+        return getattr(self, name)(query, **params)
+
+    # --- usuário, graphql e arquivos brutos -----------------------
+
+    def get_user(self, query: dict):
+        return self.send(
+            200, {"login": OWNER, "id": 1, "url": f"{self.base}/users/{OWNER}"}
+        )
+
+    def list_repos(self, query: dict):
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        repos = sorted(self.state.repos.values(), key=lambda r: r.id)
+        chunk = repos[(page - 1) * per_page: page * per_page]
+        headers = {}
+        if page * per_page < len(repos):
+            next_url = f"{self.base}/user/repos?per_page={per_page}&page={page + 1}"
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return self.send(200, [self.repo_json(r) for r in chunk], headers)
+
+    def create_repo(self, query: dict):
+        data = self.body()
+        if data["name"] in self.state.repos:
+            return self.send(
+                422, {"message": "name already exists on this account", "status": "422"}
+            )
+        repo = self.state.create_repo(
+            data["name"],
+            data.get("description", ""),
+            data.get("auto_init", False),
+            data.get("private", False),
+        )
+        return self.send(201, self.repo_json(repo))
+
+    def post_graphql(self, query: dict):
+        return self.graphql(self.body())
+
+    def get_raw(self, query: dict, name: str, ref: str, file_path: str):
+        repo = self.state.repos[name]
+        entry = repo.head_files(ref)[file_path]
+        return self.send(200, raw=repo.blobs[entry["sha"]])
+
+    # --- repositórios ---------------------------------------------
+
+    def repo_url(self, repo: FakeRepo) -> str:
+        return f"{self.base}/repos/{OWNER}/{repo.name}"
+
+    def get_repo(self, repo: FakeRepo, query: dict):
+        return self.send(200, self.repo_json(repo))
+
+    def update_repo(self, repo: FakeRepo, query: dict):
+        repo.description = self.body().get("description", repo.description)
+        return self.send(200, self.repo_json(repo))
+
+    def delete_repo(self, repo: FakeRepo, query: dict):
+        del self.state.repos[repo.name]
+        return self.send(204)
+
+    def generate_repo(self, repo: FakeRepo, query: dict):
+        data = self.body()
+        if data["name"] in self.state.repos:
+            return self.send(
+                422, {"message": "Name already exists on this account", "status": "422"}
+            )
+        new = self.state.create_repo(
+            data["name"], data.get("description", ""), False, data.get("private", False)
+        )
+        new.blobs.update(repo.blobs)
+        new.commit_files("main", repo.head_files("main"), "Initial commit")
+        return self.send(201, self.repo_json(new))
+
+    def get_branch(self, repo: FakeRepo, query: dict, branch: str):
+        if branch not in repo.refs:
+            return self.send(404, {"message": "Branch not found", "status": "404"})
+        sha = repo.refs[branch]
+        return self.send(
+            200,
+            {
+                "name": branch,
+                "commit": {"sha": sha, "url": f"{self.repo_url(repo)}/commits/{sha}"},
+            },
+        )
+
+    # --- contents -------------------------------------------------
+
+    def get_contents(self, repo: FakeRepo, query: dict, path: str):
+        ref = query.get("ref", "main")
+        if repo.resolve(ref) is None:
+            return self.send(
+                404, {"message": f"No commit found for the ref {ref}", "status": "404"}
+            )
+        files = repo.head_files(ref)
+        if path in files:
+            return self.send(200, self.content_json(repo, path, files[path], ref))
+        prefix = path + "/" if path else ""
+        children = {}
+        for file_path, entry in files.items():
+            if file_path.startswith(prefix):
+                head, _, tail = file_path[len(prefix):].partition("/")
+                children[head] = (
+                    entry
+                    if not tail
+                    else {
+                        "type": "tree",
+                        "sha": git_sha("tree", (prefix + head).encode()),
+                    }
+                )
+        if not children:
+            return self.not_found()
+        return self.send(
+            200,
+            [
+                self.content_json(repo, prefix + name, entry, ref, False)
+                for name, entry in sorted(children.items())
+            ],
+        )
+
+    def branch_files(self, repo: FakeRepo, data: dict):
+        branch = data.get("branch", "main")
+        if branch not in repo.refs:
+            self.send(404, {"message": f"Branch {branch} not found", "status": "404"})
+            return branch, None
+        return branch, repo.head_files(branch)
+
+    def put_contents(self, repo: FakeRepo, query: dict, path: str):
+        data = self.body()
+        branch, files = self.branch_files(repo, data)
+        if files is None:
+            return
+        current = files.get(path)
+        if current and not data.get("sha"):
+            return self.send(
+                422,
+                {
+                    "message": 'Invalid request.\n\n"sha" wasn\'t supplied.',
+                    "status": "422",
+                },
+            )
+        if data.get("sha") and (not current or current["sha"] != data["sha"]):
+            return self.send(
+                409,
+                {"message": f"{path} does not match {data['sha']}", "status": "409"},
+            )
+        sha = repo.put_blob(base64.b64decode(data["content"]))
+        files[path] = {"mode": "100644", "type": "blob", "sha": sha}
+        commit = repo.commit_files(branch, files, data.get("message", ""))
+        return self.send(201 if not current else 200, {
+            "content": self.content_json(repo, path, files[path], branch, False),
+            "commit": self.commit_json(repo, commit),
+        })
+
+    def delete_contents(self, repo: FakeRepo, query: dict, path: str):
+        data = self.body()
+        branch, files = self.branch_files(repo, data)
+        if files is None:
+            return
+        current = files.get(path)
+        if not current:
+            return self.not_found()
+        if data.get("sha") != current["sha"]:
+            return self.send(
+                409,
+                {
+                    "message": f"{path} does not match {data.get('sha')}",
+                    "status": "409",
+                },
+            )
+        del files[path]
+        commit = repo.commit_files(branch, files, data.get("message", ""))
+        return self.send(
+            200, {"content": None, "commit": self.commit_json(repo, commit)}
+        )
+
+    # --- git: refs, blobs, trees e commits ------------------------
+
+    def ref_json(self, repo: FakeRepo, ref: str, sha: str) -> dict:
+        base = self.repo_url(repo)
+        return {
+            "ref": f"refs/{ref}",
+            "url": f"{base}/git/refs/{ref}",
+            "object": {
+                "sha": sha,
+                "type": "commit",
+                "url": f"{base}/git/commits/{sha}",
+            },
+        }
+
+    def get_ref(self, repo: FakeRepo, query: dict, ref: str, branch: str):
+        if branch not in repo.refs:
+            return self.not_found()
+        return self.send(200, self.ref_json(repo, ref, repo.refs[branch]))
+
+    def update_ref(self, repo: FakeRepo, query: dict, ref: str, branch: str):
+        data = self.body()
+        new = data["sha"]
+        current = repo.refs.get(branch)
+        if (
+            not data.get("force")
+            and current
+            and current not in repo.commits[new]["parents"]
+            and current != new
+        ):
+            return self.send(
+                422, {"message": "Update is not a fast forward", "status": "422"}
+            )
+        repo.refs[branch] = new
+        return self.send(200, self.ref_json(repo, ref, new))
+
+    def create_blob(self, repo: FakeRepo, query: dict):
+        data = self.body()
+        raw = (
+            base64.b64decode(data["content"])
+            if data.get("encoding") == "base64"
+            else data["content"].encode()
+        )
+        sha = repo.put_blob(raw)
+        return self.send(
+            201, {"sha": sha, "url": f"{self.repo_url(repo)}/git/blobs/{sha}"}
+        )
+
+    def get_blob(self, repo: FakeRepo, query: dict, sha: str):
+        raw = repo.blobs[sha]
+        byte_range = self.headers.get("Range")
+        if byte_range is not None and not re.fullmatch(r"bytes=\d+-\d*", byte_range):
+            return self.send(416, {"message": "Range Not Satisfiable", "status": "416"})
+        if "raw" in (self.headers.get("Accept") or ""):
+            return self.send(200, raw=raw)
+        return self.send(
+            200,
+            {
+                "sha": sha,
+                "size": len(raw),
+                "encoding": "base64",
+                "content": base64.b64encode(raw).decode(),
+                "url": f"{self.repo_url(repo)}/git/blobs/{sha}",
+            },
+        )
+
+    def create_tree(self, repo: FakeRepo, query: dict):
+        data = self.body()
+        files = repo.flatten(data["base_tree"]) if data.get("base_tree") else {}
+        for entry in data["tree"]:
+            if entry.get("sha", "") is None:
+                files.pop(entry["path"], None)
+                continue
+            sha = entry.get("sha") or repo.put_blob(entry.get("content", "").encode())
+            files[entry["path"]] = {"mode": entry["mode"], "type": "blob", "sha": sha}
+        sha = repo.build(files)
+        return self.send(
+            201,
+            {
+                "sha": sha,
+                "url": f"{self.repo_url(repo)}/git/trees/{sha}",
+                "tree": [],
+                "truncated": False,
+            },
+        )
+
+    def get_tree(self, repo: FakeRepo, query: dict, ref: str):
+        base = self.repo_url(repo)
+        sha = ref if ref in repo.trees else None
+        if sha is None:
+            commit = repo.resolve(ref)
+            if commit is None:
+                return self.not_found()
+            sha = repo.commits[commit]["tree"]
+        entries = []
+        if query.get("recursive"):
+            self._walk(repo, sha, "", entries)
+        else:
+            entries = list(repo.trees[sha])
+        for entry in entries:
+            entry["url"] = f"{base}/git/{entry['type']}s/{entry['sha']}"
+            if entry["type"] == "blob":
+                entry["size"] = len(repo.blobs[entry["sha"]])
+        truncated = self.state.truncate_at
+        if (
+            truncated is not None
+            and query.get("recursive")
+            and len(entries) > truncated
+        ):
+            return self.send(
+                200,
+                {
+                    "sha": sha,
+                    "url": f"{base}/git/trees/{sha}",
+                    "tree": entries[:truncated],
+                    "truncated": True,
+                },
+            )
+        return self.send(
+            200,
+            {
+                "sha": sha,
+                "url": f"{base}/git/trees/{sha}",
+                "tree": entries,
+                "truncated": False,
+            },
+        )
+
+    def create_commit(self, repo: FakeRepo, query: dict):
+        data = self.body()
+        sha = repo.put_commit(data["tree"], data.get("parents", []), data["message"])
+        return self.send(201, self.commit_json(repo, sha))
+
+    def get_commit(self, repo: FakeRepo, query: dict, sha: str):
+        return self.send(200, self.commit_json(repo, sha))
+
+    # --- graphql --------------------------------------------------
+
+    def graphql(self, body: dict):
+        # Só o que a API usa: repository(owner, name), com ou sem alias, e dentro
+        # dele aliases object(expression: $var)
+        query, variables = body["query"], body.get("variables") or {}
+        unused = _unused_variables(query)
+        if unused:
+            return self.send(200, {"errors": [
+                {"message": f"Variable ${name} is declared by anonymous query "
+                            "but not used"}
+                for name in unused
+            ]})
+        pattern = re.compile(r"(?:(\w+): )?repository\(owner: \$\w+, name: \$(\w+)\)")
+        matches = list(pattern.finditer(query))
+        data, errors = {}, []
+        for index, match in enumerate(matches):
+            key = match.group(1) or "repository"
+            body_end = (
+                matches[index + 1].start() if index + 1 < len(matches) else len(query)
+            )
+            name = variables[match.group(2)]
+            repo = self.state.repos.get(name)
+            if repo is None:
+                data[key] = None
+                errors.append(
+                    {
+                        "type": "NOT_FOUND",
+                        "path": [key],
+                        "message": "Could not resolve to a Repository with the "
+                        f"name '{name}'.",
+                    }
+                )
+                continue
+            data[key] = self._graphql_objects(
+                repo, query[match.end() : body_end], variables
+            )
+
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return self.send(200, response)
+
+    def _graphql_objects(self, repo: FakeRepo, fields: str, variables: dict) -> dict:
+        result, trees = {}, {}
+        with repo.lock:
+            for alias, name in re.findall(
+                r"(\w+): object\(expression: \$(\w+)\)", fields
+            ):
+                ref, has_path, file_path = variables[name].partition(":")
+                commit = repo.resolve(ref)
+                if commit is None:
+                    result[alias] = None
+                elif not has_path:
+                    result[alias] = {"oid": commit}
+                else:
+                    if commit not in trees:
+                        trees[commit] = repo.head_files(commit)
+                    entry = trees[commit].get(file_path)
+                    if entry is None:
+                        # Uma pasta não preenche o fragmento "... on Blob"
+                        folder = any(path.startswith(file_path + "/")
+                                     for path in trees[commit])
+                        result[alias] = {} if folder else None
+                        continue
+                    data = repo.blobs[entry["sha"]]
+                    result[alias] = {
+                        "oid": entry["sha"],
+                        "byteSize": len(data),
+                        "text": data.decode("utf-8", "replace"),
+                        "isTruncated": False,
+                    }
+        return result
+
+    def _walk(self, repo: FakeRepo, sha: str, prefix: str, out: List[dict]):
+        for entry in repo.trees[sha]:
+            out.append({**entry, "path": prefix + entry["path"]})
+            if entry["type"] == "tree":
+                self._walk(repo, entry["sha"], prefix + entry["path"] + "/", out)
+
+
+def make_handler(state: FakeGithub):
+    """Classe de handler ligada ao estado do servidor."""
+    return type("Handler", (FakeGithubHandler,), {"state": state})
+
+
+class _Server(ThreadingHTTPServer):
+    # Fila de conexões grande o bastante para rajadas de centenas de clientes
+    request_queue_size = 1024
+
+
+def serve(latency: float = 0.0, port: int = 0):
+    state = FakeGithub(latency)
+    server = _Server(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, state
@@ -0,0 +1,486 @@
+"""
+Benchmark das rotas da API contra um GitHub local (benchmarks/fake_github.py).
+
+Para cada rota de `repos_bp`, para /api/mirror, /api/ratelimit e para o fluxo
+de /upload, mede as chamadas ao GitHub por requisição, a latência (p50/p95/p99)
+e a vazão em vários níveis de concorrência. Termina com código 1 se alguma rota passar
+do orçamento de chamadas definido em benchmarks/budgets.py.
+
+Uso:
+    python -m benchmarks.run [--requests 40] [--concurrency 1,4,16] [--latency 0.03]
+                             [--server asgi]
+"""
+
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from api.src.validation import requirement_path
+from .budgets import CALL_BUDGETS
+from .fake_github import FakeGithub, FakeRepo, serve
+
+TOKEN = "benchmark-token"
+REPO = "bench"
+CLASS_REPO = "classe"
+BLOB_SIZE = 256 * 1024
+EMPTY_JSON_SHA = hashlib.sha1(b"blob 2\0{}").hexdigest()  # arquivos de prepare_files
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[requests.Session, str, int], requests.Response]
+    prepare: Optional[Callable[[FakeGithub, Iterable[int]], None]] = None
+    expected: Iterable[int] = (200,)
+
+
+@dataclass
+class Result:
+    scenario: str
+    concurrency: int
+    requests: int
+    calls_per_request: float
+    p50: float
+    p95: float
+    p99: float
+    throughput: float
+    errors: int
+
+
+# --- dados no GitHub local -------------------------------------------------
+
+
+def add_files(
+    repo: FakeRepo, files: Dict[str, bytes], message: str = "benchmark fixtures"
+) -> None:
+    with repo.lock:
+        tree = repo.head_files("main")
+        for path, data in files.items():
+            tree[path] = {"mode": "100644", "type": "blob", "sha": repo.put_blob(data)}
+        repo.commit_files("main", tree, message)
+
+
+def seed(state: FakeGithub) -> None:
+    repo = state.create_repo(REPO, "Benchmark")
+    files = {f"file-{i}.json": json.dumps({"id": i}).encode() for i in range(50)}
+    files.update({f"grupo-{g}/{r:02d} - requisito/conclusion.json": b'{"date": null}'
+                  for g in range(5) for r in range(20)})
+    files["docs/blob.bin"] = os.urandom(BLOB_SIZE)
+    add_files(repo, files)
+
+    template = state.create_repo("template", "Template das classes")
+    add_files(template, {"LICENSE": b"MIT"})
+
+    # Classe completa (requirements.json e um conclusion.json por requisito) para
+    # o espelho
+    content = class_file(CLASS_REPO, groups=5, requirements=100)
+    data = json.loads(content)
+    groups = {group["groupId"]: group["groupName"] for group in data["groups"]}
+    files = {
+        requirement_path(
+            r["groupId"],
+            groups[r["groupId"]],
+            r["requirementId"],
+            r["requirementDescription"],
+        ): json.dumps(r["conclusion"]).encode()
+        for r in data["requirements"]
+    }
+    files["requirements.json"] = content
+    add_files(state.create_repo(CLASS_REPO, "Classe do benchmark"), files)
+
+    for i in range(30):
+        state.create_repo(f"extra-{i}")
+
+
+def prepare_repos(state: FakeGithub, indices: Iterable[int]) -> None:
+    for i in indices:
+        state.create_repo(f"tmp-{i}", auto_init=False)
+
+
+def prepare_files(prefix: str) -> Callable[[FakeGithub, Iterable[int]], None]:
+    def prepare(state: FakeGithub, indices: Iterable[int]) -> None:
+        add_files(state.repos[REPO], {f"{prefix}-{i}.json": b"{}" for i in indices})
+    return prepare
+
+
+def class_file(name: str, groups: int = 3, requirements: int = 10) -> bytes:
+    return json.dumps(
+        {
+            "info": {"name": name, "description": "Benchmark"},
+            "groups": [
+                {"groupId": g, "groupName": f"Grupo {g}"} for g in range(1, groups + 1)
+            ],
+            "requirements": [
+                {
+                    "requirementId": r,
+                    "groupId": r % groups + 1,
+                    "requirementDescription": f"Requisito {r}",
+                    "conclusion": {"date": None},
+                }
+                for r in range(1, requirements + 1)
+            ],
+        }
+    ).encode()
+
+
+# --- cenários --------------------------------------------------------------
+
+def upload_class(session: requests.Session, base: str, i: int) -> requests.Response:
+    """Envia a classe e espera o job terminar; a latência é a do fluxo inteiro."""
+    response = session.post(f"{base}/upload",
+                            files={"file": ("classe.json", class_file(f"classe-{i}"))},
+                            headers={"Accept": "application/json"})
+    if response.status_code != 202:
+        return response
+
+    status_url = base + response.json()["status_url"]
+    while True:
+        status = session.get(status_url)
+        if status.json()["status"] in ("done", "failed"):
+            if status.json()["status"] == "failed":
+                status.status_code = 500
+            return status
+        time.sleep(0.01)
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("list_repos", lambda s, b, i: s.get(f"{b}/api/repositories/?per_page=30")),
+    Scenario("get_repo", lambda s, b, i: s.get(f"{b}/api/repositories/{REPO}")),
+    # Antes dos cenários que criam repositórios: a listagem cabe numa página
+    Scenario("dashboard", lambda s, b, i: s.get(f"{b}/api/dashboard/")),
+    Scenario(
+        "create_repo",
+        lambda s, b, i: s.post(f"{b}/api/repositories/", json={"name": f"new-{i}"}),
+        expected=(201,),
+    ),
+    Scenario(
+        "provision_repo",
+        lambda s, b, i: s.post(
+            f"{b}/api/repositories/provision",
+            json={
+                "template": "template",
+                "repositories": [
+                    {
+                        "name": f"prov-{i}",
+                        "files": [{"path": "requirements.json", "content": "{}"}],
+                    }
+                ],
+            },
+        ),
+        expected=(201,),
+    ),
+    Scenario(
+        "update_repo",
+        lambda s, b, i: s.patch(
+            f"{b}/api/repositories/{REPO}", json={"description": f"d{i}"}
+        ),
+    ),
+    Scenario(
+        "delete_repo",
+        lambda s, b, i: s.delete(f"{b}/api/repositories/tmp-{i}"),
+        prepare_repos,
+    ),
+    Scenario(
+        "list_files",
+        lambda s, b, i: s.get(
+            f"{b}/api/repositories/{REPO}/files?include_content=false"
+        ),
+    ),
+    Scenario(
+        "get_file",
+        lambda s, b, i: s.get(f"{b}/api/repositories/{REPO}/files/file-{i % 50}.json"),
+    ),
+    Scenario(
+        "class_requirements",
+        lambda s, b, i: s.get(f"{b}/api/repositories/{CLASS_REPO}/requirements"),
+    ),
+    Scenario(
+        "download_file",
+        lambda s, b, i: s.get(f"{b}/api/repositories/{REPO}/raw/docs/blob.bin"),
+    ),
+    Scenario(
+        "upload_file",
+        lambda s, b, i: s.post(
+            f"{b}/api/repositories/{REPO}/files",
+            data={"path": f"up-{i}.json"},
+            files={"file": ("up.json", io.BytesIO(b"{}"))},
+        ),
+        expected=(201,),
+    ),
+    Scenario(
+        "update_file",
+        lambda s, b, i: s.put(
+            f"{b}/api/repositories/{REPO}/files/upd-{i}.json",
+            files={"file": ("upd.json", io.BytesIO(b'{"v": 2}'))},
+        ),
+        prepare_files("upd"),
+    ),
+    Scenario(
+        "update_file_if_match",
+        lambda s, b, i: s.put(
+            f"{b}/api/repositories/{REPO}/files/ifm-{i}.json",
+            headers={"If-Match": f'"{EMPTY_JSON_SHA}"'},
+            files={"file": ("ifm.json", io.BytesIO(b'{"v": 2}'))},
+        ),
+        prepare_files("ifm"),
+    ),
+    Scenario(
+        "delete_file",
+        lambda s, b, i: s.delete(f"{b}/api/repositories/{REPO}/files/del-{i}.json"),
+        prepare_files("del"),
+    ),
+    Scenario(
+        "delete_prefix",
+        lambda s, b, i: s.delete(
+            f"{b}/api/repositories/{REPO}/files", json={"paths": [f"dir-{i}/"]}
+        ),
+        lambda state, indices: add_files(
+            state.repos[REPO],
+            {f"dir-{i}/{n}/conclusion.json": b"{}" for i in indices for n in range(20)},
+        ),
+    ),
+    Scenario(
+        "upload_batch",
+        lambda s, b, i: s.post(
+            f"{b}/api/repositories/{REPO}/files/batch",
+            json={
+                "files": [
+                    {"path": f"batch-{i}/{n}.json", "content": "{}"} for n in range(20)
+                ]
+            },
+        ),
+        expected=(201,),
+    ),
+    Scenario(
+        "sync_unchanged",
+        lambda s, b, i: s.post(
+            f"{b}/api/repositories/{REPO}/files/sync",
+            json={
+                "files": [
+                    {"path": f"file-{n}.json", "content": json.dumps({"id": n})}
+                    for n in range(50)
+                ],
+                "prune": ["file-*.json"],
+            },
+        ),
+    ),
+    Scenario(
+        "mirror_refresh",
+        lambda s, b, i: s.post(
+            f"{b}/api/mirror/refresh", json={"repositories": [CLASS_REPO]}
+        ),
+    ),
+    Scenario(
+        "mirror_requirements",
+        lambda s, b, i: s.get(
+            f"{b}/api/mirror/requirements?group_id={i % 5 + 1}&concluded=false"
+        ),
+    ),
+    Scenario("ratelimit", lambda s, b, i: s.get(f"{b}/api/ratelimit/")),
+    Scenario(
+        "docs",
+        lambda s, b, i: s.get(f"{b}/docs/api", headers={"Accept-Encoding": "br, gzip"}),
+    ),
+    Scenario("upload_class", upload_class),
+]
+
+
+# --- execução --------------------------------------------------------------
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def measure(scenario: Scenario, state: FakeGithub, base: str, total: int,
+            concurrency: int, counter: "itertools.count") -> Result:
+    indices = [next(counter) for _ in range(total)]
+    if scenario.prepare:
+        scenario.prepare(state, indices)
+
+    local = threading.local()
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        nonlocal errors
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.headers["x-api-token"] = TOKEN
+        start = time.perf_counter()
+        response = scenario.run(local.session, base, i)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if response.status_code not in scenario.expected:
+                errors += 1
+
+    calls_before = state.total_calls()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, indices))
+    wall = time.perf_counter() - started
+    calls = state.total_calls() - calls_before
+
+    return Result(
+        scenario.name, concurrency, total, calls / total,
+        percentile(latencies, 0.50) * 1000,
+        percentile(latencies, 0.95) * 1000,
+        percentile(latencies, 0.99) * 1000,
+        total / wall,
+        errors
+    )
+
+
+def start_app(
+    github_url: str, server_kind: str = "wsgi"
+) -> Tuple[int, Callable[[], None]]:
+    """Sobe a aplicação numa porta livre; devolve a porta e a função que a encerra."""
+    os.environ["GITHUB_API_URL"] = github_url
+    os.environ["GITHUB_API_TOKEN"] = TOKEN
+    os.environ.setdefault("GITHUB_SECONDS_BETWEEN_REQUESTS", "0")
+    os.environ.setdefault("GITHUB_SECONDS_BETWEEN_WRITES", "0")
+    os.environ.setdefault(
+        "JOBS_DB_PATH", os.path.join(tempfile.mkdtemp(), "jobs.sqlite3")
+    )
+    os.environ.setdefault(
+        "MIRROR_DB_PATH", os.path.join(tempfile.mkdtemp(), "mirror.sqlite3")
+    )
+    os.environ.pop("API_URL", None)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    if server_kind == "asgi":
+        # Leituras no event loop (asgi.py); requer requirements-async.txt
+        import uvicorn
+        from asgi import application
+
+        server = uvicorn.Server(uvicorn.Config(application, host="127.0.0.1", port=0,
+                                               log_level="warning", backlog=4096))
+        threading.Thread(target=server.run, daemon=True).start()
+        while not server.started:
+            time.sleep(0.01)
+
+        def stop() -> None:
+            server.should_exit = True
+        return server.servers[0].sockets[0].getsockname()[1], stop
+
+    from werkzeug.serving import make_server
+    from main import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--requests", type=int, default=40, help="requisições por cenário e nível"
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1,4,16",
+        help="níveis de concorrência, separados por vírgula",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.03,
+        help="latência simulada por chamada ao GitHub (s)",
+    )
+    parser.add_argument("--only", help="cenários a executar, separados por vírgula")
+    parser.add_argument(
+        "--json", action="store_true", help="imprime os resultados em JSON"
+    )
+    parser.add_argument(
+        "--server",
+        choices=("wsgi", "asgi"),
+        default="wsgi",
+        help="servidor da aplicação: threads (wsgi) ou event loop (asgi.py)",
+    )
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    scenarios = [
+        s for s in SCENARIOS if not args.only or s.name in args.only.split(",")
+    ]
+
+    github, state = serve(latency=args.latency)
+    seed(state)
+    app_port, stop_app = start_app(
+        f"http://127.0.0.1:{github.server_port}", args.server
+    )
+    base = f"http://127.0.0.1:{app_port}"
+
+    # Aquece o pool de clientes (a validação do token não entra na conta)
+    requests.get(f"{base}/api/repositories/{REPO}", headers={"x-api-token": TOKEN})
+
+    counter = itertools.count()
+    results: List[Result] = []
+    over_budget: List[str] = []
+
+    for scenario in scenarios:
+        # Uma requisição isolada mede o custo em chamadas, sem disputas entre threads
+        single = measure(scenario, state, base, 1, 1, counter)
+        budget = CALL_BUDGETS.get(scenario.name)
+        if budget is not None and single.calls_per_request > budget:
+            over_budget.append(
+                f"{scenario.name}: {single.calls_per_request:.0f} chamadas "
+                f"(orçamento {budget})"
+            )
+
+        for level in levels:
+            results.append(
+                measure(scenario, state, base, args.requests, level, counter)
+            )
+
+    if args.json:
+        print(json.dumps([result.__dict__ for result in results], indent=2))
+    else:
+        header = (
+            f"{'cenário':<22}{'conc':>5}{'chamadas':>10}{'p50 ms':>9}"
+            f"{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'erros':>7}"
+        )
+        print(header)
+        print("-" * len(header))
+        for r in results:
+            print(
+                f"{r.scenario:<22}{r.concurrency:>5}{r.calls_per_request:>10.2f}"
+                f"{r.p50:>9.1f}{r.p95:>9.1f}{r.p99:>9.1f}{r.throughput:>9.1f}"
+                f"{r.errors:>7}"
+            )
+
+    failed = [r for r in results if r.errors]
+    for r in failed:
+        print(
+            f"ERRO: {r.scenario} (concorrência {r.concurrency}) teve {r.errors} "
+            "respostas inesperadas",
+            file=sys.stderr,
+        )
+    for message in over_budget:
+        print(f"ORÇAMENTO EXCEDIDO: {message}", file=sys.stderr)
+
+    github.shutdown()
+    stop_app()
+    return 1 if over_budget or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,28 @@
+import os
+
 from flask import Blueprint, render_template
 
-docs_bp = Blueprint("docs", __name__, template_folder='templates', static_folder='static')
+from assets import AssetPipeline, RenderedPage
+
+docs_bp = Blueprint("docs", __name__, template_folder='templates')
+
+# CSS da documentação com hash no nome e pré-comprimido; as páginas não mudam
+# enquanto o processo roda, então são renderizadas uma única vez
+docs_assets = AssetPipeline(os.path.join(os.path.dirname(__file__), 'static'))
+docs_assets.register(docs_bp)
+
+api_docs_page = RenderedPage(lambda: render_template('api_docs.html'))
+home_docs_page = RenderedPage(lambda: render_template('docs.html'))
+
+
+@docs_bp.context_processor
+def inject_asset_url():
+    return {"asset_url": docs_assets.url}
 
 @docs_bp.route("/api")
 def api_docs():
-    return render_template('api_docs.html')
+    return api_docs_page.send()
 
 @docs_bp.route("/")
 def home_docs():
-    return render_template('docs.html')
\ No newline at end of file
+    return home_docs_page.send()
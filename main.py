@@ -1,10 +1,26 @@
 from app import app
 from api.src.routers.repository import repos_bp
+from api.src.routers.ratelimit import ratelimit_bp
+from api.src.routers.metrics import metrics_bp
+from api.src.routers.mirror import mirror_bp
+from api.src.routers.dashboard import dashboard_bp
+from api.src.mirror import mirror_enabled
+from api.src.metrics import instrument_app
 from docs.docs_bp import docs_bp
 
 # Registrar os Blueprints
 app.register_blueprint(repos_bp, url_prefix="/api/repositories")
+app.register_blueprint(ratelimit_bp, url_prefix="/api/ratelimit")
+app.register_blueprint(dashboard_bp, url_prefix="/api/dashboard")
+app.register_blueprint(metrics_bp, url_prefix="/metrics")
 app.register_blueprint(docs_bp, url_prefix="/docs")
 
+# Espelho local em SQLite, opcional (MIRROR_DB_PATH)
+if mirror_enabled():
+    app.register_blueprint(mirror_bp, url_prefix="/api/mirror")
+
+# Tempo e status de cada rota, expostos em /metrics
+instrument_app(app)
+
 if __name__ == "__main__":
     app.run(debug=True, port=3000)
\ No newline at end of file
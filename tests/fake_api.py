@@ -0,0 +1,32 @@
+"""
+GitHub local dos benchmarks para os testes, com o controller apontado para
+ele. O endereço é trocado direto no módulo do controller, então não depende
+da ordem em que os módulos de teste importam o controller.
+"""
+
+from unittest import mock
+
+from benchmarks.fake_github import FakeGithub, serve
+from api.src.controllers import github_controller
+
+_server = None
+_patcher = None
+
+
+def start() -> FakeGithub:
+    """Sobe o servidor e aponta o controller para ele, sem intervalo entre chamadas."""
+    global _server, _patcher
+    _server, state = serve()
+    _patcher = mock.patch.multiple(
+        github_controller,
+        GITHUB_API_URL=f"http://127.0.0.1:{_server.server_port}",
+        SECONDS_BETWEEN_REQUESTS=0,
+        SECONDS_BETWEEN_WRITES=0,
+    )
+    _patcher.start()
+    return state
+
+
+def stop() -> None:
+    _patcher.stop()
+    _server.shutdown()
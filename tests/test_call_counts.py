@@ -0,0 +1,65 @@
+"""
+Chamadas ao GitHub por operação de arquivo, contadas no GitHub local dos
+benchmarks. O cliente do token já está no pool, então a validação do token
+não entra na conta.
+"""
+
+import unittest
+
+from api.src.controllers import GithubController, GithubClientPool
+from tests import fake_api
+
+TOKEN = "call-count-token"
+REPO = "contagem"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+class CallCountTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        _state.create_repo(REPO)
+        cls.pool = GithubClientPool(GithubController.authenticate)
+        with GithubController(TOKEN, True, cls.pool) as git:
+            git.get_user()
+
+    def calls(self, operation) -> int:
+        before = _state.total_calls()
+        with GithubController(TOKEN, True, self.pool) as git:
+            operation(git)
+        return _state.total_calls() - before
+
+    def test_upload_file(self):
+        upload = self.calls(lambda git: git.upload_file(REPO, "upload.json", b"{}"))
+        self.assertEqual(upload, 2)
+
+    def test_get_file(self):
+        self.calls(lambda git: git.upload_file(REPO, "get.json", b"{}"))
+        get = self.calls(lambda git: git.get_file(REPO, "get.json"))
+        self.assertEqual(get, 2)
+
+    def test_update_file(self):
+        self.calls(lambda git: git.upload_file(REPO, "update.json", b"{}"))
+        update = self.calls(
+            lambda git: git.update_file_content(REPO, "update.json", b'{"v": 2}')
+        )
+        self.assertEqual(update, 3)
+
+    def test_delete_file(self):
+        self.calls(lambda git: git.upload_file(REPO, "delete.json", b"{}"))
+        delete = self.calls(lambda git: git.delete_file(REPO, "delete.json"))
+        self.assertEqual(delete, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
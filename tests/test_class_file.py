@@ -0,0 +1,103 @@
+"""
+Validação do requirements.json (api/src/validation) pela rota /upload de
+app.py: arquivos inválidos são recusados antes de qualquer chamada ao GitHub.
+"""
+
+import importlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tests import fake_api
+
+_state = None
+_app = None
+_directory = None
+
+
+def setUpModule():
+    global _state, _app, _directory
+    _state = fake_api.start()
+    # Banco de jobs descartável: o app.py o abre na importação
+    _directory = tempfile.TemporaryDirectory()
+    path = os.path.join(_directory.name, "jobs.sqlite3")
+    with mock.patch.dict(os.environ, {"JOBS_DB_PATH": path}):
+        _app = importlib.import_module("app")
+
+
+def tearDownModule():
+    fake_api.stop()
+    _directory.cleanup()
+
+
+VALID = {
+    "info": {"name": "Turma"},
+    "groups": [{"groupId": 1, "groupName": "Grupo"}],
+    "requirements": [
+        {"requirementId": 1, "groupId": 1, "requirementDescription": "Login"}
+    ],
+}
+
+
+class ClassFileUploadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = _app.app.test_client()
+        _state.reset_calls()
+
+    def upload(self, document):
+        if not isinstance(document, bytes):
+            document = json.dumps(document).encode("utf-8")
+        return self.client.post(
+            "/upload",
+            data={"file": (io.BytesIO(document), "requirements.json")},
+            headers={"Accept": "application/json"},
+        )
+
+    def assert_rejected(self, response, errors):
+        self.assertEqual(response.status_code, 400)
+        body = response.get_json()
+        self.assertEqual(body["errors"], errors)
+        self.assertEqual(body["message"],
+                         f"The document has {len(errors)} validation error(s).")
+        self.assertEqual(_state.total_calls(), 0)
+        self.assertEqual(_app.job_runner.store.pending(), [])
+
+    def test_schema_errors_are_listed(self):
+        document = {
+            "info": {"name": "a/b"},
+            "groups": [{"groupId": 1}],
+            "requirements": "nenhum",
+        }
+        self.assert_rejected(self.upload(document), [
+            "$.info.name: não pode conter '/'",
+            "$.groups[0].groupName: campo obrigatório",
+            "$.requirements: deveria ser array",
+        ])
+
+    def test_reference_errors_are_listed(self):
+        document = {
+            **VALID,
+            "groups": VALID["groups"] * 2,
+            "requirements": [
+                {"requirementId": 1, "groupId": 2, "requirementDescription": "A"},
+                *VALID["requirements"] * 2,
+            ],
+        }
+        self.assert_rejected(self.upload(document), [
+            "$.groups[1].groupId: grupo 1 repetido",
+            "$.requirements[0].groupId: grupo 2 não existe em 'groups'",
+            "$.requirements[2].requirementId: requisito 1 repetido no grupo 1",
+        ])
+
+    def test_file_that_is_not_a_json_object(self):
+        response = self.upload(b"[1, 2]")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(_state.total_calls(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
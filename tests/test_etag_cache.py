@@ -0,0 +1,79 @@
+"""
+Cache de ETags (controllers/etag_cache.py) no transporte compartilhado, com
+o GitHub local dos benchmarks.
+"""
+
+import unittest
+
+import requests
+
+from api.src.controllers import github_controller, transport
+from api.src.controllers.etag_cache import ETagCache
+from benchmarks.fake_github import OWNER
+from tests import fake_api
+
+TOKEN = "etag-token"
+REPO = "etag"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+    _state.create_repo(REPO, description="antes")
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+def response(body: bytes, etag: str) -> requests.Response:
+    result = requests.Response()
+    result.status_code = 200
+    result.headers["ETag"] = etag
+    result._content = body
+    return result
+
+
+class ETagCacheTest(unittest.TestCase):
+
+    def get_repo(self) -> requests.Response:
+        url = f"{github_controller.GITHUB_API_URL}/repos/{OWNER}/{REPO}"
+        with transport.session() as session:
+            return session.get(url, headers={"Authorization": f"token {TOKEN}"})
+
+    def test_not_modified_replays_the_cached_body(self):
+        first = self.get_repo()
+        hits = transport.etag_cache.hits
+        _state.reset_calls()
+
+        second = self.get_repo()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.json()["description"], "antes")
+        self.assertEqual(transport.etag_cache.hits, hits + 1)
+        # O GitHub foi consultado (revalidação), mas respondeu 304
+        self.assertEqual(_state.total_calls(), 1)
+
+    def test_changed_resource_is_downloaded_again(self):
+        self.get_repo()
+        _state.repos[REPO].description = "depois"
+        hits = transport.etag_cache.hits
+
+        self.assertEqual(self.get_repo().json()["description"], "depois")
+        self.assertEqual(transport.etag_cache.hits, hits)
+        _state.repos[REPO].description = "antes"
+
+    def test_bodies_stay_below_max_bytes(self):
+        cache = ETagCache(max_entries=10, max_bytes=10)
+        cache.store(("t", "a", ""), response(b"123456", '"a"'))
+        cache.store(("t", "b", ""), response(b"123456", '"b"'))
+
+        self.assertIsNone(cache.get(("t", "a", "")))
+        self.assertEqual(cache.get(("t", "b", "")).content, b"123456")
+        self.assertEqual(cache.size, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
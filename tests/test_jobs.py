@@ -0,0 +1,109 @@
+"""
+Retomada dos jobs (api/src/jobs) depois de um reinício do servidor.
+"""
+
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import closing
+
+from api.src.jobs import JobRunner, JobStore
+from api.src.jobs.store import DONE, RUNNING
+
+
+def wait_for(store, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job.status == status:
+            return job
+        time.sleep(0.02)
+    return store.get(job_id)
+
+
+class JobResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "jobs.db")
+        self.store = JobStore(self.path)
+
+    def interrupted_job(self, owner):
+        """Job que ficou 'running' com parte do progresso salva."""
+        job = self.store.create("upload", {"repo": "turma"})
+        self.store.update_progress(job.id, {"done": ["grupo-1"]})
+        with closing(sqlite3.connect(self.path)) as db, db:
+            db.execute("UPDATE jobs SET status = ?, owner = ? WHERE id = ?",
+                       (RUNNING, owner, job.id))
+        return job
+
+    def runner(self):
+        seen = {}
+        runner = JobRunner(self.store, stale_after=300, heartbeat=1)
+
+        def handler(job, progress):
+            seen[job.id] = list(progress.get("done", []))
+            progress.append("done", "grupo-2")
+
+        runner.register("upload", handler)
+        return runner, seen
+
+    def test_job_of_a_previous_process_is_resumed_after_restart(self):
+        # Mesmo host e PID, outra inicialização: o processo antigo não existe mais
+        job = self.interrupted_job(f"{socket.gethostname()}:{os.getpid()}:anterior")
+        runner, seen = self.runner()
+        runner.resume()
+
+        finished = wait_for(self.store, job.id, DONE)
+        self.assertEqual(finished.status, DONE)
+        self.assertEqual(seen[job.id], ["grupo-1"])
+        self.assertEqual(finished.progress["done"], ["grupo-1", "grupo-2"])
+
+    def test_job_of_a_dead_process_is_reclaimed(self):
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        job = self.interrupted_job(f"{socket.gethostname()}:{dead.pid}:outro")
+        runner, seen = self.runner()
+        runner.reclaim(self.store.get(job.id))
+
+        self.assertEqual(wait_for(self.store, job.id, DONE).status, DONE)
+
+    def test_job_of_a_live_process_is_left_alone(self):
+        alive = subprocess.Popen([sys.executable, "-c",
+                                  "import time; time.sleep(30)"])
+        self.addCleanup(alive.wait)
+        self.addCleanup(alive.kill)
+        job = self.interrupted_job(f"{socket.gethostname()}:{alive.pid}:outro")
+        runner, seen = self.runner()
+        runner.resume()
+
+        time.sleep(0.3)
+        self.assertEqual(self.store.get(job.id).status, RUNNING)
+        self.assertNotIn(job.id, seen)
+
+    def test_only_one_process_claims_an_orphan(self):
+        job = self.interrupted_job(f"{socket.gethostname()}:{os.getpid()}:anterior")
+        claims = []
+
+        def claim():
+            claims.append(self.store.claim(job.id, 300))
+
+        threads = [threading.Thread(target=claim) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len([claim for claim in claims if claim is not None]), 1)
+        self.assertEqual(self.store.get(job.id).status, RUNNING)
+
+
+if __name__ == "__main__":
+    unittest.main()
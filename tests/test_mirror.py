@@ -0,0 +1,136 @@
+"""
+Espelho local dos repositórios de classe (api/src/mirror) pelas rotas de
+/api/mirror, com o GitHub local dos benchmarks.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from api.src import mirror
+from api.src.errors import GithubError
+from api.src.mirror import MirrorStore
+from api.src.routers.errors import handle_github_error
+from api.src.routers.mirror import mirror_bp
+from api.src.validation import CLASS_FILE, requirement_path
+from tests import fake_api
+
+TOKEN = "mirror-token"
+REPO = "espelho"
+
+CLASS = {
+    "info": {"name": "Turma"},
+    "groups": [{"groupId": 1, "groupName": "Grupo"}],
+    "requirements": [
+        {"requirementId": 1, "groupId": 1, "requirementDescription": "Login"},
+        {"requirementId": 2, "groupId": 1, "requirementDescription": "Logout"},
+    ],
+}
+LOGIN = requirement_path(1, "Grupo", 1, "Login")
+
+_state = None
+_directory = None
+_patcher = None
+
+
+def setUpModule():
+    global _state, _directory, _patcher
+    _state = fake_api.start()
+    _state.create_repo(REPO)
+    set_files({CLASS_FILE: CLASS, LOGIN: {"date": "2024-05-01"}})
+
+    _directory = tempfile.TemporaryDirectory()
+    store = MirrorStore(os.path.join(_directory.name, "mirror.sqlite3"))
+    _patcher = mock.patch.object(mirror, "_store", store)
+    _patcher.start()
+
+
+def tearDownModule():
+    _patcher.stop()
+    _directory.cleanup()
+    fake_api.stop()
+
+
+def set_files(documents):
+    repo = _state.repos[REPO]
+    with repo.lock:
+        files = repo.head_files("main")
+        for path, document in documents.items():
+            sha = repo.put_blob(json.dumps(document).encode("utf-8"))
+            files[path] = {"mode": "100644", "type": "blob", "sha": sha}
+        repo.commit_files("main", files, "Atualiza a turma")
+
+
+class MirrorRoutesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        app = Flask(__name__)
+        app.register_error_handler(GithubError, handle_github_error)
+        app.register_blueprint(mirror_bp, url_prefix="/api/mirror")
+        cls.client = app.test_client()
+        cls.headers = {"x-api-token": TOKEN}
+
+    def refresh(self):
+        response = self.client.post("/api/mirror/refresh",
+                                    json={"repositories": [REPO]},
+                                    headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()[0]
+
+    def repo_calls(self):
+        return sum(count for key, count in _state.calls.items() if "/repos/" in key)
+
+    def requirements(self):
+        response = self.client.get(f"/api/mirror/requirements?repository={REPO}",
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return {item["requirement_id"]: item["concluded"]
+                for item in response.get_json()}
+
+    def test_reads_are_served_from_the_stored_copy(self):
+        self.assertEqual(self.refresh()["requirements"], 2)
+
+        # O GitHub muda, mas as leituras continuam vindo do espelho
+        set_files({LOGIN: {"date": None}})
+        _state.reset_calls()
+        self.assertEqual(self.requirements(), {"1": True, "2": False})
+        response = self.client.get(f"/api/mirror/repositories/{REPO}/files",
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        paths = [file["path"] for file in response.get_json()]
+        self.assertIn(CLASS_FILE, paths)
+        self.assertIn(LOGIN, paths)
+        self.assertEqual(self.repo_calls(), 0)
+
+        # Só a atualização lê o GitHub de novo, e só o blob que mudou
+        refreshed = self.refresh()
+        self.assertEqual(refreshed["blobs_fetched"], 1)
+        self.assertEqual(self.requirements(), {"1": False, "2": False})
+
+        set_files({LOGIN: {"date": "2024-05-01"}})
+        self.refresh()
+
+    def test_unchanged_repository_is_not_read_again(self):
+        self.refresh()
+        _state.reset_calls()
+        self.assertEqual(self.refresh()["blobs_fetched"], 0)
+        self.assertFalse([key for key in _state.calls if "/git/" in key])
+
+    def test_unknown_repository_is_not_found(self):
+        response = self.client.get("/api/mirror/repositories/outro/files",
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+    def test_refresh_body_must_be_an_object(self):
+        response = self.client.post("/api/mirror/refresh", json=[REPO],
+                                    headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Provisionamento de vários repositórios a partir de um template, no GitHub
+local dos benchmarks.
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from github.GithubException import GithubException
+
+from api.src.controllers import GithubController, GithubClientPool
+from tests import fake_api
+
+TOKEN = "provision-token"
+TEMPLATE = "modelo"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+    _state.create_repo(TEMPLATE)
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+class ProvisionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = GithubClientPool(GithubController.authenticate)
+
+    def test_failure_keeps_the_commit_message_of_other_repos(self):
+        failed = threading.Event()
+        create = GithubController.create_repo_from_template
+
+        def create_or_fail(git, template, name, *args):
+            if name == "falha":
+                failed.set()
+                raise GithubException(500, {}, {})
+            # Só cria depois que a falha do outro repositório foi registrada
+            failed.wait(5)
+            time.sleep(0.2)
+            return create(git, template, name, *args)
+
+        repos = [
+            ("falha", "", {"a.json": "{}"}),
+            ("turma", "", {"grupo-1/conclusion.json": "{}"}),
+        ]
+        with mock.patch.object(GithubController, "create_repo_from_template",
+                               create_or_fail):
+            with GithubController(TOKEN, True, self.pool) as git:
+                results, errors = git.provision_repos(
+                    TEMPLATE, repos, "Provisiona a turma", max_workers=2
+                )
+
+        self.assertEqual(list(errors), ["falha"])
+        commit = results["turma"][1]
+        repo = _state.repos["turma"]
+        self.assertEqual(repo.commits[commit.sha]["message"], "Provisiona a turma")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Agendador do limite de requisições (controllers/rate_limit.py): sozinho e
+pelo transporte, no GitHub local dos benchmarks.
+"""
+
+import time
+import unittest
+
+import requests
+
+from api.src.controllers import GithubController, GithubClientPool, rate_limiter
+from api.src.controllers.rate_limit import RateLimiter, key_for_token
+from api.src.errors import RateLimitedError
+from tests import fake_api
+
+TOKEN = "rate-limit-token"
+REPO = "limite"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+    _state.create_repo(REPO)
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+def response(status, **headers):
+    result = requests.Response()
+    result.status_code = status
+    result.headers.update(headers)
+    return result
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def test_retry_after_holds_the_next_request(self):
+        limiter = RateLimiter(max_wait=5)
+        limiter.acquire("token")
+        limiter.release("token", response(429, **{"Retry-After": "0.3"}))
+
+        started = time.monotonic()
+        limiter.acquire("token")
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+        limiter.release("token", response(200))
+
+    def test_wait_longer_than_max_wait_is_refused(self):
+        limiter = RateLimiter(max_wait=0.1)
+        limiter.acquire("token")
+        limiter.release("token", response(403, **{"Retry-After": "60"}))
+
+        with self.assertRaises(RateLimitedError):
+            limiter.acquire("token")
+        # Outros tokens não esperam
+        limiter.acquire("outro")
+        limiter.release("outro")
+
+    def test_exhausted_budget_waits_for_the_reset(self):
+        limiter = RateLimiter(max_wait=0.1)
+        limiter.acquire("token")
+        limiter.release("token", response(200, **{
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + 60),
+        }))
+
+        with self.assertRaises(RateLimitedError):
+            limiter.acquire("token")
+        self.assertEqual(limiter.snapshot()[0]["resources"]["core"]["remaining"], 0)
+
+
+class RateLimitedTransportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = GithubClientPool(GithubController.authenticate)
+        with GithubController(TOKEN, True, cls.pool) as git:
+            git.get_user()
+
+    def test_refused_request_waits_and_is_retried(self):
+        _state.retry_after = 1
+        _state.reject_next = 1
+        before = _state.total_calls()
+        started = time.monotonic()
+        with GithubController(TOKEN, True, self.pool) as git:
+            repo = git.get_repo_by_name(REPO)
+
+        self.assertEqual(repo.name, REPO)
+        self.assertEqual(_state.total_calls() - before, 2)
+        self.assertGreaterEqual(time.monotonic() - started, 1.0)
+        state, = rate_limiter.snapshot(key_for_token(TOKEN))
+        self.assertGreaterEqual(state["throttled"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
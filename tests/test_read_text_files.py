@@ -0,0 +1,44 @@
+"""
+Leitura de arquivos de texto em lotes de consultas GraphQL, no GitHub local
+dos benchmarks (que recusa variáveis declaradas e não usadas, como o GitHub).
+"""
+
+import unittest
+from unittest import mock
+
+from api.src.controllers import GithubController, GithubClientPool, github_controller
+from tests import fake_api
+
+TOKEN = "graphql-token"
+REPO = "leitura"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+    _state.create_repo(REPO)
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+class ReadTextFilesTest(unittest.TestCase):
+
+    def test_reads_several_batches(self):
+        pool = GithubClientPool(GithubController.authenticate)
+        files = {f"grupo-1/r{index}/conclusion.json": f'{{"r": {index}}}'
+                 for index in range(3)}
+        with GithubController(TOKEN, True, pool) as git:
+            commit = git.upload_files(REPO, files)[0]
+            with mock.patch.object(github_controller, "GRAPHQL_BATCH_SIZE", 1):
+                head, texts = git.read_text_files(REPO, [*files, "faltando.json"])
+
+        self.assertEqual(head, commit.sha)
+        self.assertEqual(texts, {**files, "faltando.json": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
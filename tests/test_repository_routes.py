@@ -0,0 +1,169 @@
+"""
+Rotas de repositórios (routers/repository.py) numa aplicação Flask mínima,
+com o GitHub local dos benchmarks.
+"""
+
+import io
+import unittest
+
+from flask import Flask
+
+from api.src.errors import GithubError
+from api.src.routers.errors import handle_github_error
+from api.src.routers.repository import repos_bp
+from tests import fake_api
+
+TOKEN = "routes-token"
+REPO = "rotas"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+    _state.create_repo(REPO)
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+class RepositoryRoutesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        app = Flask(__name__)
+        app.register_error_handler(GithubError, handle_github_error)
+        app.register_blueprint(repos_bp, url_prefix="/api/repositories")
+        cls.client = app.test_client()
+        cls.headers = {"x-api-token": TOKEN}
+
+    def test_stream_rejects_page(self):
+        response = self.client.get("/api/repositories/?stream=ndjson&page=2",
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get("/api/repositories/?stream=ndjson",
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(REPO, response.get_data(as_text=True))
+
+    def post_batch(self, files):
+        return self.client.post(f"/api/repositories/{REPO}/files/batch",
+                                json={"files": files}, headers=self.headers)
+
+    def test_batch_rejects_invalid_base64(self):
+        response = self.post_batch(
+            [{"path": "a.bin", "content": "não é base64", "encoding": "base64"}]
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_rejects_items_that_are_not_objects(self):
+        self.assertEqual(self.post_batch(["a.json"]).status_code, 400)
+        self.assertEqual(self.post_batch({"path": "a.json"}).status_code, 400)
+
+    def test_batch_rejects_path_or_content_that_is_not_text(self):
+        response = self.post_batch([{"path": 5, "content": "x"}])
+        self.assertEqual(response.status_code, 400)
+        response = self.post_batch([{"path": "a.json", "content": {"a": 1}}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_rejects_absolute_or_parent_paths(self):
+        for path in ("/a.json", "../a.json", "grupo/../../a.json", "grupo//a.json"):
+            response = self.post_batch([{"path": path, "content": "{}"}])
+            self.assertEqual(response.status_code, 400, path)
+
+    def test_json_routes_reject_a_body_that_is_not_an_object(self):
+        routes = [
+            ("POST", f"/api/repositories/{REPO}/files/batch"),
+            ("POST", f"/api/repositories/{REPO}/files/sync"),
+            ("DELETE", f"/api/repositories/{REPO}/files"),
+            ("POST", "/api/repositories/provision"),
+        ]
+        for method, url in routes:
+            response = self.client.open(url, method=method, json=[1],
+                                        headers=self.headers)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertEqual(response.get_json()["message"],
+                             "Corpo JSON deve ser um objeto")
+
+    def download(self, path, **headers):
+        _state.reset_calls()
+        return self.client.get(f"/api/repositories/{REPO}/raw/{path}",
+                               headers={**self.headers, **headers})
+
+    def test_download_reads_the_content_only_from_the_blob(self):
+        add_file("dados/blob.bin", bytes(range(256)) * 8)
+
+        response = self.download("dados/blob.bin")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, bytes(range(256)) * 8)
+        self.assertNotIn("GET /repos/{owner}/{repo}/contents/{path}", _state.calls)
+
+        response = self.download("dados/blob.bin", Range="bytes=256-511")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, bytes(range(256)))
+
+    def test_download_empty_file(self):
+        add_file("vazio.txt", b"")
+        response = self.download("vazio.txt")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"")
+
+    def test_download_folder_or_missing_file(self):
+        add_file("pasta/arquivo.txt", b"x")
+        self.assertEqual(self.download("pasta").status_code, 400)
+        self.assertEqual(self.download("faltando.txt").status_code, 404)
+
+    def test_sync_reads_prune_and_message_from_a_multipart_form(self):
+        add_file("sync/velho.json", b"{}")
+        response = self.client.post(
+            f"/api/repositories/{REPO}/files/sync",
+            data={
+                "path": "sync/novo.json",
+                "file": (io.BytesIO(b"{}"), "novo.json"),
+                "prune": "sync/*",
+                "message": "Sincroniza a turma",
+            },
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()["deleted"], ["sync/velho.json"])
+
+        repo = _state.repos[REPO]
+        head = repo.commits[repo.refs["main"]]
+        self.assertEqual(head["message"], "Sincroniza a turma")
+
+    def test_delete_glob_does_not_cross_folders(self):
+        add_file("glob/a.json", b"{}")
+        add_file("glob/sub/b.json", b"{}")
+        add_file("glob/sub/fundo/c.json", b"{}")
+
+        response = self.client.delete(f"/api/repositories/{REPO}/files",
+                                      json={"paths": ["glob/*.json"]},
+                                      headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        files = _state.repos[REPO].head_files("main")
+        self.assertNotIn("glob/a.json", files)
+        self.assertIn("glob/sub/b.json", files)
+        self.assertIn("glob/sub/fundo/c.json", files)
+
+        response = self.client.delete(f"/api/repositories/{REPO}/files",
+                                      json={"paths": ["glob/**/*.json"]},
+                                      headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        files = _state.repos[REPO].head_files("main")
+        self.assertFalse(any(path.startswith("glob/") for path in files))
+
+
+def add_file(path, data):
+    repo = _state.repos[REPO]
+    with repo.lock:
+        files = repo.head_files("main")
+        files[path] = {"mode": "100644", "type": "blob", "sha": repo.put_blob(data)}
+        repo.commit_files("main", files, f"Add {path}")
+
+
+if __name__ == "__main__":
+    unittest.main()
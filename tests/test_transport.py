@@ -0,0 +1,46 @@
+"""
+Transporte compartilhado do PyGithub (controllers/transport.py), no GitHub
+local dos benchmarks.
+"""
+
+import unittest
+
+from api.src.controllers import GithubController, GithubClientPool
+from tests import fake_api
+
+TOKEN = "transport-token"
+REPO = "transporte"
+
+_state = None
+
+
+def setUpModule():
+    global _state
+    _state = fake_api.start()
+    _state.create_repo(REPO)
+
+
+def tearDownModule():
+    fake_api.stop()
+
+
+class TransportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = GithubClientPool(GithubController.authenticate)
+        with GithubController(TOKEN, True, cls.pool) as git:
+            git.get_user()
+
+    def test_server_errors_are_retried_by_the_client_retry(self):
+        _state.fail_next = 2
+        before = _state.total_calls()
+        with GithubController(TOKEN, True, self.pool) as git:
+            repo = git.get_repo_by_name(REPO)
+        self.assertEqual(repo.name, REPO)
+        self.assertEqual(_state.fail_next, 0)
+        self.assertEqual(_state.total_calls() - before, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()